@@ -6,24 +6,70 @@ AI-powered analyzer using Groq API
 - Sentiment analysis
 - Technology/company detection
 """
-from groq import Groq
+from groq import Groq, RateLimitError
 from typing import Dict, List, Optional
 import json
+import threading
+import time
 
 
 class AIAnalyzer:
     """AI-powered post analysis using Groq API"""
 
-    def __init__(self, api_key: str):
+    # Backoff for 429s that outlive the SDK's own retries
+    RATE_LIMIT_RETRIES = 3
+    RATE_LIMIT_BACKOFF = 2.0  # seconds, doubled on each retry
+
+    def __init__(self, api_key: str, requests_per_minute: Optional[int] = None,
+                 http_client=None):
         """
         Initialize AI Analyzer
 
         Args:
             api_key: Groq API key
+            requests_per_minute: Max request rate shared by all threads
+                                 using this analyzer (None = unlimited)
+            http_client: Optional shared httpx.Client (connection reuse)
         """
-        self.client = Groq(api_key=api_key)
+        self.client = Groq(api_key=api_key, http_client=http_client)
         self.model = "llama-3.1-8b-instant"  # Fast and free
 
+        # Request pacing (safe to call analyze_post from many threads)
+        self._min_interval = 60.0 / requests_per_minute if requests_per_minute else 0.0
+        self._next_request_at = 0.0
+        self._rate_lock = threading.Lock()
+
+    def _wait_for_rate_limit(self):
+        """Block until this thread may send the next request"""
+        if not self._min_interval:
+            return
+
+        with self._rate_lock:
+            now = time.monotonic()
+            slot = max(now, self._next_request_at)
+            self._next_request_at = slot + self._min_interval
+
+        if slot > now:
+            time.sleep(slot - now)
+
+    def _create_completion(self, **kwargs):
+        """
+        chat.completions.create with request pacing and
+        exponential backoff on RateLimitError
+        """
+        delay = self.RATE_LIMIT_BACKOFF
+
+        for attempt in range(self.RATE_LIMIT_RETRIES + 1):
+            self._wait_for_rate_limit()
+            try:
+                return self.client.chat.completions.create(**kwargs)
+            except RateLimitError:
+                if attempt == self.RATE_LIMIT_RETRIES:
+                    raise
+                print(f"AI rate limited, retrying in {delay:.0f}s...")
+                time.sleep(delay)
+                delay *= 2
+
     def analyze_post(self, title: str, content: str) -> Dict:
         """
         Comprehensive AI analysis of a post
@@ -72,7 +118,7 @@ Rules:
 Return ONLY valid JSON, no other text."""
 
         try:
-            response = self.client.chat.completions.create(
+            response = self._create_completion(
                 model=self.model,
                 messages=[
                     {
@@ -111,6 +157,9 @@ Return ONLY valid JSON, no other text."""
                 'topics': result.get('topics', [])[:5]
             }
 
+        except RateLimitError:
+            # Don't store an empty analysis - leave the post for the next run
+            raise
         except Exception as e:
             print(f"AI analysis error: {e}")
             return {
@@ -135,7 +184,7 @@ Return ONLY valid JSON, no other text."""
             full_text = full_text[:8000]
 
         try:
-            response = self.client.chat.completions.create(
+            response = self._create_completion(
                 model=self.model,
                 messages=[
                     {
@@ -166,7 +215,7 @@ Return ONLY valid JSON, no other text."""
         full_text = f"{title}. {content or ''}"[:2000]
 
         try:
-            response = self.client.chat.completions.create(
+            response = self._create_completion(
                 model=self.model,
                 messages=[
                     {
@@ -202,7 +251,7 @@ Return ONLY valid JSON, no other text."""
             full_text = full_text[:8000]
 
         try:
-            response = self.client.chat.completions.create(
+            response = self._create_completion(
                 model=self.model,
                 messages=[
                     {
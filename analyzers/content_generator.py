@@ -18,15 +18,16 @@ class ContentGenerator:
     - thread: Twitter/X thread (5-7 tweets)
     """
 
-    def __init__(self, api_key: str, db_manager):
+    def __init__(self, api_key: str, db_manager, http_client=None):
         """
         Initialize Content Generator
 
         Args:
             api_key: Groq API key
             db_manager: Database manager instance
+            http_client: Optional shared httpx.Client (connection reuse)
         """
-        self.client = Groq(api_key=api_key)
+        self.client = Groq(api_key=api_key, http_client=http_client)
         self.model = "llama-3.3-70b-versatile"  # Updated model (llama-3.1-70b is deprecated)
         self.db = db_manager
 
@@ -155,10 +155,17 @@ class InsightsAnalyzer:
             return []
 
     def cluster_similar_posts(self, lookback_days: int = 7,
-                             n_clusters: int = 8) -> List[Dict]:
+                             n_clusters: int = 8,
+                             persist: bool = False) -> List[Dict]:
         """
         Cluster similar posts using K-Means
 
+        Args:
+            lookback_days: Cluster posts from this many days back
+            n_clusters: Number of K-Means clusters
+            persist: Store each post's cluster_id in the database
+                     (used by post detail page for related posts)
+
         Returns:
             [
                 {
@@ -231,6 +238,12 @@ class InsightsAnalyzer:
                     'avg_score': round(sum(p.score for p in cluster_posts) / len(cluster_posts), 1)
                 })
 
+            if persist:
+                self.db.assign_post_clusters({
+                    post.id: int(label) + 1
+                    for post, label in zip(post_objects, cluster_labels)
+                })
+
             # Sort by size
             clusters.sort(key=lambda x: x['size'], reverse=True)
 
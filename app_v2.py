@@ -2,32 +2,64 @@
 Flask web interface for News Insight Parser - Version 2
 Uses UniversalPost and ParserOrchestrator
 """
+# Under gunicorn gevent workers make psycopg2 cooperative before any
+# engine is created (no-op for sync/gthread workers and local runs)
+try:
+    from gevent import monkey
+    if monkey.is_module_patched('socket'):
+        from psycogreen.gevent import patch_psycopg
+        patch_psycopg()
+except ImportError:
+    pass
+
 from flask import Flask, render_template, jsonify, request
+from flask_compress import Compress
 from storage.universal_database import UniversalDatabaseManager
+from storage.universal_models import UniversalPost
 from parsers.orchestrator import create_orchestrator
 from analyzers.enhanced_signal_detector import EnhancedSignalDetector
 from analyzers.insights_analyzer import InsightsAnalyzer
-from analyzers.ai_analyzer import AIAnalyzer
-from analyzers.content_generator import ContentGenerator
-from utils.helpers import time_ago, truncate_text, clean_html
+from utils.helpers import time_ago_cached, truncate_text, clean_html
 from utils.scheduler import get_scheduler
-from datetime import datetime, timezone
+from utils.http import get_http_session, get_groq_http_client
+from utils.cache import TTLCache
+from datetime import datetime, timezone, timedelta
+from typing import Optional
 import threading
+import traceback
+import time
+import uuid
+import concurrent.futures
+import functools
 import os
 import json
 import logging
+import logging.handlers
+import signal
+import sys
 
-# Automation imports
-from automation.topic_selector import TopicSelector
-from automation.telegram_poster import TelegramPoster
-from automation.reel_generator import create_reel_generator
-from automation.auto_content_system import AutoContentSystem, sync_generate_and_post
+# Automation imports (AI/Telegram/reel modules are imported lazily, see get_auto_system)
 from apscheduler.schedulers.background import BackgroundScheduler
+from apscheduler.executors.pool import ThreadPoolExecutor
+from apscheduler.jobstores.base import ConflictingIdError, JobLookupError
+from apscheduler.jobstores.memory import MemoryJobStore
+from apscheduler.jobstores.sqlalchemy import SQLAlchemyJobStore
+from apscheduler.events import (
+    EVENT_JOB_ADDED, EVENT_JOB_REMOVED, EVENT_JOB_MODIFIED, EVENT_JOB_EXECUTED,
+    EVENT_JOB_MISSED, EVENT_JOB_MAX_INSTANCES
+)
 import atexit
 
 app = Flask(__name__)
 app.config['SECRET_KEY'] = 'dev-secret-key-change-in-production'
 
+# Response compression: brotli for clients that accept it (~20% smaller JSON), gzip otherwise
+app.config['COMPRESS_ALGORITHM'] = ['br', 'gzip']
+app.config['COMPRESS_MIMETYPES'] = ['text/html', 'application/json', 'text/css', 'application/javascript']
+app.config['COMPRESS_LEVEL'] = 6
+app.config['COMPRESS_MIN_SIZE'] = 1024
+Compress(app)
+
 # Add custom Jinja2 filter for JSON parsing
 @app.template_filter('fromjson')
 def fromjson_filter(value):
@@ -44,6 +76,13 @@ def fromjson_filter(value):
 DATABASE_URL = os.getenv('DATABASE_URL', 'sqlite:///data/insights.db')
 db = UniversalDatabaseManager(database_url=DATABASE_URL)
 
+
+@app.teardown_appcontext
+def remove_db_session(exception=None):
+    """Release the request's DB session back to the pool"""
+    db.remove_session()
+
+
 # Create orchestrator with parsers
 orchestrator = create_orchestrator(db)
 
@@ -55,12 +94,8 @@ insights_analyzer = InsightsAnalyzer(db)
 
 # AI analyzer (Groq)
 GROQ_API_KEY = os.getenv('GROQ_API_KEY')
-if not GROQ_API_KEY:
-    logger.warning("GROQ_API_KEY not set - AI features will be disabled")
-ai_analyzer = AIAnalyzer(api_key=GROQ_API_KEY) if GROQ_API_KEY else None
-
-# Content generator for social media
-content_generator = ContentGenerator(api_key=GROQ_API_KEY, db_manager=db) if GROQ_API_KEY else None
+# Shared request budget for all analysis threads (Groq free tier: 30 RPM)
+GROQ_REQUESTS_PER_MINUTE = int(os.getenv('GROQ_REQUESTS_PER_MINUTE', '30'))
 
 # Scheduler for automatic parsing
 scheduler = get_scheduler()
@@ -86,38 +121,103 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-# Initialize automation components
-topic_selector = TopicSelector(db, insights_analyzer=insights_analyzer)
+# The AI analysis loop logs a line per post; buffer those records and write
+# them to stdout in chunks (flushed per batch, or at once on errors) instead
+# of one blocking stdout write per post.
+_ai_stdout_handler = logging.StreamHandler(sys.stdout)
+_ai_stdout_handler.setFormatter(logging.Formatter(
+    '%(asctime)s [%(levelname)s] [AI] %(message)s',
+    datefmt='%Y-%m-%d %H:%M:%S'
+))
+ai_log_handler = logging.handlers.MemoryHandler(
+    capacity=64, flushLevel=logging.ERROR, target=_ai_stdout_handler
+)
+ai_logger = logging.getLogger(f'{__name__}.ai')
+ai_logger.addHandler(ai_log_handler)
+ai_logger.propagate = False
 
-# IMPORTANT: use_ai=True enables FREE AI image generation via Pollinations.ai
-# Priority: Pollinations AI (FREE!) > Pexels Stock > Gradient Fallback
-print(f"[STARTUP] AI Image Generation: Pollinations.ai (FREE - no API key needed!)", flush=True)
-print(f"[STARTUP] PEXELS_API_KEY (fallback): {'SET' if PEXELS_API_KEY else 'NOT SET'}", flush=True)
+if not GROQ_API_KEY:
+    logger.warning("GROQ_API_KEY not set - AI features will be disabled")
+
+
+# AI and automation components are created on first use, so a worker that
+# only serves dashboard pages never imports Groq, Telegram or the reel
+# renderer (fonts, backgrounds, Pillow) or pays for their setup.
+
+@functools.lru_cache(maxsize=1)
+def get_ai_analyzer():
+    """AIAnalyzer (Groq), or None if GROQ_API_KEY is not set"""
+    if not GROQ_API_KEY:
+        return None
+
+    from analyzers.ai_analyzer import AIAnalyzer
+    return AIAnalyzer(
+        api_key=GROQ_API_KEY,
+        requests_per_minute=GROQ_REQUESTS_PER_MINUTE,
+        http_client=get_groq_http_client()  # Shared keep-alive pool with ContentGenerator
+    )
 
-reel_generator = create_reel_generator(
-    output_dir='generated_reels',
-    use_ai=True,  # FREE AI generation via Pollinations!
-    pexels_key=PEXELS_API_KEY
-)
 
-# Initialize Telegram poster if credentials are provided
-telegram_poster = None
-if TELEGRAM_BOT_TOKEN and TELEGRAM_CHANNEL_ID:
+@functools.lru_cache(maxsize=1)
+def get_content_generator():
+    """ContentGenerator for social media, or None if GROQ_API_KEY is not set"""
+    if not GROQ_API_KEY:
+        return None
+
+    from analyzers.content_generator import ContentGenerator
+    return ContentGenerator(api_key=GROQ_API_KEY, db_manager=db, http_client=get_groq_http_client())
+
+
+@functools.lru_cache(maxsize=1)
+def get_reel_generator():
+    """ReelGenerator for post images"""
+    from automation.reel_generator import create_reel_generator
+
+    # IMPORTANT: use_ai=True enables FREE AI image generation via Pollinations.ai
+    # Priority: Pollinations AI (FREE!) > Pexels Stock > Gradient Fallback
+    print(f"[STARTUP] AI Image Generation: Pollinations.ai (FREE - no API key needed!)", flush=True)
+    print(f"[STARTUP] PEXELS_API_KEY (fallback): {'SET' if PEXELS_API_KEY else 'NOT SET'}", flush=True)
+
+    return create_reel_generator(
+        output_dir='generated_reels',
+        use_ai=True,  # FREE AI generation via Pollinations!
+        pexels_key=PEXELS_API_KEY,
+        http_session=get_http_session()  # Shared keep-alive pool for Pollinations/Pexels
+    )
+
+
+@functools.lru_cache(maxsize=1)
+def get_telegram_poster():
+    """TelegramPoster, or None if credentials are not provided / invalid"""
+    if not (TELEGRAM_BOT_TOKEN and TELEGRAM_CHANNEL_ID):
+        return None
+
+    from automation.telegram_poster import TelegramPoster
     try:
         telegram_poster = TelegramPoster(TELEGRAM_BOT_TOKEN, TELEGRAM_CHANNEL_ID)
         logger.info(f"Telegram poster initialized for channel: {TELEGRAM_CHANNEL_ID}")
+        return telegram_poster
     except Exception as e:
         logger.error(f"Failed to initialize Telegram poster: {e}")
+        return None
 
-# Initialize AutoContentSystem if GROQ API key is available
-auto_system = None
-if GROQ_API_KEY:
+
+@functools.lru_cache(maxsize=1)
+def get_auto_system():
+    """AutoContentSystem, or None if GROQ_API_KEY is not set"""
+    if not GROQ_API_KEY:
+        return None
+
+    from automation.topic_selector import TopicSelector
+    from automation.auto_content_system import AutoContentSystem
+
+    telegram_poster = get_telegram_poster()
     auto_system = AutoContentSystem(
         db_manager=db,
-        content_generator=content_generator,
-        topic_selector=topic_selector,
+        content_generator=get_content_generator(),
+        topic_selector=TopicSelector(db, insights_analyzer=insights_analyzer),
         telegram_poster=telegram_poster,
-        reel_generator=reel_generator,
+        reel_generator_factory=get_reel_generator,  # Built on first reel
         config={
             'topic_exclude_days': int(os.getenv('TOPIC_EXCLUDE_DAYS', '30')),
             'topic_prefer_trending': os.getenv('TOPIC_PREFER_TRENDING', 'true').lower() == 'true',
@@ -128,27 +228,189 @@ if GROQ_API_KEY:
             'reel_aspect_ratio': os.getenv('REEL_ASPECT_RATIO', 'square'),
             'reel_style': os.getenv('REEL_STYLE', 'modern'),
             'enable_reel': os.getenv('ENABLE_REEL', 'true').lower() == 'true',
+            'reel_processes': int(os.getenv('REEL_PROCESSES', '0')),
             'enable_telegram': telegram_poster is not None,
         }
     )
     logger.info("AutoContentSystem initialized")
+    return auto_system
+
+
+def run_generate_and_post() -> dict:
+    """Run one full AutoContentSystem cycle (topic -> content -> image -> Telegram)"""
+    from automation.auto_content_system import sync_generate_and_post
+    return sync_generate_and_post(get_auto_system())
+
+
+def run_auto_generate_job() -> dict:
+    """
+    Background job for /api/auto-generate
+
+    Returns:
+        The /api/auto-generate/status payload. It is stored as the job
+        result, so the row holds the summary and not the topic's posts.
+    """
+    result = run_generate_and_post()
+    topic = result.get('topic')
+
+    return {
+        'status': 'success' if result['success'] else 'error',
+        'content_id': result.get('content_id'),
+        'message_id': result.get('message_id'),
+        'image_path': result.get('image_path'),
+        'topic': {
+            'keywords': topic.get('keywords', [])[:5] if topic else None,
+            'post_count': topic.get('post_count', 0) if topic else 0
+        },
+        'error': result.get('error'),
+        'timestamp': result['timestamp'].isoformat() if result.get('timestamp') else None
+    }
+
 
 # Initialize automation scheduler
-automation_scheduler = BackgroundScheduler()
+# Jobs are stored in the database so all gunicorn workers share one schedule;
+# only the worker holding SCHEDULER_LEADER_LOCK_ID runs them (see init_app).
+# 'volatile' is for per-process helper jobs that must not be shared.
+# 'default' pool for analytics jobs, 'io' pool for reel/Telegram jobs that
+# mostly wait on the network, so a slow reel never blocks other jobs.
+# coalesce=True collapses runs missed while the process was down into one.
+automation_scheduler = BackgroundScheduler(
+    jobstores={
+        'default': SQLAlchemyJobStore(engine=db.engine),
+        'volatile': MemoryJobStore(),
+    },
+    executors={
+        'default': ThreadPoolExecutor(8),
+        'io': ThreadPoolExecutor(16),
+        'poll': ThreadPoolExecutor(1),
+    },
+    job_defaults={
+        'coalesce': True,
+        'max_instances': 1,
+        'misfire_grace_time': 300,
+    }
+)
 automation_scheduler_enabled = False
 
+# Postgres advisory lock key held by the worker that runs scheduled jobs
+SCHEDULER_LEADER_LOCK_ID = 0x4E495031
+is_scheduler_leader = False
+
+# How often the leader checks the shared job store for jobs added by other workers
+JOBSTORE_POLL_SECONDS = 30
+
+# How often every worker checks the leader lock (the leader that it still
+# holds it, standbys whether it is free to take over)
+LEADER_CHECK_SECONDS = 30
+_leader_watch_started = False
+
+# How often the leader looks for interrupted content workflows (first check
+# a minute after startup)
+WORKFLOW_RESUME_MINUTES = 10
+
+# The poll job runs every JOBSTORE_POLL_SECONDS - keep it out of the logs
+logging.getLogger('apscheduler.executors.poll').setLevel(logging.WARNING)
+
 # Set up scheduler with orchestrator and analyze callback
 scheduler.set_orchestrator(orchestrator)
-scheduler.set_analyze_callback(
-    lambda: signal_detector.detect_all_signals(lookback_days=7, min_mentions=3)
-)
 
-# Parser status
+
+def analyze_after_parse():
+    """Post-parse analysis: signals + topic clusters for related posts"""
+    signal_detector.detect_all_signals(lookback_days=7, min_mentions=3)
+    insights_analyzer.cluster_similar_posts(lookback_days=7, persist=True)
+
+
+scheduler.set_analyze_callback(analyze_after_parse)
+
+# Parser status (written by the parser job, read by request handlers)
 parser_status = {
     'is_running': False,
     'last_run': None,
     'current_section': None
 }
+parser_status_lock = threading.Lock()
+
+# Scheduler job id shared by all on-demand parser runs, also the id of the
+# background_jobs row that tells every worker a parse is queued or running
+PARSER_JOB_ID = 'manual_parse'
+
+# A parse that has not reported progress for this long is treated as dead
+PARSER_RUN_STALE_SECONDS = 3600
+
+# Posts per read page / bulk write in run_auto_ai_analysis
+AI_ANALYSIS_BATCH_SIZE = 50
+
+# Concurrent Groq calls per batch (pacing is enforced by AIAnalyzer)
+AI_ANALYSIS_WORKERS = 8
+
+# Results buffered before a bulk write in /api/ai-analyze-batch
+AI_SAVE_CHUNK_SIZE = 25
+
+# Short-lived cache for dashboard counters
+stats_cache = TTLCache(ttl=30)
+
+# Serialized 'default' store jobs for /api/automation-status, rebuilt by a
+# scheduler listener when jobs change instead of on every poll. Listeners
+# only see this process's events (a paused standby never runs the jobs), so
+# the snapshot is also rebuilt from the shared store once it is this old
+JOBS_SNAPSHOT_TTL = 30
+_jobs_snapshot = None
+_jobs_snapshot_at = 0.0
+_jobs_snapshot_lock = threading.Lock()
+
+# Background jobs for slow request work (LLM calls): the request returns a
+# job_id immediately and the client polls for the result. Job state lives in
+# the background_jobs table so any gunicorn worker can answer the poll.
+BG_EXECUTOR = concurrent.futures.ThreadPoolExecutor(max_workers=4, thread_name_prefix='bg-job')
+BG_JOB_TTL = 3600  # Forget jobs after an hour
+
+
+class JobInputError(Exception):
+    """Raised by a background job when its request input is unusable (HTTP 400)"""
+
+
+def submit_background_job(kind: str, func, *args) -> str:
+    """
+    Run func(*args) on BG_EXECUTOR, recording its outcome in the database
+
+    func must return a JSON-serializable dict. JobInputError is reported
+    to the poller as HTTP 400, any other exception as HTTP 500.
+
+    Returns:
+        job_id to poll with get_background_job()
+    """
+    job_id = uuid.uuid4().hex
+
+    def run():
+        try:
+            result = func(*args)
+        except JobInputError as e:
+            db.finish_background_job(job_id, error=str(e), error_code=400)
+        except Exception as e:
+            logger.error(f"Background job {job_id} ({kind}) failed: {e}", exc_info=True)
+            db.finish_background_job(job_id, error=str(e), error_code=500)
+        else:
+            db.finish_background_job(job_id, result=result)
+        finally:
+            db.remove_session()
+
+    db.cleanup_background_jobs(BG_JOB_TTL)
+    if not db.create_background_job(job_id, kind):
+        raise RuntimeError('Could not record background job')
+
+    BG_EXECUTOR.submit(run)
+    return job_id
+
+
+def get_background_job(job_id: str) -> Optional[dict]:
+    """
+    Get job state by id (see UniversalDatabaseManager.get_background_job)
+
+    Returns:
+        {'status', 'result', 'error', 'error_code'} or None if job_id is unknown
+    """
+    return db.get_background_job(job_id)
 
 
 @app.route('/')
@@ -161,7 +423,7 @@ def index():
                           stats=stats,
                           recent_runs=recent_runs,
                           parser_status=parser_status,
-                          time_ago=time_ago)
+                          time_ago=time_ago_cached)
 
 
 @app.route('/posts')
@@ -185,7 +447,7 @@ def posts():
                           post_type=post_type,
                           source=source,
                           search_query=search_query,
-                          time_ago=time_ago,
+                          time_ago=time_ago_cached,
                           truncate_text=truncate_text,
                           clean_html=clean_html)
 
@@ -208,7 +470,7 @@ def post_detail(post_id):
                           post=post,
                           comments=comments,
                           related_posts=related_posts,
-                          time_ago=time_ago,
+                          time_ago=time_ago_cached,
                           clean_html=clean_html)
 
 
@@ -230,7 +492,7 @@ def signals():
     return render_template('signals_v2.html',
                           signals=signals,
                           cross_source_signals=cross_source_signals,
-                          time_ago=time_ago)
+                          time_ago=time_ago_cached)
 
 
 @app.route('/analytics')
@@ -257,17 +519,14 @@ def analytics():
 @app.route('/api/parse', methods=['POST'])
 def start_parsing():
     """Start parsing all sources"""
-    if parser_status['is_running']:
-        return jsonify({'status': 'error', 'message': 'Парсер уже запущен'}), 400
-
     # Get parameters
     data = request.get_json() or {}
     sources = data.get('sources', None)  # None = all sources
     limit = data.get('limit', 20)
 
-    # Run parser in background thread
-    thread = threading.Thread(target=run_parser, args=(sources, limit))
-    thread.start()
+    # Run parser as a scheduler job (one at a time)
+    if not schedule_parser_run(sources, limit):
+        return jsonify({'status': 'error', 'message': 'Парсер уже запущен'}), 400
 
     return jsonify({'status': 'success', 'message': 'Парсер запущен'})
 
@@ -312,7 +571,6 @@ def run_insights():
         })
     except Exception as e:
         logger.error(f"Insights analysis error: {e}")
-        import traceback
         return jsonify({'status': 'error', 'message': str(e), 'traceback': traceback.format_exc()}), 500
 
 
@@ -323,8 +581,16 @@ def get_status():
     orch_status = orchestrator.get_status()
     scheduler_status = scheduler.get_status()
 
+    with parser_status_lock:
+        current_parser_status = dict(parser_status)
+
+    # The parse may be running on another worker
+    shared_run = db.get_background_job(PARSER_JOB_ID)
+    if shared_run and shared_run['status'] == 'pending':
+        current_parser_status['is_running'] = True
+
     return jsonify({
-        'parser_status': parser_status,
+        'parser_status': current_parser_status,
         'orchestrator_status': orch_status,
         'scheduler_status': scheduler_status,
         'stats': stats
@@ -419,7 +685,7 @@ def ai_analyze_post(post_id):
             return jsonify({'status': 'error', 'message': 'Post not found'}), 404
 
         # Run AI analysis
-        analysis = ai_analyzer.analyze_post(post.title, post.content or '')
+        analysis = get_ai_analyzer().analyze_post(post.title, post.content or '')
 
         # Save results
         db.save_ai_analysis(post_id, analysis)
@@ -441,7 +707,6 @@ def ai_analyze_batch():
         limit = data.get('limit', 20)
 
         # Get posts without AI analysis
-        from storage.universal_models import UniversalPost
 
         posts = db.session.query(UniversalPost).filter(
             UniversalPost.ai_summary == None
@@ -456,17 +721,27 @@ def ai_analyze_batch():
                 'analyzed_count': 0
             })
 
-        # Analyze in background
+        # Analyze in background (detach rows: the thread has its own session)
+        ai_analyzer = get_ai_analyzer()
+        post_rows = [(post.id, post.title, post.content) for post in posts]
+
         def analyze_posts():
             analyzed = 0
-            for post in posts:
+            pending_writes = []
+            for post_id, title, content in post_rows:
                 try:
-                    analysis = ai_analyzer.analyze_post(post.title, post.content or '')
-                    db.save_ai_analysis(post.id, analysis)
-                    analyzed += 1
+                    pending_writes.append((post_id, ai_analyzer.analyze_post(title, content or '')))
                 except Exception as e:
-                    print(f"Error analyzing post {post.id}: {e}")
+                    print(f"Error analyzing post {post_id}: {e}")
+
+                # Write results in chunks: one UPDATE round trip + commit per chunk
+                if len(pending_writes) >= AI_SAVE_CHUNK_SIZE:
+                    analyzed += db.save_ai_analyses(pending_writes)
+                    pending_writes = []
+
+            analyzed += db.save_ai_analyses(pending_writes)
             print(f"Batch analysis complete: {analyzed} posts analyzed")
+            db.remove_session()
 
         thread = threading.Thread(target=analyze_posts)
         thread.start()
@@ -508,23 +783,94 @@ def content_studio():
 
 @app.route('/api/generate-content', methods=['POST'])
 def generate_content():
-    """Generate social media content"""
+    """
+    Start social media content generation
+
+    The LLM call takes 5-30s, so it runs as a background job;
+    poll GET /api/generate-content/<job_id> for the result.
+    """
     try:
         data = request.get_json() or {}
 
         source_type = data.get('source_type')  # 'cluster', 'trend', 'topic', 'custom'
-        format_type = data.get('format', 'long_post')  # 'long_post', 'reel', 'thread'
-        tone = data.get('tone', 'professional')
-        language = data.get('language', 'en')
 
-        print(f"[CONTENT GEN] Starting: source={source_type}, format={format_type}, language={language}, tone={tone}", flush=True)
+        if source_type not in ('cluster', 'trend', 'topic', 'custom'):
+            print(f"[CONTENT GEN] ERROR: Invalid source_type={source_type}", flush=True)
+            return jsonify({'status': 'error', 'message': 'Invalid source_type'}), 400
+
+        if source_type == 'topic':
+            keywords = data.get('keywords', [])
+
+            # Validate keywords
+            if not keywords or not isinstance(keywords, list):
+                print(f"[CONTENT GEN] ERROR: Invalid keywords={keywords}", flush=True)
+                return jsonify({'status': 'error', 'message': 'Неверный формат ключевых слов топика'}), 400
+
+        format_type = data.get('format', 'long_post')
+        if format_type not in ('long_post', 'reel', 'thread'):
+            print(f"[CONTENT GEN] ERROR: Invalid format={format_type}", flush=True)
+            return jsonify({'status': 'error', 'message': 'Invalid format'}), 400
+
+        job_id = submit_background_job('generate_content', run_content_generation, data)
+        print(f"[CONTENT GEN] Queued job {job_id}: source={source_type}", flush=True)
+
+        return jsonify({'status': 'pending', 'job_id': job_id}), 202
+
+    except Exception as e:
+        print(f"[CONTENT GEN] ERROR: {e}", flush=True)
+        return jsonify({'status': 'error', 'message': str(e)}), 500
+
+
+@app.route('/api/generate-content/<job_id>', methods=['GET'])
+def get_generate_content_job(job_id):
+    """Poll content generation job started by /api/generate-content"""
+    job = get_background_job(job_id)
+
+    if job is None:
+        return jsonify({'status': 'error', 'message': 'Job not found'}), 404
+
+    if job['status'] == 'pending':
+        return jsonify({'status': 'pending', 'job_id': job_id})
+
+    if job['status'] == 'error':
+        return jsonify({'status': 'error', 'message': job['error']}), job['error_code']
+
+    result = job['result']
+    return jsonify({
+        'status': 'success',
+        'message': 'Content generated successfully',
+        'content_id': result['content_id'],
+        'content': result['content']
+    })
+
+
+def run_content_generation(data: dict) -> dict:
+    """
+    Background job: generate content and save it to the database
+
+    Args:
+        data: Request payload of /api/generate-content
+
+    Returns:
+        {'content_id': int, 'content': dict}
+
+    Raises:
+        JobInputError: If there are no posts to generate from
+    """
+    source_type = data.get('source_type')
+    format_type = data.get('format', 'long_post')  # 'long_post', 'reel', 'thread'
+    tone = data.get('tone', 'professional')
+    language = data.get('language', 'en')
+    content_generator = get_content_generator()
 
+    print(f"[CONTENT GEN] Starting: source={source_type}, format={format_type}, language={language}, tone={tone}", flush=True)
+
+    try:
         # Generate based on source type
         if source_type == 'cluster':
             cluster_id = data.get('cluster_id')
             print(f"[CONTENT GEN] Cluster mode: Getting top 15 posts for cluster {cluster_id}", flush=True)
 
-            from storage.universal_models import UniversalPost
             # Get top posts with AI analysis
             posts = db.session.query(UniversalPost).filter(
                 UniversalPost.ai_summary != None
@@ -535,7 +881,7 @@ def generate_content():
             print(f"[CONTENT GEN] Found {len(posts)} posts with AI analysis", flush=True)
 
             if not posts:
-                return jsonify({'status': 'error', 'message': 'Нет постов с AI анализом. Сначала запустите парсинг.'}), 400
+                raise JobInputError('Нет постов с AI анализом. Сначала запустите парсинг.')
 
             result = content_generator.generate_from_cluster(
                 posts, format_type, tone, language
@@ -558,11 +904,6 @@ def generate_content():
             keywords = data.get('keywords', [])
             lookback_days = data.get('lookback_days', 7)
 
-            # Validate keywords
-            if not keywords or not isinstance(keywords, list):
-                print(f"[CONTENT GEN] ERROR: Invalid keywords={keywords}", flush=True)
-                return jsonify({'status': 'error', 'message': 'Неверный формат ключевых слов топика'}), 400
-
             print(f"[CONTENT GEN] Topic mode: keywords={keywords[:3]}..., total={len(keywords)}, lookback={lookback_days} days", flush=True)
 
             result = content_generator.generate_from_topic(
@@ -571,28 +912,23 @@ def generate_content():
             result['source_type'] = 'topic'
             result['source_description'] = f'Topic: {", ".join(keywords[:3])}'
 
-        elif source_type == 'custom':
+        else:
             # Custom post IDs
             post_ids = data.get('post_ids', [])
             print(f"[CONTENT GEN] Custom mode: {len(post_ids)} post IDs", flush=True)
 
-            from storage.universal_models import UniversalPost
-
             posts = db.session.query(UniversalPost).filter(
                 UniversalPost.id.in_(post_ids)
             ).all()
 
             if not posts:
-                return jsonify({'status': 'error', 'message': 'Указанные посты не найдены'}), 400
+                raise JobInputError('Указанные посты не найдены')
 
             result = content_generator.generate_from_cluster(
                 posts, format_type, tone, language
             )
             result['source_type'] = 'custom'
             result['source_description'] = f'{len(post_ids)} selected posts'
-        else:
-            print(f"[CONTENT GEN] ERROR: Invalid source_type={source_type}", flush=True)
-            return jsonify({'status': 'error', 'message': 'Invalid source_type'}), 400
 
         print(f"[CONTENT GEN] Generation successful! Content length: {len(str(result.get('content', '')))} chars", flush=True)
 
@@ -603,18 +939,15 @@ def generate_content():
 
         print(f"[CONTENT GEN] Saved to database with ID: {content_id}", flush=True)
 
-        return jsonify({
-            'status': 'success',
-            'message': 'Content generated successfully',
-            'content_id': content_id,
-            'content': result
-        })
+        return {'content_id': content_id, 'content': result}
 
+    except JobInputError:
+        # Bad request input, reported to the poller as HTTP 400 - no traceback
+        raise
     except Exception as e:
-        import traceback
         error_msg = f"{e}\n{traceback.format_exc()}"
         print(f"[CONTENT GEN] ERROR: {error_msg}", flush=True)
-        return jsonify({'status': 'error', 'message': str(e)}), 500
+        raise
 
 
 @app.route('/api/generated-content')
@@ -698,8 +1031,7 @@ def test_dashboard():
 def get_posts_count():
     """Get total count of posts in database"""
     try:
-        from storage.universal_models import UniversalPost
-        count = db.session.query(UniversalPost).count()
+        count = stats_cache.get_or_set('posts_count', lambda: db.count_posts(estimate=True))
         return jsonify({'count': count})
     except Exception as e:
         return jsonify({'status': 'error', 'message': str(e)}), 500
@@ -722,8 +1054,13 @@ def get_topics():
 
 @app.route('/api/auto-generate', methods=['POST'])
 def trigger_auto_generate():
-    """Manually trigger automated content generation"""
-    if not auto_system:
+    """
+    Manually trigger automated content generation
+
+    The pipeline (LLM + image + Telegram) takes tens of seconds, so it runs
+    as a background job; poll GET /api/auto-generate/status/<task_id>.
+    """
+    if not get_auto_system():
         return jsonify({
             'status': 'error',
             'message': 'AutoContentSystem not configured. Check GROQ_API_KEY.'
@@ -732,28 +1069,34 @@ def trigger_auto_generate():
     logger.info("Manual auto-generate triggered via API")
 
     try:
-        result = sync_generate_and_post(auto_system)
-
-        return jsonify({
-            'status': 'success' if result['success'] else 'error',
-            'content_id': result.get('content_id'),
-            'message_id': result.get('message_id'),
-            'image_path': result.get('image_path'),
-            'topic': {
-                'keywords': result.get('topic', {}).get('keywords', [])[:5] if result.get('topic') else None,
-                'post_count': result.get('topic', {}).get('post_count', 0) if result.get('topic') else 0
-            },
-            'error': result.get('error'),
-            'timestamp': result.get('timestamp').isoformat() if result.get('timestamp') else None
-        })
+        task_id = submit_background_job('auto_generate', run_auto_generate_job)
+        return jsonify({'status': 'pending', 'task_id': task_id}), 202
     except Exception as e:
         logger.error(f"Auto-generate failed: {e}", exc_info=True)
         return jsonify({'status': 'error', 'message': str(e)}), 500
 
 
+@app.route('/api/auto-generate/status/<task_id>', methods=['GET'])
+def get_auto_generate_status(task_id):
+    """Poll generation job started by /api/auto-generate"""
+    job = get_background_job(task_id)
+
+    if job is None:
+        return jsonify({'status': 'error', 'message': 'Task not found'}), 404
+
+    if job['status'] == 'pending':
+        return jsonify({'status': 'pending', 'task_id': task_id})
+
+    if job['status'] == 'error':
+        return jsonify({'status': 'error', 'message': job['error']}), job['error_code']
+
+    return jsonify(job['result'])
+
+
 @app.route('/api/auto-stats', methods=['GET'])
 def get_auto_stats():
     """Get automation system statistics"""
+    auto_system = get_auto_system()
     if not auto_system:
         return jsonify({
             'status': 'error',
@@ -761,7 +1104,7 @@ def get_auto_stats():
         }), 500
 
     try:
-        stats = auto_system.get_stats()
+        stats = auto_system.get_stats()  # Cached by AutoContentSystem
         return jsonify({
             'status': 'success',
             'stats': stats
@@ -771,20 +1114,55 @@ def get_auto_stats():
         return jsonify({'status': 'error', 'message': str(e)}), 500
 
 
+def rebuild_jobs_snapshot(event=None):
+    """
+    Re-serialize the shared job store into _jobs_snapshot
+
+    Registered as an automation_scheduler listener for job added / removed /
+    modified / executed events (next_run_time moves after each run), and
+    called by get_scheduled_jobs() once the snapshot is older than
+    JOBS_SNAPSHOT_TTL. Events for the per-process 'volatile' store (the poll
+    job) are ignored.
+    """
+    global _jobs_snapshot, _jobs_snapshot_at
+
+    if event is not None and getattr(event, 'jobstore', 'default') != 'default':
+        return
+
+    jobs = [
+        {
+            'id': job.id,
+            'name': job.name,
+            'next_run': job.next_run_time.isoformat() if job.next_run_time else None,
+            'trigger': str(job.trigger)
+        }
+        for job in automation_scheduler.get_jobs(jobstore='default')
+    ]
+    with _jobs_snapshot_lock:
+        _jobs_snapshot = jobs
+        _jobs_snapshot_at = time.monotonic()
+
+
+automation_scheduler.add_listener(
+    rebuild_jobs_snapshot,
+    EVENT_JOB_ADDED | EVENT_JOB_REMOVED | EVENT_JOB_MODIFIED | EVENT_JOB_EXECUTED
+)
+
+
+def get_scheduled_jobs():
+    """Serialized automation scheduler jobs (empty while automation is disabled)"""
+    if not (automation_scheduler and automation_scheduler_enabled):
+        return []
+    if _jobs_snapshot is None or time.monotonic() - _jobs_snapshot_at > JOBS_SNAPSHOT_TTL:
+        rebuild_jobs_snapshot()
+    return _jobs_snapshot
+
+
 @app.route('/api/automation-status', methods=['GET'])
 def get_automation_status():
     """Get automation scheduler status"""
-    global automation_scheduler_enabled
-
-    jobs = []
-    if automation_scheduler and automation_scheduler_enabled:
-        for job in automation_scheduler.get_jobs():
-            jobs.append({
-                'id': job.id,
-                'name': job.name,
-                'next_run': job.next_run_time.isoformat() if job.next_run_time else None,
-                'trigger': str(job.trigger)
-            })
+    auto_system = get_auto_system()
+    jobs = get_scheduled_jobs()
 
     # Parse hours for display
     schedule_times = None
@@ -794,11 +1172,13 @@ def get_automation_status():
 
     return jsonify({
         'enabled': automation_scheduler_enabled,
+        'scheduler_leader': is_scheduler_leader,
         'configured': auto_system is not None,
-        'telegram_enabled': telegram_poster is not None,
+        'telegram_enabled': get_telegram_poster() is not None,
         'schedule': schedule_times,
         'jobs': jobs,
-        'config': auto_system.config if auto_system else None
+        'config': dict(auto_system.config) if auto_system else None,
+        'db_pool': db.engine.pool.status()
     })
 
 
@@ -807,7 +1187,7 @@ def enable_automation():
     """Enable automated content generation"""
     global automation_scheduler_enabled
 
-    if not auto_system:
+    if not get_auto_system():
         return jsonify({
             'status': 'error',
             'message': 'AutoContentSystem not configured'
@@ -816,20 +1196,7 @@ def enable_automation():
     try:
         # Add scheduled job(s) if not already added - supports multiple times per day
         if not automation_scheduler_enabled:
-            # Parse hours - can be single "9" or multiple "9,14,20"
-            hours = [int(h.strip()) for h in AUTO_GENERATE_HOURS.split(',')]
-
-            # Create a job for each hour
-            for idx, hour in enumerate(hours):
-                automation_scheduler.add_job(
-                    func=scheduled_content_generation,
-                    trigger='cron',
-                    hour=hour,
-                    minute=AUTO_GENERATE_MINUTE,
-                    id=f'content_generation_{idx}',
-                    name=f'Automated content generation at {hour:02d}:{AUTO_GENERATE_MINUTE:02d}',
-                    replace_existing=True
-                )
+            hours = schedule_content_generation_jobs()
 
             automation_scheduler_enabled = True
             times_str = ', '.join([f"{h:02d}:{AUTO_GENERATE_MINUTE:02d}" for h in hours])
@@ -852,7 +1219,7 @@ def disable_automation():
 
     try:
         if automation_scheduler_enabled:
-            automation_scheduler.remove_job('daily_content_generation')
+            remove_content_generation_jobs()
             automation_scheduler_enabled = False
             logger.info("Automation disabled")
 
@@ -876,7 +1243,6 @@ def wake_and_run():
 
     Returns status of what was triggered
     """
-    from datetime import datetime, timezone, timedelta
 
     logger.info("=" * 60)
     logger.info("WAKE-AND-RUN: Endpoint called")
@@ -918,16 +1284,15 @@ def wake_and_run():
 
         # Trigger parsing if needed
         if should_parse:
-            if not parser_status['is_running']:
-                thread = threading.Thread(target=run_parser, args=(None, 30))
-                thread.start()
+            if schedule_parser_run(None, 30):
                 tasks_triggered.append('parsing')
                 logger.info("WAKE-AND-RUN: Parsing started in background")
             else:
                 logger.info("WAKE-AND-RUN: Parsing already running, skipping")
 
         # Check if auto-posting is needed
-        if auto_system and AUTO_GENERATE_ENABLED:
+        auto_system = get_auto_system() if AUTO_GENERATE_ENABLED else None
+        if auto_system:
             # Parse scheduled hours
             scheduled_hours = [int(h.strip()) for h in AUTO_GENERATE_HOURS.split(',')]
 
@@ -969,7 +1334,7 @@ def wake_and_run():
 
             if should_post:
                 try:
-                    result = sync_generate_and_post(auto_system)
+                    result = run_generate_and_post()
                     if result['success']:
                         tasks_triggered.append('auto_posting')
                         logger.info(f"WAKE-AND-RUN: Auto-posting completed - Content ID: {result.get('content_id')}")
@@ -997,13 +1362,166 @@ def wake_and_run():
         }), 500
 
 
+def remove_content_generation_jobs():
+    """Remove all content_generation_<n> jobs from the shared job store"""
+    for job in automation_scheduler.get_jobs(jobstore='default'):
+        if job.id.startswith('content_generation_'):
+            try:
+                automation_scheduler.remove_job(job.id, jobstore='default')
+            except JobLookupError:
+                pass  # Removed concurrently by another worker
+
+
+def schedule_content_generation_jobs() -> list:
+    """
+    (Re)create one cron job per AUTO_GENERATE_HOURS entry
+
+    Jobs persist in the database, so jobs for hours that were dropped from
+    the config are removed first.
+
+    Returns:
+        List of scheduled hours
+    """
+    # Parse hours - can be single "9" or multiple "9,14,20"
+    hours = [int(h.strip()) for h in AUTO_GENERATE_HOURS.split(',')]
+
+    remove_content_generation_jobs()
+
+    # Create a job for each hour
+    for idx, hour in enumerate(hours):
+        automation_scheduler.add_job(
+            func=scheduled_content_generation,
+            trigger='cron',
+            hour=hour,
+            minute=AUTO_GENERATE_MINUTE,
+            id=f'content_generation_{idx}',
+            name=f'Automated content generation at {hour:02d}:{AUTO_GENERATE_MINUTE:02d}',
+            executor='io',
+            replace_existing=True
+        )
+
+    return hours
+
+
+def poll_shared_jobstore():
+    """
+    No-op leader job: each run wakes the scheduler, which then picks up
+    jobs other workers added to the shared job store (e.g. manual parses)
+    """
+
+
+def add_leader_jobs():
+    """Add the jobs only the scheduler leader runs (per-process 'volatile' store)"""
+    automation_scheduler.add_job(
+        func=poll_shared_jobstore,
+        trigger='interval',
+        seconds=JOBSTORE_POLL_SECONDS,
+        id='jobstore_poll',
+        jobstore='volatile',
+        executor='poll',
+        replace_existing=True
+    )
+    if GROQ_API_KEY:
+        automation_scheduler.add_job(
+            func=resume_stalled_workflows,
+            trigger='interval',
+            minutes=WORKFLOW_RESUME_MINUTES,
+            next_run_time=datetime.now(timezone.utc) + timedelta(seconds=60),
+            id='workflow_resume',
+            jobstore='volatile',
+            executor='io',
+            replace_existing=True
+        )
+
+
+def check_scheduler_leader():
+    """
+    Keep exactly one worker running scheduled jobs
+
+    The leader checks that it still holds the advisory lock and takes it
+    again if its connection dropped; if another worker got it meanwhile,
+    it pauses its schedulers. A standby tries to take the lock (free once
+    the leader's process is gone) and resumes its schedulers if it does.
+    """
+    global is_scheduler_leader
+
+    if is_scheduler_leader:
+        if db.holds_advisory_lock(SCHEDULER_LEADER_LOCK_ID):
+            return
+
+        if db.try_advisory_lock(SCHEDULER_LEADER_LOCK_ID):
+            logger.warning("Scheduler leader lock was lost and has been re-acquired")
+            return
+
+        logger.error("Scheduler leader lock is held by another worker - pausing schedulers")
+        is_scheduler_leader = False
+        scheduler.scheduler.pause()
+        automation_scheduler.pause()
+
+    elif db.try_advisory_lock(SCHEDULER_LEADER_LOCK_ID):
+        logger.info("Took over as scheduler leader - resuming schedulers")
+        is_scheduler_leader = True
+        add_leader_jobs()
+        scheduler.scheduler.resume()
+        automation_scheduler.resume()
+
+
+def watch_scheduler_leader():
+    """
+    Leader check loop, run on every worker in its own daemon thread
+
+    Not a scheduler job: a standby's schedulers are paused, so a job there
+    would never run and no worker would take over from a dead leader.
+    """
+    while not _schedulers_shut_down:
+        time.sleep(LEADER_CHECK_SECONDS)
+        if _schedulers_shut_down:
+            return
+        try:
+            check_scheduler_leader()
+        except Exception as e:
+            logger.error(f"Scheduler leader check failed: {e}", exc_info=True)
+
+
+def start_leader_watch():
+    """Start the watch_scheduler_leader thread once per process"""
+    global _leader_watch_started
+
+    if _leader_watch_started:
+        return
+    _leader_watch_started = True
+    threading.Thread(target=watch_scheduler_leader, name='leader-watch', daemon=True).start()
+
+
+def resume_stalled_workflows():
+    """
+    Leader job: resume generate_and_post runs interrupted by a crash/restart
+    (see AutoContentSystem.resume_stalled_runs)
+    """
+    auto_system = get_auto_system()
+    if not auto_system:
+        return
+
+    from automation.auto_content_system import sync_resume_stalled_runs
+    try:
+        for result in sync_resume_stalled_runs(auto_system):
+            if result['success']:
+                logger.info(f"Resumed workflow finished - Content ID: {result['content_id']}")
+            else:
+                logger.error(f"Resumed workflow failed - {result['error']}")
+    except Exception as e:
+        logger.error(f"Resuming stalled workflows failed: {e}", exc_info=True)
+    finally:
+        db.remove_session()
+
+
 def scheduled_content_generation():
     """
     Scheduled job for automated content generation
 
     This runs on a schedule (e.g., daily at 9 AM)
     """
-    if not auto_system:
+    if not get_auto_system():
         logger.error("AutoContentSystem not initialized")
         return
 
@@ -1012,7 +1530,7 @@ def scheduled_content_generation():
     logger.info("="*60)
 
     try:
-        result = sync_generate_and_post(auto_system)
+        result = run_generate_and_post()
 
         if result['success']:
             logger.info(f"SUCCESS - Content ID: {result['content_id']}, Message ID: {result['message_id']}")
@@ -1022,6 +1540,8 @@ def scheduled_content_generation():
             logger.error(f"FAILED - {result['error']}")
     except Exception as e:
         logger.error(f"Scheduled generation failed: {e}", exc_info=True)
+    finally:
+        db.remove_session()
 
     logger.info("="*60)
 
@@ -1030,91 +1550,167 @@ def run_auto_ai_analysis():
     """
     Automatically analyze all posts without AI analysis
     Called after parsing completes
+
+    Posts are read in pages of AI_ANALYSIS_BATCH_SIZE (only id/title/content).
+    Groq calls for a page run on AI_ANALYSIS_WORKERS threads; the threads
+    only talk to the API, and the page's results are written back from this
+    thread in one bulk UPDATE.
     """
     try:
-        from storage.universal_models import UniversalPost
-
-        # Get ALL posts without AI analysis (no limit!)
-        posts = db.session.query(UniversalPost).filter(
-            UniversalPost.ai_summary == None
-        ).order_by(
-            UniversalPost.importance_score.desc()
-        ).all()
-
-        if not posts:
-            print("[AI] No posts to analyze", flush=True)
-            return
-
-        print(f"[AI] Found {len(posts)} posts without AI analysis", flush=True)
-
         analyzed = 0
         failed = 0
 
-        for post in posts:
-            try:
-                print(f"[AI] Analyzing post {post.id}: {post.title[:50]}...", flush=True)
-                analysis = ai_analyzer.analyze_post(post.title, post.content or '')
-                db.save_ai_analysis(post.id, analysis)
-                analyzed += 1
-                print(f"[AI] Successfully analyzed post {post.id} ({analyzed}/{len(posts)})", flush=True)
-            except Exception as e:
-                failed += 1
-                print(f"[AI] Failed to analyze post {post.id}: {e}", flush=True)
+        with concurrent.futures.ThreadPoolExecutor(
+            max_workers=AI_ANALYSIS_WORKERS, thread_name_prefix='ai-analyze'
+        ) as pool:
+            for batch in db.iter_posts_pending_analysis(batch_size=AI_ANALYSIS_BATCH_SIZE):
+                ai_logger.info("Analyzing batch of %d posts without AI analysis", len(batch))
+                results = []
+
+                futures = {
+                    pool.submit(get_ai_analyzer().analyze_post, title, content or ''): (post_id, title)
+                    for post_id, title, content in batch
+                }
+                for future in concurrent.futures.as_completed(futures):
+                    post_id, title = futures[future]
+                    try:
+                        results.append((post_id, future.result()))
+                        ai_logger.info("Analyzed post %s: %s", post_id, title[:50])
+                    except Exception as e:
+                        failed += 1
+                        ai_logger.warning("Failed to analyze post %s: %s", post_id, e)
+
+                saved = db.save_ai_analyses(results)
+                failed += len(results) - saved
+                analyzed += saved
+                ai_logger.info("Saved %d analyses (%d so far)", saved, analyzed)
+                ai_log_handler.flush()
+
+        if analyzed == 0 and failed == 0:
+            ai_logger.info("No posts to analyze")
+            return
 
-        print(f"[AI] AI analysis complete: {analyzed} analyzed, {failed} failed", flush=True)
+        ai_logger.info("AI analysis complete: %d analyzed, %d failed", analyzed, failed)
 
     except Exception as e:
-        print(f"[AI] Error in auto AI analysis: {e}", flush=True)
+        ai_logger.error("Error in auto AI analysis: %s", e, exc_info=True)
+    finally:
+        ai_log_handler.flush()
+
+
+def update_parser_status(**fields):
+    """Update parser_status under parser_status_lock and refresh the shared run row"""
+    with parser_status_lock:
+        parser_status.update(fields)
+    db.touch_background_job(PARSER_JOB_ID)
 
 
 def run_parser(sources=None, limit=20):
-    """Background task to run the parser"""
-    parser_status['is_running'] = True
-    parser_status['last_run'] = datetime.now(timezone.utc)
+    """Parser job: parse sources, then run AI analysis and clustering"""
+    update_parser_status(is_running=True, last_run=datetime.now(timezone.utc))
+    error = None
 
     try:
         if sources:
             # Parse specific sources
             for source in sources:
-                parser_status['current_section'] = f"{source}"
-                print(f"[PARSER] Starting to parse: {source}", flush=True)
+                update_parser_status(current_section=f"{source}")
+                logger.info(f"[PARSER] Starting to parse: {source}")
                 orchestrator.parse_source(source, limit_per_section=limit)
-                print(f"[PARSER] Completed parsing: {source}", flush=True)
+                logger.info(f"[PARSER] Completed parsing: {source}")
         else:
             # Parse all sources
-            parser_status['current_section'] = 'Все источники'
-            print(f"[PARSER] Starting to parse all sources", flush=True)
+            update_parser_status(current_section='Все источники')
+            logger.info("[PARSER] Starting to parse all sources")
             results = orchestrator.parse_all(limit_per_section=limit)
-            print(f"[PARSER] Completed parsing all sources: {results}", flush=True)
+            logger.info(f"[PARSER] Completed parsing all sources: {results}")
 
         # AUTO AI ANALYSIS: Analyze all posts without AI analysis
-        parser_status['current_section'] = 'AI анализ'
-        print("[PARSER] Starting automatic AI analysis for new posts", flush=True)
+        update_parser_status(current_section='AI анализ')
+        logger.info("[PARSER] Starting automatic AI analysis for new posts")
         run_auto_ai_analysis()
-        print("[PARSER] AI analysis completed", flush=True)
+        logger.info("[PARSER] AI analysis completed")
+
+        # Refresh topic clusters used for related posts on detail pages
+        update_parser_status(current_section='Кластеризация')
+        insights_analyzer.cluster_similar_posts(lookback_days=7, persist=True)
 
     except Exception as e:
-        import traceback
-        error_msg = f"Parser error: {e}\n{traceback.format_exc()}"
-        print(error_msg, flush=True)
-        parser_status['current_section'] = f"Ошибка: {str(e)}"
+        logger.error(f"[PARSER] Parser error: {e}", exc_info=True)
+        update_parser_status(current_section=f"Ошибка: {str(e)}")
+        error = str(e)
 
     finally:
-        parser_status['is_running'] = False
-        parser_status['current_section'] = None
-        print("[PARSER] Parser stopped", flush=True)
+        update_parser_status(is_running=False, current_section=None)
+        db.finish_background_job(PARSER_JOB_ID, result={'sources': sources}, error=error)
+        db.remove_session()
+        logger.info("[PARSER] Parser stopped")
+
+
+def schedule_parser_run(sources=None, limit=20, delay_seconds=0) -> bool:
+    """
+    Queue run_parser on the automation scheduler
+
+    All on-demand runs share PARSER_JOB_ID with max_instances=1, so manual
+    triggers never stack up or overlap a run in progress. The date job
+    leaves the job store once it starts, so the check is the shared
+    PARSER_JOB_ID row in background_jobs: a run queued on a standby while
+    the leader is parsing would otherwise be dropped by max_instances.
+
+    Returns:
+        False if a parser run is already queued or running (on any worker)
+    """
+    if not db.claim_background_job(PARSER_JOB_ID, 'parse', PARSER_RUN_STALE_SECONDS):
+        return False
+
+    try:
+        automation_scheduler.add_job(
+            func=run_parser,
+            trigger='date',
+            run_date=datetime.now(timezone.utc) + timedelta(seconds=delay_seconds),
+            args=[sources, limit],
+            id=PARSER_JOB_ID,
+            name='On-demand parser run',
+            max_instances=1,
+            coalesce=True,
+            misfire_grace_time=60,
+            replace_existing=False
+        )
+    except ConflictingIdError:
+        # A run queued earlier is still waiting and will release the claim
+        return False
+    except Exception as e:
+        db.finish_background_job(PARSER_JOB_ID, error=str(e))
+        raise
+
+    return True
+
+
+def release_skipped_parser_run(event):
+    """Scheduler listener: release the shared parse claim when its run is skipped"""
+    if event.job_id == PARSER_JOB_ID:
+        db.finish_background_job(PARSER_JOB_ID, error='Parser run was skipped by the scheduler')
+
+
+automation_scheduler.add_listener(release_skipped_parser_run, EVENT_JOB_MISSED | EVENT_JOB_MAX_INSTANCES)
 
 
 @app.template_filter('time_ago')
 def time_ago_filter(dt):
     """Template filter for time ago"""
-    return time_ago(dt)
+    return time_ago_cached(dt)
 
 
-# Initialize application (runs on import, so works with gunicorn)
+# Initialize application (runs on first request, see ensure_app_initialized)
 def init_app():
-    """Initialize application components"""
-    global automation_scheduler_enabled
+    """
+    Initialize application components
+
+    Safe to call again if an earlier call failed part-way: schedulers that
+    are already running are left alone, and _app_initialized is set as soon
+    as they are up, so later setup errors don't restart them on every request.
+    """
+    global automation_scheduler_enabled, is_scheduler_leader, _app_initialized
 
     # Create data directory if it doesn't exist
     os.makedirs('data', exist_ok=True)
@@ -1123,8 +1719,22 @@ def init_app():
     # Initialize database
     db.engine
 
-    # Start parsing scheduler
-    scheduler.start()
+    # Every gunicorn worker imports this module; only one of them may run
+    # scheduled jobs, otherwise each parse/post would fire once per worker.
+    # The others start their schedulers paused (jobs can still be added).
+    if not automation_scheduler.running:
+        is_scheduler_leader = db.try_advisory_lock(SCHEDULER_LEADER_LOCK_ID)
+
+        # Start parsing scheduler
+        scheduler.start(paused=not is_scheduler_leader)
+
+        # Start automation scheduler (before anything queues jobs on it)
+        automation_scheduler.start(paused=not is_scheduler_leader)
+        if is_scheduler_leader:
+            add_leader_jobs()
+    start_leader_watch()
+    _app_initialized = True
+    logger.info(f"Automation scheduler started ({'leader' if is_scheduler_leader else 'standby'})")
 
     print("=" * 50, flush=True)
     print("News Insight Parser - Version 2.0 + Automation", flush=True)
@@ -1153,7 +1763,6 @@ def init_app():
     print("[STARTUP] Checking for missed tasks...", flush=True)
 
     try:
-        from datetime import datetime, timezone
 
         # Check last parse time
         last_parse_time = None
@@ -1184,42 +1793,19 @@ def init_app():
 
         # Trigger parsing if needed
         if should_parse:
-            def delayed_startup_parse():
-                """Run parsing after 10 seconds to let server fully start"""
-                import time
-                time.sleep(10)
-                print("[STARTUP] Starting delayed parsing...", flush=True)
-                run_parser(sources=None, limit=30)
-
-            thread = threading.Thread(target=delayed_startup_parse)
-            thread.daemon = True
-            thread.start()
-            print("[STARTUP] Scheduled startup parsing in 10 seconds", flush=True)
+            # Run parsing after 10 seconds to let server fully start
+            if schedule_parser_run(sources=None, limit=30, delay_seconds=10):
+                print("[STARTUP] Scheduled startup parsing in 10 seconds", flush=True)
+            else:
+                print("[STARTUP] Parsing already scheduled by another worker", flush=True)
 
     except Exception as e:
         print(f"[STARTUP] Error checking missed tasks: {e}", flush=True)
 
-    # Start automation scheduler
-    automation_scheduler.start()
-    logger.info("Automation scheduler started")
-
     # Add automation job(s) if enabled - supports multiple times per day
-    if AUTO_GENERATE_ENABLED and auto_system:
+    if AUTO_GENERATE_ENABLED and GROQ_API_KEY:
         try:
-            # Parse hours - can be single "9" or multiple "9,14,20"
-            hours = [int(h.strip()) for h in AUTO_GENERATE_HOURS.split(',')]
-
-            # Create a job for each hour
-            for idx, hour in enumerate(hours):
-                automation_scheduler.add_job(
-                    func=scheduled_content_generation,
-                    trigger='cron',
-                    hour=hour,
-                    minute=AUTO_GENERATE_MINUTE,
-                    id=f'content_generation_{idx}',
-                    name=f'Automated content generation at {hour:02d}:{AUTO_GENERATE_MINUTE:02d}',
-                    replace_existing=True
-                )
+            hours = schedule_content_generation_jobs()
 
             automation_scheduler_enabled = True
             times_str = ', '.join([f"{h:02d}:{AUTO_GENERATE_MINUTE:02d}" for h in hours])
@@ -1227,39 +1813,105 @@ def init_app():
         except Exception as e:
             logger.error(f"Failed to schedule automation: {e}")
     else:
+        # Drop jobs persisted while auto-generate was enabled
+        try:
+            remove_content_generation_jobs()
+        except Exception as e:
+            logger.error(f"Failed to remove automation jobs: {e}")
         logger.info("[AUTOMATION] Auto-generate: OFF (set AUTO_GENERATE_ENABLED=true to enable)")
 
     # Show automation status
-    if auto_system:
-        print(f"[AUTOMATION] Configured: YES | Telegram: {'YES' if telegram_poster else 'NO'}", flush=True)
+    # Components themselves are created on first use
+    if GROQ_API_KEY:
+        telegram_configured = bool(TELEGRAM_BOT_TOKEN and TELEGRAM_CHANNEL_ID)
+        print(f"[AUTOMATION] Configured: YES | Telegram: {'YES' if telegram_configured else 'NO'}", flush=True)
     else:
         print("[AUTOMATION] Configured: NO (GROQ_API_KEY required)", flush=True)
 
     print("=" * 50, flush=True)
 
-    # Register shutdown handler
+    # Register shutdown handler (SIGTERM is hooked at import, see below)
     atexit.register(shutdown_scheduler)
 
 
+_schedulers_shut_down = False
+_shutdown_lock = threading.Lock()
+
+
 def shutdown_scheduler():
-    """Shutdown schedulers gracefully"""
+    """
+    Stop both schedulers without waiting for running jobs
+
+    Waiting could outlast gunicorn's graceful timeout and get the worker
+    SIGKILLed; interrupted jobs are picked up again from the shared job
+    store (coalesce / misfire_grace_time). Safe to call more than once.
+    """
+    global _schedulers_shut_down
+
+    with _shutdown_lock:
+        if _schedulers_shut_down:
+            return
+        _schedulers_shut_down = True
+
     try:
-        if scheduler:
-            scheduler.shutdown()
-            logger.info("Parser scheduler shutdown")
-    except:
-        pass
+        scheduler.stop(wait=False)
+        logger.info("Parser scheduler shutdown")
+    except Exception as e:
+        logger.error(f"Parser scheduler shutdown failed: {e}", exc_info=True)
 
     try:
-        if automation_scheduler:
-            automation_scheduler.shutdown()
+        if automation_scheduler.running:
+            automation_scheduler.shutdown(wait=False)
             logger.info("Automation scheduler shutdown")
-    except:
-        pass
+    except Exception as e:
+        logger.error(f"Automation scheduler shutdown failed: {e}", exc_info=True)
+
+
+def install_sigterm_handler():
+    """
+    Stop the schedulers as soon as SIGTERM arrives, then hand the signal on
+    to the previous handler (gunicorn's worker exit handler, or the default)
+
+    Signal handlers can only be set from the main thread, so this runs at
+    import: gunicorn imports the app in the worker's main thread, after its
+    own signal handlers are set. Requests run on greenlets or worker threads,
+    where the atexit handler alone would cover shutdown.
+    """
+    if threading.current_thread() is not threading.main_thread():
+        return
 
+    previous = signal.getsignal(signal.SIGTERM)
+
+    def handle_sigterm(signum, frame):
+        shutdown_scheduler()
+        if callable(previous):
+            previous(signum, frame)
+        elif previous == signal.SIG_DFL:
+            signal.signal(signal.SIGTERM, signal.SIG_DFL)
+            os.kill(os.getpid(), signal.SIGTERM)
+
+    signal.signal(signal.SIGTERM, handle_sigterm)
+
+
+install_sigterm_handler()
+
+
+# Initialize once per worker on its first request (Render's health check on /
+# triggers it right after boot). Importing the module stays cheap, and the
+# debug reloader's watcher process never starts its own schedulers.
+_app_initialized = False
+_app_init_lock = threading.Lock()
+
+
+@app.before_request
+def ensure_app_initialized():
+    """Run init_app() before the first request of this process"""
+    if _app_initialized:
+        return
 
-# Initialize on module import (works with both gunicorn and direct run)
-init_app()
+    with _app_init_lock:
+        if not _app_initialized:
+            init_app()  # Sets _app_initialized once the schedulers are up
 
 
 if __name__ == '__main__':
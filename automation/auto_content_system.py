@@ -5,17 +5,79 @@ Coordinates all automation components to provide end-to-end automated
 content generation and posting workflow.
 """
 import asyncio
-from typing import Optional, Dict, List
+import atexit
+import concurrent.futures
+import functools
+import logging
+import logging.handlers
+import os
+import queue
+import sys
+import threading
+import time
+from typing import Optional, Dict, List, Callable
 from datetime import datetime
+from collections import ChainMap
+from types import MappingProxyType
 import json
+import multiprocessing
 import traceback
 
+from sqlalchemy import select
+from sqlalchemy.orm import raiseload
+
 from storage.universal_database import UniversalDatabaseManager
 from storage.universal_models import UniversalPost
 from automation.topic_selector import TopicSelector
 from automation.telegram_poster import TelegramPoster
-from automation.reel_generator import create_reel_generator
+from automation.reel_generator import create_reel_generator, ReelGenerator
 from analyzers.content_generator import ContentGenerator
+from utils.async_loop import run_coroutine
+from utils.cache import TTLCache
+
+# Workflow logs go through a queue: the emitting thread (often the event
+# loop) only enqueues the record, a listener thread writes it to stdout
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO)
+logger.propagate = False
+_log_queue = queue.SimpleQueue()
+logger.addHandler(logging.handlers.QueueHandler(_log_queue))
+_log_stdout_handler = logging.StreamHandler(sys.stdout)
+_log_stdout_handler.setFormatter(logging.Formatter(
+    '%(asctime)s [%(levelname)s] %(message)s',
+    datefmt='%Y-%m-%d %H:%M:%S'
+))
+_log_listener = logging.handlers.QueueListener(_log_queue, _log_stdout_handler)
+_log_listener.start()
+atexit.register(_log_listener.stop)
+
+# AutoContentSystem defaults (read-only; override via the config argument)
+DEFAULT_CONFIG = MappingProxyType({
+    'topic_exclude_days': 30,
+    'topic_prefer_trending': True,
+    'topic_min_posts': 3,
+    'content_format': 'long_post',
+    'content_language': 'ru',
+    'content_tone': 'professional',
+    'reel_aspect_ratio': 'square',
+    'reel_style': 'modern',
+    'enable_reel': True,
+    'reel_processes': 0,
+    'enable_telegram': True,
+    'max_retries': 3
+})
+
+# Dashboards poll get_stats(); its three queries run at most once per window
+STATS_CACHE_TTL = 30
+
+# test_components lookups shared by back-to-back diagnostic calls
+DIAG_CACHE_TTL = 5
+
+# How often a workflow in progress refreshes its run's updated_at. Must stay
+# well below resume_stalled_runs' stalled_minutes, or a slow step (LLM calls
+# held back by the rate limiter, Telegram retry_after) looks like a crash and
+# the run is resumed - and posted - a second time
+WORKFLOW_HEARTBEAT_SECONDS = 60
 
 
 class AutoContentSystem:
@@ -26,11 +88,10 @@ class AutoContentSystem:
     1. Select unique topic (TopicSelector)
     2. Get posts for topic (Database)
     3. Generate content (ContentGenerator)
-    4. Save content to database
-    5. Mark topic as used
-    6. Generate reel image (ReelGenerator)
-    7. Post to Telegram (TelegramPoster)
-    8. Mark content as published
+    4. Generate reel image (ReelGenerator)
+    5. Post to Telegram (TelegramPoster)
+    6. Save content, mark topic as used and content as published
+       (one database transaction)
 
     Features:
     - End-to-end automation
@@ -48,6 +109,7 @@ class AutoContentSystem:
         topic_selector: TopicSelector,
         telegram_poster: Optional[TelegramPoster] = None,
         reel_generator = None,
+        reel_generator_factory: Callable = create_reel_generator,
         config: Optional[Dict] = None
     ):
         """
@@ -59,54 +121,49 @@ class AutoContentSystem:
             topic_selector: Topic selector instance
             telegram_poster: Telegram poster instance (optional)
             reel_generator: Reel generator instance (optional)
-            config: Configuration dictionary with defaults:
-                {
-                    'topic_exclude_days': 30,
-                    'topic_prefer_trending': True,
-                    'topic_min_posts': 3,
-                    'content_format': 'long_post',
-                    'content_language': 'ru',
-                    'content_tone': 'professional',
-                    'reel_aspect_ratio': 'reel',
-                    'reel_style': 'modern',
-                    'enable_reel': True,
-                    'enable_telegram': True,
-                    'max_retries': 3
-                }
+            reel_generator_factory: Creates the reel generator on first use
+                when no instance is given
+            config: Overrides for DEFAULT_CONFIG (not copied; keep it unchanged)
         """
         self.db = db_manager
         self.content_generator = content_generator
         self.topic_selector = topic_selector
         self.telegram_poster = telegram_poster
-        self.reel_generator = reel_generator or create_reel_generator()
-
-        # Default configuration
-        self.config = {
-            'topic_exclude_days': 30,
-            'topic_prefer_trending': True,
-            'topic_min_posts': 3,
-            'content_format': 'long_post',
-            'content_language': 'ru',
-            'content_tone': 'professional',
-            'reel_aspect_ratio': 'square',
-            'reel_style': 'modern',
-            'enable_reel': True,
-            'enable_telegram': True,
-            'max_retries': 3
-        }
+        self._reel_generator = reel_generator
+        self._reel_generator_factory = reel_generator_factory
+
+        # Provided config layered over the shared defaults (no per-instance copy)
+        self.config = ChainMap(config or {}, DEFAULT_CONFIG)
+
+        self._stats_cache = TTLCache(ttl=STATS_CACHE_TTL, maxsize=1)
+        self._diag_cache = TTLCache(ttl=DIAG_CACHE_TTL, maxsize=8)
 
-        # Override with provided config
-        if config:
-            self.config.update(config)
+        logger.info("[AUTO CONTENT SYSTEM] Initialized")
+        logger.info(f"[AUTO CONTENT SYSTEM] Config: {dict(self.config)}")
 
-        print(f"[AUTO CONTENT SYSTEM] Initialized", flush=True)
-        print(f"[AUTO CONTENT SYSTEM] Config: {self.config}", flush=True)
+    @property
+    def reel_generator(self):
+        """Reel generator, created on first use (not at all while reels are disabled)"""
+        if self._reel_generator is None:
+            self._reel_generator = self._reel_generator_factory()
+        return self._reel_generator
 
-    async def generate_and_post(self) -> Dict:
+    async def generate_and_post(self, topic: Optional[Dict] = None,
+                                resume: Optional[Dict] = None) -> Dict:
         """
         Main workflow: Generate content and post to Telegram
 
         This is the primary method that orchestrates the entire workflow.
+        Blocking steps (DB queries, LLM call, reel render) run in worker
+        threads, so several workflows can share one event loop.
+
+        Progress is checkpointed in a WorkflowRun row after every stage;
+        resume_stalled_runs() re-enters interrupted runs at their last stage.
+
+        Args:
+            topic: Topic to write about; selected with TopicSelector if None
+            resume: Stalled run to continue ({'id', 'stage', 'payload'} from
+                UniversalDatabaseManager.claim_stalled_workflow_runs)
 
         Returns:
             Dict with execution result:
@@ -120,10 +177,6 @@ class AutoContentSystem:
                 'timestamp': datetime
             }
         """
-        print("\n" + "="*60, flush=True)
-        print("AUTO CONTENT SYSTEM - Starting Workflow", flush=True)
-        print("="*60, flush=True)
-
         result = {
             'success': False,
             'content_id': None,
@@ -134,107 +187,253 @@ class AutoContentSystem:
             'timestamp': datetime.utcnow()
         }
 
+        if resume:
+            run_id, stage, state = resume['id'], resume['stage'], resume['payload']
+            logger.info(f"AUTO CONTENT SYSTEM - Resuming workflow run {run_id} at stage '{stage}'")
+        else:
+            run_id, stage, state = await self._run_db_call(self.db.create_workflow_run), 'started', {}
+            logger.info("AUTO CONTENT SYSTEM - Starting Workflow")
+
+        heartbeat = asyncio.create_task(self._heartbeat(run_id)) if run_id else None
         try:
             # Step 1: Select unique topic
-            print("\n[STEP 1/7] Selecting unique topic...", flush=True)
-            topic = self._select_topic()
+            logger.info("[STEP 1/6] Selecting unique topic...")
+            topic = state.get('topic') or topic
+            if topic is None:
+                topic = await self._run_db_call(self._select_topic)
             if not topic:
-                result['error'] = "No suitable topic found"
-                print(f"[ERROR] {result['error']}", flush=True)
-                return result
+                return await self._fail_run(run_id, result, "No suitable topic found")
 
             result['topic'] = topic
-            print(f"[OK] Selected topic: {topic['keywords'][:3]}", flush=True)
-
-            # Step 2: Get posts for topic
-            print("\n[STEP 2/7] Fetching posts for topic...", flush=True)
-            posts = self._get_posts_for_topic(topic)
-            if not posts:
-                result['error'] = f"No posts found for topic: {topic['keywords']}"
-                print(f"[ERROR] {result['error']}", flush=True)
-                return result
-
-            print(f"[OK] Found {len(posts)} posts", flush=True)
-
-            # Step 3: Generate content
-            print("\n[STEP 3/7] Generating content...", flush=True)
-            content = self._generate_content(posts)
-            if not content:
-                result['error'] = "Content generation failed"
-                print(f"[ERROR] {result['error']}", flush=True)
-                return result
-
-            print(f"[OK] Content generated: {len(content.get('content', ''))} chars", flush=True)
-
-            # Step 4: Save content to database
-            print("\n[STEP 4/7] Saving content to database...", flush=True)
-            content_id = self._save_content(content, topic)
-            if not content_id:
-                result['error'] = "Failed to save content to database"
-                print(f"[ERROR] {result['error']}", flush=True)
-                return result
+            logger.info(f"[OK] Selected topic: {topic['keywords'][:3]}")
 
-            result['content_id'] = content_id
-            print(f"[OK] Content saved with ID: {content_id}", flush=True)
-
-            # Step 5: Mark topic as used
-            print("\n[STEP 5/7] Marking topic as used...", flush=True)
-            self.topic_selector.mark_topic_used(topic, content_id)
-            print(f"[OK] Topic marked as used", flush=True)
-
-            # Step 6: Generate reel (optional)
-            image_path = None
-            if self.config['enable_reel']:
-                print("\n[STEP 6/7] Generating reel image...", flush=True)
-                try:
-                    image_path = self.reel_generator.generate_from_content(
-                        content,
-                        aspect_ratio=self.config['reel_aspect_ratio'],
-                        style=self.config['reel_style']
-                    )
-                    result['image_path'] = image_path
-                    print(f"[OK] Reel generated: {image_path}", flush=True)
-                except Exception as e:
-                    print(f"[WARNING] Reel generation failed: {e}", flush=True)
-                    print(f"[WARNING] Continuing without image...", flush=True)
+            content = state.get('content')
+            if content:
+                logger.info("[STEP 2-3/6] Content already generated, skipping")
             else:
-                print("\n[STEP 6/7] Reel generation disabled", flush=True)
-
-            # Step 7: Post to Telegram (optional)
-            if self.config['enable_telegram'] and self.telegram_poster:
-                print("\n[STEP 7/7] Posting to Telegram...", flush=True)
+                # Step 2: Get posts for topic
+                logger.info("[STEP 2/6] Fetching posts for topic...")
+                posts = await self._run_db_call(self._get_posts_for_topic, topic)
+                if not posts:
+                    return await self._fail_run(run_id, result, f"No posts found for topic: {topic['keywords']}")
+
+                logger.info(f"[OK] Found {len(posts)} posts")
+
+                # Step 3: Generate content
+                logger.info("[STEP 3/6] Generating content...")
+                content = await asyncio.to_thread(self._generate_content, posts)
+                if not content:
+                    return await self._fail_run(run_id, result, "Content generation failed")
+
+                logger.info(f"[OK] Content generated: {len(content.get('content', ''))} chars")
+                stage = 'content_generated'
+                state.update(topic=topic, content=content)
+                await self._checkpoint(run_id, stage, state)
+
+            # Step 4: Generate reel (optional), off the event loop thread
+            image_path = state.get('image_path')
+            reel_done = stage == 'reel_generated' and (not image_path or os.path.exists(image_path))
+            if stage == 'posted' or reel_done:
+                logger.info("[STEP 4/6] Reel already generated, skipping")
+            elif self.config['enable_reel']:
+                logger.info("[STEP 4/6] Generating reel image...")
+                image_path = None
+                if not (content.get('title') or content.get('content')):
+                    # Nothing to put on the image; don't pay for fonts/canvas
+                    logger.warning("Insufficient content for reel, continuing without image...")
+                else:
+                    try:
+                        image_path = await self._render_reel(content)
+                        logger.info(f"[OK] Reel generated: {image_path}")
+                    except Exception as e:
+                        logger.warning(f"Reel generation failed: {e}")
+                        logger.warning("Continuing without image...")
+                stage = 'reel_generated'
+                state['image_path'] = image_path
+                await self._checkpoint(run_id, stage, state)
+            else:
+                logger.info("[STEP 4/6] Reel generation disabled")
+            result['image_path'] = image_path
+
+            # Step 5: Post to Telegram (optional)
+            if stage == 'posted':
+                logger.info("[STEP 5/6] Already posted, skipping")
+                result['message_id'] = state.get('message_id')
+                telegram_failed = state.get('telegram_failed', False)
+            elif self.config['enable_telegram'] and self.telegram_poster:
+                logger.info("[STEP 5/6] Posting to Telegram...")
                 post_result = await self._post_to_telegram(content, image_path)
 
+                telegram_failed = not post_result['success']
                 if post_result['success']:
                     result['message_id'] = post_result['message_id']
-                    print(f"[OK] Posted to Telegram: Message ID {result['message_id']}", flush=True)
-
-                    # Mark as published
-                    self.db.mark_content_published(content_id, 'telegram')
-                    print(f"[OK] Content marked as published", flush=True)
+                    logger.info(f"[OK] Posted to Telegram: Message ID {result['message_id']}")
                 else:
                     result['error'] = f"Telegram posting failed: {post_result['error']}"
-                    print(f"[WARNING] {result['error']}", flush=True)
+                    logger.warning(result['error'])
                     # Don't fail the whole workflow if posting fails
                     # Content is still saved and can be posted manually
+
+                # Checkpoint right away: a resumed run must never post twice
+                stage = 'posted'
+                state.update(message_id=result['message_id'], telegram_failed=telegram_failed)
+                await self._checkpoint(run_id, stage, state)
             else:
-                print("\n[STEP 7/7] Telegram posting disabled", flush=True)
+                telegram_failed = False
+                logger.info("[STEP 5/6] Telegram posting disabled")
+
+            # Step 6: Save content + topic usage + published flag in one commit.
+            # A topic whose post failed stays available for the next run.
+            logger.info("[STEP 6/6] Saving content to database...")
+            content_id = await self._run_db_call(
+                self.db.save_and_publish,
+                self._build_content_data(content, topic),
+                None if telegram_failed else topic,
+                result['message_id']
+            )
+            if not content_id:
+                return await self._fail_run(run_id, result, "Failed to save content to database")
+
+            result['content_id'] = content_id
+            self._stats_cache.clear()  # New content shows up in stats at once
+            await self._checkpoint(run_id, 'done', {'content_id': content_id})
+            logger.info(f"[OK] Content saved with ID: {content_id}")
+            if not telegram_failed:
+                logger.info("[OK] Topic marked as used")
+            if result['message_id']:
+                logger.info("[OK] Content marked as published")
 
             # Success!
             result['success'] = True
-            print("\n" + "="*60, flush=True)
-            print("WORKFLOW COMPLETED SUCCESSFULLY", flush=True)
-            print("="*60, flush=True)
+            logger.info("WORKFLOW COMPLETED SUCCESSFULLY")
 
             return result
 
         except Exception as e:
+            # The run keeps its last stage, so resume_stalled_runs retries it
             error_msg = f"Unexpected error in workflow: {str(e)}"
             result['error'] = error_msg
-            print(f"\n[ERROR] {error_msg}", flush=True)
-            print(f"[ERROR] Traceback:\n{traceback.format_exc()}", flush=True)
+            logger.error(error_msg)
+            logger.error(f"Traceback:\n{traceback.format_exc()}")
             return result
 
+        finally:
+            if heartbeat:
+                heartbeat.cancel()
+
+    async def _heartbeat(self, run_id: int):
+        """Touch the run every WORKFLOW_HEARTBEAT_SECONDS until cancelled"""
+        while True:
+            await asyncio.sleep(WORKFLOW_HEARTBEAT_SECONDS)
+            await self._run_db_call(self.db.touch_workflow_run, run_id)
+
+    async def _checkpoint(self, run_id: int, stage: str, state: Dict):
+        """Record workflow progress (no-op if the run row couldn't be created)"""
+        if run_id:
+            await self._run_db_call(self.db.update_workflow_run, run_id, stage, state)
+
+    async def _fail_run(self, run_id: int, result: Dict, error: str) -> Dict:
+        """Mark the run failed and return result with error set"""
+        result['error'] = error
+        logger.error(error)
+        await self._checkpoint(run_id, 'failed', {'error': error})
+        return result
+
+    async def resume_stalled_runs(self, stalled_minutes: int = 5) -> List[Dict]:
+        """
+        Resume runs interrupted by a crash or restart
+
+        Runs are claimed (see claim_stalled_workflow_runs) and continued one
+        after another from their last completed stage.
+
+        Returns:
+            List of generate_and_post results
+        """
+        runs = await self._run_db_call(self.db.claim_stalled_workflow_runs, stalled_minutes)
+        results = []
+        for run in runs:
+            results.append(await self.generate_and_post(resume=run))
+        return results
+
+    async def generate_and_post_batch(self, n: int, max_concurrency: int = 4) -> List[Dict]:
+        """
+        Run up to n workflows concurrently, each on a different topic
+
+        Topics are selected up front in one pass, so concurrent runs never
+        pick the same topic before it is marked as used. Telegram sends are
+        still serialized by TelegramPoster.
+
+        Args:
+            n: Number of posts to generate
+            max_concurrency: Max workflows in flight (bounds LLM API load)
+
+        Returns:
+            List of generate_and_post results (one per selected topic)
+        """
+        topics = await self._run_db_call(self._select_topics, n)
+        if not topics:
+            logger.error("No suitable topics found for batch")
+            return []
+
+        logger.info(f"Batch: {len(topics)} topics, up to {max_concurrency} concurrent workflows")
+        semaphore = asyncio.Semaphore(max_concurrency)
+
+        async def run(topic):
+            async with semaphore:
+                return await self.generate_and_post(topic=topic)
+
+        return await asyncio.gather(*(run(topic) for topic in topics))
+
+    async def _render_reel(self, content: Dict) -> str:
+        """
+        Render the reel for content off the event loop
+
+        With config['reel_processes'] > 0 the PIL work runs in a process
+        pool, so concurrent workflows render in parallel instead of taking
+        turns on the GIL; otherwise (or for a mock/custom generator that
+        can't be rebuilt in a child process) it runs on the generator's own
+        worker threads, leaving the default executor to DB/LLM calls.
+
+        Returns:
+            Path to generated image
+        """
+        aspect_ratio = self.config['reel_aspect_ratio']
+        style = self.config['reel_style']
+
+        processes = self.config['reel_processes']
+        if processes > 0 and type(self.reel_generator) is ReelGenerator:
+            generator_args = (
+                self.reel_generator.output_dir,
+                self.reel_generator.use_ai,
+                self.reel_generator.pexels_key,
+            )
+            return await asyncio.get_running_loop().run_in_executor(
+                _get_reel_pool(processes),
+                functools.partial(_render_reel, generator_args, content, aspect_ratio, style)
+            )
+
+        return await asyncio.wrap_future(self.reel_generator.submit_from_content(
+            content,
+            aspect_ratio=aspect_ratio,
+            style=style
+        ))
+
+    async def _run_db_call(self, func, *args):
+        """
+        Run a blocking DB call in a worker thread
+
+        The thread's scoped session is removed afterwards so its connection
+        goes back to the pool instead of staying checked out by the
+        executor thread.
+        """
+        def call():
+            try:
+                return func(*args)
+            finally:
+                self.db.remove_session()
+
+        return await asyncio.to_thread(call)
+
     def _select_topic(self) -> Optional[Dict]:
         """
         Select unique topic using TopicSelector
@@ -249,9 +448,27 @@ class AutoContentSystem:
                 min_posts=self.config['topic_min_posts']
             )
         except Exception as e:
-            print(f"[ERROR] Topic selection failed: {e}", flush=True)
+            logger.error(f"Topic selection failed: {e}")
             return None
 
+    def _select_topics(self, n: int) -> List[Dict]:
+        """
+        Select up to n distinct unused topics using TopicSelector
+
+        Returns:
+            List of topic dictionaries (empty if none available)
+        """
+        try:
+            return self.topic_selector.select_topics(
+                n,
+                exclude_days=self.config['topic_exclude_days'],
+                prefer_trending=self.config['topic_prefer_trending'],
+                min_posts=self.config['topic_min_posts']
+            )
+        except Exception as e:
+            logger.error(f"Topic selection failed: {e}")
+            return []
+
     def _get_posts_for_topic(self, topic: Dict) -> List[UniversalPost]:
         """
         Get posts for selected topic from database
@@ -267,13 +484,17 @@ class AutoContentSystem:
             if not post_ids:
                 return []
 
-            posts = self.db.session.query(UniversalPost).filter(
-                UniversalPost.id.in_(post_ids)
-            ).all()
-
-            return posts
+            # One IN query; ContentGenerator only reads post columns, so
+            # relationships are never loaded (an access would raise instead
+            # of issuing one lazy query per post)
+            stmt = (
+                select(UniversalPost)
+                .where(UniversalPost.id.in_(post_ids))
+                .options(raiseload('*'))
+            )
+            return self.db.session.scalars(stmt).all()
         except Exception as e:
-            print(f"[ERROR] Failed to get posts: {e}", flush=True)
+            logger.error(f"Failed to get posts: {e}")
             return []
 
     def _generate_content(self, posts: List[UniversalPost]) -> Optional[Dict]:
@@ -294,42 +515,39 @@ class AutoContentSystem:
                 language=self.config['content_language']
             )
         except Exception as e:
-            print(f"[ERROR] Content generation failed: {e}", flush=True)
-            import traceback
-            print(traceback.format_exc(), flush=True)
+            logger.error(f"Content generation failed: {e}")
+            logger.error(traceback.format_exc())
             return None
 
-    def _save_content(self, content: Dict, topic: Dict) -> Optional[int]:
+    def _build_content_data(self, content: Dict, topic: Dict) -> Dict:
         """
-        Save generated content to database
+        Prepare generated content for UniversalDatabaseManager.save_and_publish
 
         Args:
             content: Generated content
             topic: Topic that was used
 
         Returns:
-            Content ID or None if save failed
+            content_data dictionary
         """
-        try:
-            # Prepare content data for database
-            content_data = {
-                'format': self.config['content_format'],
-                'language': self.config['content_language'],
-                'tone': self.config['content_tone'],
-                'title': content.get('title', ''),
-                'content': content['content'],
-                'hashtags': content.get('hashtags', []),
-                'key_points': content.get('key_points', []),
-                'word_count': len(str(content['content'])),
-                'source_type': 'topic',
-                'source_description': f"Topic: {', '.join(topic['keywords'][:3])}",
-                'source_posts': topic.get('posts', [])
-            }
-
-            return self.db.save_generated_content(content_data)
-        except Exception as e:
-            print(f"[ERROR] Failed to save content: {e}", flush=True)
-            return None
+        body = content['content']
+        # Threads are lists; only those need str() to get the stored length
+        word_count = len(body) if isinstance(body, str) else len(str(body))
+        source_description = f"Topic: {', '.join(topic['keywords'][:3])}"
+
+        return {
+            'format': self.config['content_format'],
+            'language': self.config['content_language'],
+            'tone': self.config['content_tone'],
+            'title': content.get('title', ''),
+            'content': body,
+            'hashtags': content.get('hashtags', []),
+            'key_points': content.get('key_points', []),
+            'word_count': word_count,
+            'source_type': 'topic',
+            'source_description': source_description,
+            'source_posts': topic.get('posts', [])
+        }
 
     async def _post_to_telegram(self, content: Dict, image_path: Optional[str] = None) -> Dict:
         """
@@ -356,21 +574,33 @@ class AutoContentSystem:
                 media_path=image_path
             )
         except Exception as e:
-            print(f"[ERROR] Telegram posting failed: {e}", flush=True)
+            logger.error(f"Telegram posting failed: {e}")
             return {
                 'success': False,
                 'message_id': None,
                 'error': str(e),
-                'posted_at': datetime.utcnow()
+                'posted_at_ns': time.time_ns()
             }
 
     def get_stats(self) -> Dict:
         """
         Get system statistics
 
+        Cached for STATS_CACHE_TTL seconds; a successful generate_and_post
+        drops the cache.
+
         Returns:
             Dictionary with various statistics
         """
+        stats = self._stats_cache.get('stats')
+        if stats is None:
+            stats = self._compute_stats()
+            if stats:
+                self._stats_cache.set('stats', stats)
+        return stats
+
+    def _compute_stats(self) -> Dict:
+        """Query statistics for get_stats ({} on error)"""
         try:
             topic_stats = self.topic_selector.get_usage_stats(days_back=30)
             generated_content = self.db.get_generated_content(limit=100)
@@ -383,96 +613,139 @@ class AutoContentSystem:
                 'total_published': len(published_content),
                 'publish_rate': len(published_content) / len(generated_content) if generated_content else 0,
                 'last_run': topic_stats['most_recent'],
-                'config': self.config
+                'config': dict(self.config)
             }
         except Exception as e:
-            print(f"[ERROR] Failed to get stats: {e}", flush=True)
+            logger.error(f"Failed to get stats: {e}")
             return {}
 
     async def test_components(self) -> Dict:
         """
         Test all components to verify they're working
 
+        The probes are independent, so they run concurrently (blocking ones
+        in worker threads); total time is that of the slowest probe.
+
         Returns:
             Dictionary with test results for each component
         """
-        print("\n" + "="*60, flush=True)
-        print("TESTING COMPONENTS", flush=True)
-        print("="*60, flush=True)
+        logger.info("TESTING COMPONENTS")
+
+        components = ['topic_selector', 'content_generator', 'reel_generator', 'telegram_poster']
+        outcomes = await asyncio.gather(
+            self._run_db_call(self._test_topic_selector),
+            self._run_db_call(self._test_content_generator),
+            asyncio.to_thread(self._test_reel_generator),
+            self._test_telegram_poster(),
+            return_exceptions=True
+        )
 
         results = {}
+        for component, outcome in zip(components, outcomes):
+            if isinstance(outcome, Exception):
+                outcome = {'success': False, 'message': str(outcome)}
+            results[component] = outcome
 
-        # Test TopicSelector
-        print("\n[TEST] TopicSelector...", flush=True)
-        try:
-            topic = self.topic_selector.select_next_topic(min_posts=2)
-            results['topic_selector'] = {
-                'success': topic is not None,
-                'message': f"Found topic: {topic['keywords'][:3]}" if topic else "No topics available"
-            }
-        except Exception as e:
-            results['topic_selector'] = {'success': False, 'message': str(e)}
+        # Summary
+        logger.info("TEST RESULTS")
+        for component, result in results.items():
+            status = "[OK]" if result['success'] else "[FAIL]"
+            logger.info(f"{status} {component}: {result['message']}")
 
-        # Test ContentGenerator
-        print("\n[TEST] ContentGenerator...", flush=True)
-        try:
-            # Get a few posts to test
-            posts = self.db.get_recent_posts(limit=5)
-            if posts:
-                content = self.content_generator.generate_from_cluster(
-                    cluster_posts=posts[:3],
-                    format_type='long_post',
-                    tone='professional',
-                    language='ru'
-                )
-                results['content_generator'] = {
-                    'success': content is not None,
-                    'message': f"Generated {len(content.get('content', ''))} chars" if content else "Generation failed"
-                }
-            else:
-                results['content_generator'] = {'success': False, 'message': "No posts in database"}
-        except Exception as e:
-            results['content_generator'] = {'success': False, 'message': str(e)}
+        return results
 
-        # Test ReelGenerator
-        print("\n[TEST] ReelGenerator...", flush=True)
-        try:
-            test_image = self.reel_generator.generate_reel(
-                title='Test',
-                key_points=['Point 1', 'Point 2'],
-                aspect_ratio='square',
-                style='modern'
+    def _test_topic_selector(self) -> Dict:
+        logger.info("[TEST] TopicSelector...")
+        topic = self._diag_cache.get_or_set(
+            'topic', lambda: self.topic_selector.select_next_topic(min_posts=2)
+        )
+        return {
+            'success': topic is not None,
+            'message': f"Found topic: {topic['keywords'][:3]}" if topic else "No topics available"
+        }
+
+    def _test_content_generator(self) -> Dict:
+        logger.info("[TEST] ContentGenerator...")
+        # Get a few posts to test
+        posts = self._diag_cache.get_or_set('recent_posts', lambda: self.db.get_recent_posts(limit=5))
+        if not posts:
+            return {'success': False, 'message': "No posts in database"}
+
+        content = self.content_generator.generate_from_cluster(
+            cluster_posts=posts[:3],
+            format_type='long_post',
+            tone='professional',
+            language='ru'
+        )
+        return {
+            'success': content is not None,
+            'message': f"Generated {len(content.get('content', ''))} chars" if content else "Generation failed"
+        }
+
+    def _test_reel_generator(self) -> Dict:
+        logger.info("[TEST] ReelGenerator...")
+        test_image = self.reel_generator.generate_reel(
+            title='Test',
+            key_points=['Point 1', 'Point 2'],
+            aspect_ratio='square',
+            style='modern'
+        )
+        return {
+            'success': test_image is not None,
+            'message': f"Generated: {test_image}"
+        }
+
+    async def _test_telegram_poster(self) -> Dict:
+        if not self.telegram_poster:
+            return {'success': False, 'message': "Not configured"}
+
+        logger.info("[TEST] TelegramPoster...")
+        connected = await self.telegram_poster.test_connection()
+        return {
+            'success': connected,
+            'message': "Connected successfully" if connected else "Connection failed"
+        }
+
+
+# Process pool for reel rendering (see AutoContentSystem._render_reel).
+# 'spawn' children start clean instead of forking a process that runs
+# threads (scheduler, event loop, DB pool).
+_reel_pool = None
+_reel_pool_lock = threading.Lock()
+
+
+def _get_reel_pool(max_workers: int) -> concurrent.futures.ProcessPoolExecutor:
+    """Return the reel process pool, creating it on first use"""
+    global _reel_pool
+
+    with _reel_pool_lock:
+        if _reel_pool is None:
+            _reel_pool = concurrent.futures.ProcessPoolExecutor(
+                max_workers=max_workers,
+                mp_context=multiprocessing.get_context('spawn')
             )
-            results['reel_generator'] = {
-                'success': test_image is not None,
-                'message': f"Generated: {test_image}"
-            }
-        except Exception as e:
-            results['reel_generator'] = {'success': False, 'message': str(e)}
+        return _reel_pool
 
-        # Test TelegramPoster
-        if self.telegram_poster:
-            print("\n[TEST] TelegramPoster...", flush=True)
-            try:
-                connected = await self.telegram_poster.test_connection()
-                results['telegram_poster'] = {
-                    'success': connected,
-                    'message': "Connected successfully" if connected else "Connection failed"
-                }
-            except Exception as e:
-                results['telegram_poster'] = {'success': False, 'message': str(e)}
-        else:
-            results['telegram_poster'] = {'success': False, 'message': "Not configured"}
 
-        # Summary
-        print("\n" + "="*60, flush=True)
-        print("TEST RESULTS", flush=True)
-        print("="*60, flush=True)
-        for component, result in results.items():
-            status = "[OK]" if result['success'] else "[FAIL]"
-            print(f"{status} {component}: {result['message']}", flush=True)
+@functools.lru_cache(maxsize=4)
+def _process_reel_generator(output_dir: str, use_ai: bool, pexels_key: Optional[str]) -> ReelGenerator:
+    """ReelGenerator built once per pool process"""
+    return ReelGenerator(output_dir, use_ai=use_ai, pexels_key=pexels_key)
 
-        return results
+
+def _render_reel(generator_args: tuple, content: Dict, aspect_ratio: str, style: str) -> str:
+    """Process pool entry point: render content with this process's generator"""
+    generator = _process_reel_generator(*generator_args)
+    return generator.generate_from_content(content, aspect_ratio=aspect_ratio, style=style)
+
+
+# How long the synchronous wrappers wait for a workflow (gunicorn's --timeout)
+SYNC_WORKFLOW_TIMEOUT = 600
+
+
+def sync_resume_stalled_runs(auto_system: AutoContentSystem) -> List[Dict]:
+    """Synchronous wrapper for resume_stalled_runs (scheduler jobs)"""
+    return run_coroutine(auto_system.resume_stalled_runs(), SYNC_WORKFLOW_TIMEOUT)
 
 
 # Synchronous wrapper for Flask routes
@@ -480,18 +753,18 @@ def sync_generate_and_post(auto_system: AutoContentSystem) -> Dict:
     """
     Synchronous wrapper for generate_and_post
 
-    Use this in Flask routes or other synchronous contexts.
+    Use this in Flask routes or other synchronous contexts. The workflow runs
+    on the shared background loop (utils.async_loop) instead of a new loop
+    per call, so concurrent callers interleave their Telegram/DB waits, and
+    the Telegram bot's HTTP client stays bound to a loop that is still open.
 
     Args:
         auto_system: AutoContentSystem instance
 
     Returns:
         Result dictionary
+
+    Raises:
+        TimeoutError: The workflow did not finish within SYNC_WORKFLOW_TIMEOUT
     """
-    loop = asyncio.new_event_loop()
-    asyncio.set_event_loop(loop)
-    try:
-        result = loop.run_until_complete(auto_system.generate_and_post())
-        return result
-    finally:
-        loop.close()
+    return run_coroutine(auto_system.generate_and_post(), SYNC_WORKFLOW_TIMEOUT)
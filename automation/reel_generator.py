@@ -7,21 +7,66 @@ TikTok, YouTube Shorts, etc.
 """
 from typing import Optional, Dict, List, Tuple
 from datetime import datetime
-import os
-import textwrap
+import functools
+import hashlib
 import io
+import json
+import os
+import re
+import traceback
+import urllib.parse
+import numpy as np
 import requests
-import time
 import random
+import zlib
+import atexit
+from concurrent.futures import Future, ThreadPoolExecutor
+
+from utils.cache import TTLCache
+from utils.http import get_http_session
+from utils.helpers import list_field
 
 try:
-    from PIL import Image, ImageDraw, ImageFont
+    import PIL
+    from PIL import Image, ImageDraw, ImageFilter, ImageFont
     PIL_AVAILABLE = True
 except ImportError:
     PIL_AVAILABLE = False
     print("[WARNING] Pillow not installed. ReelGenerator will not work.")
     print("[WARNING] Install with: pip install Pillow")
 
+# Pollinations picks one of a few fixed prompts, so the same image URL is
+# requested again and again; keep the downloaded bytes (not PIL images,
+# which must not be shared between threads) for an hour
+AI_IMAGE_CACHE_TTL = 3600
+_ai_image_cache = TTLCache(ttl=AI_IMAGE_CACHE_TTL, maxsize=16)
+
+# On-disk copy of Pollinations images (output_dir/.cache), shared across
+# restarts and pool processes; oldest files are dropped above this size
+AI_IMAGE_DISK_CACHE_BYTES = 50 * 1024 * 1024
+
+# CamelCase splitting for Pexels queries: AIRevolution -> AI Revolution
+_CAMEL_UPPER_RE = re.compile('([A-Z]+)')
+_CAMEL_WORD_RE = re.compile('([A-Z][a-z]+)')
+
+# Concurrent Pollinations downloads per generate_reels_batch call
+AI_FETCH_CONCURRENCY = 4
+
+# Worker threads per generator for submit_reel / submit_from_content
+REEL_WORKERS = 4
+
+# Gaussian blur radius for the optional text drop shadow
+SHADOW_BLUR_RADIUS = 3
+
+# Key points for content that has none and no usable lines
+DEFAULT_KEY_POINTS = ('Полезная информация из анализа новостей', 'Подписывайтесь на канал')
+
+# generate_from_content caches (title, key_points, keywords) by the values of
+# these content fields, so an edited title or key points is worked out afresh
+REEL_CONTENT_FIELDS = ('title', 'content', 'key_points', 'hashtags')
+PREPARED_CONTENT_CACHE_TTL = 600
+_prepared_content_cache = TTLCache(ttl=PREPARED_CONTENT_CACHE_TTL, maxsize=32)
+
 
 class ReelGenerator:
     """
@@ -84,7 +129,29 @@ class ReelGenerator:
         }
     }
 
-    def __init__(self, output_dir: str = 'generated_reels', use_ai: bool = True, pexels_key: Optional[str] = None):
+    # Gradient backgrounds (start, end color); shape (palettes, 2, 3)
+    GRADIENT_PALETTES = np.array([
+        # Tech/AI themes
+        [(99, 102, 241), (139, 92, 246)],      # Indigo to Purple
+        [(59, 130, 246), (147, 51, 234)],      # Blue to Purple
+        [(16, 185, 129), (59, 130, 246)],      # Emerald to Blue
+
+        # Business/Professional
+        [(15, 23, 42), (99, 102, 241)],        # Dark to Indigo
+        [(30, 58, 138), (59, 130, 246)],       # Navy to Blue
+
+        # Creative/Modern
+        [(236, 72, 153), (239, 68, 68)],       # Pink to Red
+        [(251, 146, 60), (239, 68, 68)],       # Orange to Red
+        [(34, 211, 238), (139, 92, 246)],      # Cyan to Purple
+
+        # Elegant
+        [(88, 28, 135), (219, 39, 119)],       # Purple to Pink
+        [(124, 58, 237), (236, 72, 153)],      # Violet to Pink
+    ], dtype=np.uint8)
+
+    def __init__(self, output_dir: str = 'generated_reels', use_ai: bool = True, pexels_key: Optional[str] = None,
+                 http_session: Optional[requests.Session] = None, jpeg_quality: int = 88):
         """
         Initialize ReelGenerator
 
@@ -92,6 +159,9 @@ class ReelGenerator:
             output_dir: Directory to save generated images
             use_ai: Use AI-generated images (FREE via Pollinations.ai) or stock photos
             pexels_key: Pexels API key for stock photo fallback (get free at https://www.pexels.com/api/)
+            http_session: Pooled requests.Session (defaults to shared session)
+            jpeg_quality: JPEG quality of saved reels (88 is visually lossless
+                for social media; raise for archival output)
         """
         if not PIL_AVAILABLE:
             raise ImportError("Pillow is required for ReelGenerator. Install with: pip install Pillow")
@@ -99,12 +169,35 @@ class ReelGenerator:
         self.output_dir = output_dir
         self.use_ai = use_ai
         self.pexels_key = pexels_key
+        self.http = http_session or get_http_session()
+        self.jpeg_quality = jpeg_quality
+        # Filter for fitting AI/stock photos to the reel: they are darkened and
+        # covered with text, so LANCZOS detail is not visible (custom
+        # background keeps LANCZOS; it is resized once and cached)
+        self.resample = Image.Resampling.BILINEAR
         os.makedirs(output_dir, exist_ok=True)
 
+        self.ai_cache_dir = os.path.join(output_dir, '.cache')
+        os.makedirs(self.ai_cache_dir, exist_ok=True)
+        self._trim_ai_cache()
+
+        # Background renders (threads start on first submit)
+        self._executor = ThreadPoolExecutor(max_workers=REEL_WORKERS, thread_name_prefix='reelgen')
+        # Background fetches for generate_reel; separate from _executor so a
+        # render running on a reelgen worker never waits on its own pool
+        self._background_executor = ThreadPoolExecutor(max_workers=REEL_WORKERS, thread_name_prefix='reelbg')
+        atexit.register(self.close)
+
         # Custom font and background paths (ASCII names for Linux compatibility)
         self.custom_font_path = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'fonts', 'CorrectionBrush.otf')
         self.custom_background_path = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'background.png')
 
+        # Resized + darkened custom background per (width, height); copied per reel
+        self._custom_background_cache: Dict[Tuple[int, int], Image.Image] = {}
+
+        # Pillow-SIMD builds report a '.postN' version; shows which build renders reels
+        print(f"[REEL GENERATOR] Pillow {PIL.__version__}", flush=True)
+
         # Check if custom assets exist
         if os.path.exists(self.custom_font_path):
             print(f"[REEL GENERATOR] ✅ Custom font loaded: CorrectionBrush.otf", flush=True)
@@ -134,40 +227,95 @@ class ReelGenerator:
                 print(f"[REEL GENERATOR] ⚠️  Using gradient backgrounds", flush=True)
                 self.image_mode = 'gradient'
 
-    def _generate_ai_image(self, title: str, keywords: List[str]) -> Optional[Image.Image]:
+    def _generate_ai_image(self, title: str, keywords: List[str],
+                           width: int = 1024, height: int = 1024) -> Optional[Image.Image]:
         """
         Generate image using Pollinations.ai (100% FREE, no API key needed!)
 
         Args:
             title: Content title
             keywords: Keywords for prompt
+            width: Requested image width
+            height: Requested image height
 
         Returns:
             PIL Image or None if failed
         """
+        image_bytes = self._fetch_ai_image_bytes(self._ai_image_url(title, keywords, width, height))
+        if image_bytes is None:
+            return None
+
+        try:
+            image = Image.open(io.BytesIO(image_bytes))
+            # JPEG only: let libjpeg downscale in the DCT domain if the image is
+            # at least 2x the reel size (no-op when it came back at reel size)
+            image.draft('RGB', (width, height))
+            # Pollinations sometimes answers with PNG (RGBA/P); drop to RGB now
+            # so the resize and overlay below work on three bands
+            if image.mode != 'RGB':
+                image = image.convert('RGB')
+            print(f"[AI GEN] ✅ Pollinations image ready: {image.size} (FREE!)", flush=True)
+            return image
+        except Exception as e:
+            print(f"[AI GEN] ❌ Failed to decode image: {e}", flush=True)
+            return None
+
+    def _ai_image_url(self, title: str, keywords: List[str], width: int = 1024, height: int = 1024) -> str:
+        """Pollinations.ai image URL for the prompt chosen for title, at width x height"""
         # Create optimized prompt
         prompt = self._create_ai_prompt(title, keywords)
         print(f"[AI GEN] 🎨 Pollinations.ai generating: {prompt[:80]}...", flush=True)
 
-        try:
-            # URL encode the prompt
-            import urllib.parse
-            encoded_prompt = urllib.parse.quote(prompt)
+        # URL encode the prompt
+        encoded_prompt = urllib.parse.quote(prompt)
+
+        # Fixed per-prompt seed: Pollinations serves repeat requests from its own cache
+        seed = zlib.crc32(prompt.encode())
+
+        # Build Pollinations.ai URL (simple and elegant!)
+        return (f"{self.pollinations_base_url}/{encoded_prompt}"
+                f"?width={width}&height={height}&seed={seed}&nologo=true&model=flux")
+
+    def _fetch_ai_image_bytes(self, image_url: str) -> Optional[bytes]:
+        """
+        Download a Pollinations.ai image, reusing earlier downloads of the same URL
+
+        Looks in the in-process cache, then in the on-disk cache, and only
+        then goes to the network.
+
+        Args:
+            image_url: URL from _ai_image_url
 
-            # Build Pollinations.ai URL (simple and elegant!)
-            image_url = f"{self.pollinations_base_url}/{encoded_prompt}?width=1024&height=1024&nologo=true&model=flux"
+        Returns:
+            Encoded image bytes or None if failed
+        """
+        cached = _ai_image_cache.get(image_url)
+        if cached is not None:
+            print(f"[AI GEN] ✅ Reusing cached Pollinations image", flush=True)
+            return cached
 
+        cache_path = os.path.join(self.ai_cache_dir, hashlib.md5(image_url.encode()).hexdigest() + '.img')
+        try:
+            with open(cache_path, 'rb') as f:
+                cached = f.read()
+            _ai_image_cache.set(image_url, cached)
+            print(f"[AI GEN] ✅ Reusing Pollinations image from disk cache", flush=True)
+            return cached
+        except OSError:
+            pass
+
+        try:
             print(f"[AI GEN] 🌐 Requesting: {image_url[:100]}...", flush=True)
 
             # Download image directly (Pollinations returns image immediately)
-            response = requests.get(image_url, timeout=30)
+            response = self.http.get(image_url, timeout=30)
 
             if response.status_code == 200:
                 # Check if we got an image
                 if response.headers.get('content-type', '').startswith('image/'):
-                    image = Image.open(io.BytesIO(response.content))
-                    print(f"[AI GEN] ✅ Pollinations generated: {image.size} (FREE!)", flush=True)
-                    return image
+                    _ai_image_cache.set(image_url, response.content)
+                    self._write_ai_cache(cache_path, response.content)
+                    return response.content
                 else:
                     print(f"[AI GEN] ❌ Response is not an image: {response.headers.get('content-type')}", flush=True)
                     return None
@@ -177,10 +325,37 @@ class ReelGenerator:
 
         except Exception as e:
             print(f"[AI GEN] ❌ Exception: {e}", flush=True)
-            import traceback
             print(f"[AI GEN] Traceback: {traceback.format_exc()[:300]}", flush=True)
             return None
 
+    def _write_ai_cache(self, cache_path: str, image_bytes: bytes):
+        """Store downloaded image bytes in the on-disk cache (best effort)"""
+        tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+        try:
+            with open(tmp_path, 'wb') as f:
+                f.write(image_bytes)
+            os.replace(tmp_path, cache_path)  # Atomic: readers never see a partial file
+        except OSError as e:
+            print(f"[AI GEN] ⚠️  Failed to write image cache: {e}", flush=True)
+
+    def _trim_ai_cache(self):
+        """Delete the oldest cached AI images while the cache exceeds AI_IMAGE_DISK_CACHE_BYTES"""
+        try:
+            entries = []
+            for entry in os.scandir(self.ai_cache_dir):
+                if entry.is_file():
+                    stat = entry.stat()
+                    entries.append((stat.st_mtime, stat.st_size, entry.path))
+
+            total = sum(size for _, size, _ in entries)
+            for _, size, path in sorted(entries):
+                if total <= AI_IMAGE_DISK_CACHE_BYTES:
+                    break
+                os.remove(path)
+                total -= size
+        except OSError as e:
+            print(f"[AI GEN] ⚠️  Failed to trim image cache: {e}", flush=True)
+
     def _create_ai_prompt(self, title: str, keywords: List[str]) -> str:
         """
         Create optimized prompt for AI image generation
@@ -207,21 +382,23 @@ class ReelGenerator:
             "abstract light beams, colorful rays, modern tech background, dynamic energy flow, professional gradient design, clean geometric elements, high quality",
         ]
 
-        # Rotate through prompts based on title hash for variety
-        import hashlib
-        index = int(hashlib.md5(title.encode()).hexdigest(), 16) % len(prompts)
+        # Rotate through prompts based on title hash for variety (crc32: fast, stable across runs)
+        index = zlib.crc32(title.encode()) % len(prompts)
 
         selected_prompt = prompts[index]
         print(f"[AI PROMPT] Using visual-only prompt (NO text generation): {selected_prompt[:60]}...", flush=True)
 
         return selected_prompt
 
-    def _fetch_pexels_photo(self, keywords: List[str]) -> Optional[Image.Image]:
+    def _fetch_pexels_photo(self, keywords: List[str], width: int = 1080,
+                            height: int = 1920) -> Optional[Image.Image]:
         """
         Fetch professional photo from Pexels
 
         Args:
             keywords: Keywords for search
+            width: Target reel width (decode is reduced towards it)
+            height: Target reel height
 
         Returns:
             PIL Image or None if failed
@@ -231,11 +408,10 @@ class ReelGenerator:
             return None
 
         # Process keywords - split CamelCase and take simple words
-        import re
         processed = []
         for kw in keywords[:3]:
             # Split CamelCase: AIRevolution → AI Revolution
-            words = re.sub('([A-Z][a-z]+)', r' \1', re.sub('([A-Z]+)', r' \1', kw)).split()
+            words = _CAMEL_WORD_RE.sub(r' \1', _CAMEL_UPPER_RE.sub(r' \1', kw)).split()
             processed.extend(words)
 
         # Use simple, common words that Pexels understands
@@ -259,7 +435,7 @@ class ReelGenerator:
                 'per_page': 10  # Get 10 photos for randomization
             }
 
-            response = requests.get(
+            response = self.http.get(
                 self.pexels_api_url,
                 headers=headers,
                 params=params,
@@ -279,9 +455,12 @@ class ReelGenerator:
                     photo_url = photo['src']['large2x']
 
                     # Download image
-                    img_response = requests.get(photo_url, timeout=15)
+                    img_response = self.http.get(photo_url, timeout=15)
                     if img_response.status_code == 200:
                         image = Image.open(io.BytesIO(img_response.content))
+                        image.draft('RGB', (width, height))  # Reduced JPEG decode when much larger
+                        if image.mode != 'RGB':
+                            image = image.convert('RGB')
                         print(f"[PEXELS] ✅ Downloaded photo: {image.size}", flush=True)
                         return image
                     else:
@@ -303,6 +482,9 @@ class ReelGenerator:
         """
         Load custom background image from user's file
 
+        The file is decoded, resized and darkened once per size; each call
+        returns a copy that the caller may draw on.
+
         Args:
             width: Target width
             height: Target height
@@ -313,6 +495,10 @@ class ReelGenerator:
         if not os.path.exists(self.custom_background_path):
             return None
 
+        cached = self._custom_background_cache.get((width, height))
+        if cached is not None:
+            return cached.copy()
+
         try:
             print(f"[CUSTOM BG] Loading custom background: {self.custom_background_path}", flush=True)
             img = Image.open(self.custom_background_path)
@@ -321,13 +507,11 @@ class ReelGenerator:
             img = img.resize((width, height), Image.Resampling.LANCZOS)
 
             # Add light overlay for text readability
-            overlay = Image.new('RGBA', (width, height), (0, 0, 0, 100))  # Light overlay
-            img = img.convert('RGBA')
-            img = Image.alpha_composite(img, overlay)
-            img = img.convert('RGB')
+            img = _darken(img, 100)  # Light overlay
+            self._custom_background_cache[(width, height)] = img
 
             print(f"[CUSTOM BG] ✅ Custom background loaded: {img.size}", flush=True)
-            return img
+            return img.copy()
         except Exception as e:
             print(f"[CUSTOM BG] ❌ Failed to load custom background: {e}", flush=True)
             return None
@@ -344,53 +528,18 @@ class ReelGenerator:
         Returns:
             PIL Image with gradient
         """
-        import hashlib
-
-        # Color palettes (modern, vibrant gradients)
-        palettes = [
-            # Tech/AI themes
-            [(99, 102, 241), (139, 92, 246)],      # Indigo to Purple
-            [(59, 130, 246), (147, 51, 234)],      # Blue to Purple
-            [(16, 185, 129), (59, 130, 246)],      # Emerald to Blue
-
-            # Business/Professional
-            [(15, 23, 42), (99, 102, 241)],        # Dark to Indigo
-            [(30, 58, 138), (59, 130, 246)],       # Navy to Blue
-
-            # Creative/Modern
-            [(236, 72, 153), (239, 68, 68)],       # Pink to Red
-            [(251, 146, 60), (239, 68, 68)],       # Orange to Red
-            [(34, 211, 238), (139, 92, 246)],      # Cyan to Purple
-
-            # Elegant
-            [(88, 28, 135), (219, 39, 119)],       # Purple to Pink
-            [(124, 58, 237), (236, 72, 153)],      # Violet to Pink
-        ]
-
         # Select palette based on keywords hash (deterministic)
         keyword_str = ''.join(keywords[:3]) if keywords else 'default'
-        hash_val = int(hashlib.md5(keyword_str.encode()).hexdigest(), 16)
-        palette_idx = hash_val % len(palettes)
-        color1, color2 = palettes[palette_idx]
-
-        print(f"[GRADIENT] Creating gradient: {color1} → {color2}", flush=True)
-
-        # Create gradient image
-        img = Image.new('RGB', (width, height))
-        draw = ImageDraw.Draw(img)
-
-        # Draw gradient
-        for y in range(height):
-            # Calculate blend ratio
-            ratio = y / height
+        palette_idx = zlib.crc32(keyword_str.encode()) % len(self.GRADIENT_PALETTES)
+        color1, color2 = self.GRADIENT_PALETTES[palette_idx]
 
-            # Interpolate colors
-            r = int(color1[0] * (1 - ratio) + color2[0] * ratio)
-            g = int(color1[1] * (1 - ratio) + color2[1] * ratio)
-            b = int(color1[2] * (1 - ratio) + color2[2] * ratio)
+        print(f"[GRADIENT] Creating gradient: {tuple(color1.tolist())} → {tuple(color2.tolist())}", flush=True)
 
-            # Draw line
-            draw.line([(0, y), (width, y)], fill=(r, g, b))
+        # Create gradient image: compute the row colors once as a 1-pixel-wide
+        # column, then stretch it across the width (NEAREST copies exactly)
+        ratio = (np.arange(height, dtype=np.float64) / height)[:, None]
+        rows = (color1 * (1 - ratio) + color2 * ratio).astype(np.uint8)
+        img = Image.fromarray(rows[:, None, :], 'RGB').resize((width, height), Image.Resampling.NEAREST)
 
         print(f"[GRADIENT] ✅ Generated: {width}x{height}", flush=True)
         return img
@@ -416,9 +565,8 @@ class ReelGenerator:
             f"Clean minimal tech graphic about {topic}, professional illustration, vibrant gradient, modern style",
         ]
 
-        # Rotate through prompts based on current time
-        import hashlib
-        index = int(hashlib.md5(title.encode()).hexdigest(), 16) % len(prompts)
+        # Rotate through prompts based on title hash
+        index = zlib.crc32(title.encode()) % len(prompts)
 
         return prompts[index]
 
@@ -451,63 +599,13 @@ class ReelGenerator:
         width, height = self.ASPECT_RATIOS.get(aspect_ratio, self.ASPECT_RATIOS['reel'])
         colors = self.COLOR_SCHEMES.get(style, self.COLOR_SCHEMES['modern'])
 
-        # Generate or fetch background image based on mode
         search_keywords = keywords if keywords else []
-        img = None
-
-        print(f"[REEL] 🔍 Image mode: {self.image_mode}", flush=True)
-
-        # PRIORITY 1: Try custom background FIRST (if exists)
-        if os.path.exists(self.custom_background_path):
-            print(f"[REEL] 🎨 Using custom background (user's image)", flush=True)
-            img = self._load_custom_background(width, height)
-            if img:
-                print(f"[REEL] ✅ Custom background loaded successfully!", flush=True)
-
-        # PRIORITY 2: AI Image Generation (if custom background failed or not available)
-        if img is None and self.image_mode == 'ai_generate':
-            # AI Image Generation (Pollinations.ai - FREE!)
-            print(f"[REEL] 🎨 Starting AI Image Generation (Pollinations.ai - FREE)", flush=True)
-            img = self._generate_ai_image(title, search_keywords)
-
-            if img:
-                print(f"[REEL] ✅ AI generation SUCCESS!", flush=True)
-            else:
-                print(f"[REEL] ❌ AI generation FAILED - falling back to stock photos", flush=True)
 
-            if img:
-                # Resize to target dimensions
-                img = img.resize((width, height), Image.Resampling.LANCZOS)
-                # Add stronger overlay for text readability (darker background = better contrast)
-                overlay = Image.new('RGBA', (width, height), (0, 0, 0, 150))  # Increased from 120 to 150
-                img = img.convert('RGBA')
-                img = Image.alpha_composite(img, overlay)
-                img = img.convert('RGB')
-                print(f"[REEL] ✅ Using AI-generated image with enhanced text overlay", flush=True)
-
-        if img is None and self.image_mode in ['ai_generate', 'stock_photos']:
-            # Stock Photos (Pexels) - fallback or primary
-            print(f"[REEL] 📷 Stock photos mode (or AI fallback)", flush=True)
-            photo = self._fetch_pexels_photo(search_keywords)
-
-            if photo:
-                img = photo.resize((width, height), Image.Resampling.LANCZOS)
-                overlay = Image.new('RGBA', (width, height), (0, 0, 0, 130))  # Increased from 100 to 130
-                img = img.convert('RGBA')
-                img = Image.alpha_composite(img, overlay)
-                img = img.convert('RGB')
-                print(f"[REEL] ✅ Using Pexels stock photo with enhanced text overlay", flush=True)
-
-        if img is None:
-            # Gradient fallback (final fallback or primary if no AI/photos)
-            print(f"[REEL] 🎨 Using gradient background (fallback)", flush=True)
-            img = self._generate_gradient_background(search_keywords, width, height)
-            overlay = Image.new('RGBA', (width, height), (0, 0, 0, 80))
-            img = img.convert('RGBA')
-            img = Image.alpha_composite(img, overlay)
-            img = img.convert('RGB')
-
-        draw = ImageDraw.Draw(img)
+        # The background is the slow part (Pollinations/Pexels round trip);
+        # fetch it on an I/O thread while fonts and text are laid out here
+        background = self._background_executor.submit(
+            self._load_background, title, search_keywords, width, height
+        )
 
         # Adaptive font sizes and margins based on aspect ratio
         if aspect_ratio == 'square':
@@ -537,25 +635,37 @@ class ReelGenerator:
         points_font = self._get_font(points_font_size)
         footer_font = self._get_font(footer_font_size)
 
+        # Wrap all text up front (independent of the background)
+        title_wrapped = self._wrap_text(title, width - 2 * margin, title_font)
+        points_wrapped = [
+            self._wrap_text(point, width - 2 * margin - 80, points_font)
+            for point in key_points[:max_key_points]
+        ]
+        footer_wrapped = self._wrap_text(footer_text, width - 2 * margin, footer_font) if footer_text else []
+
+        img = background.result()
+
+        # Every background ends in _darken, so img is RGB here; pin the
+        # draw mode and antialiased 8-bit glyph masks so text never takes an
+        # RGBA blend path
+        draw = ImageDraw.Draw(img, 'RGB')
+        draw.fontmode = 'L'
+
         # Calculate layout
         y_pos = margin + 30
 
         # Draw title with professional outline and shadow
-        title_wrapped = self._wrap_text(title, width - 2 * margin, title_font, draw)
-        for line in title_wrapped:
-            bbox = draw.textbbox((0, 0), line, font=title_font)
-            text_width = bbox[2] - bbox[0]
-            text_height = bbox[3] - bbox[1]
-            x = (width - text_width) // 2
+        title_line_height = _line_height(title_font)
+        for line, text_width in title_wrapped:
+            x = int(width - text_width) // 2
 
             # Use professional text rendering with outline
             self._draw_text_with_outline(
                 draw, (x, y_pos), line, title_font,
                 fill_color=colors['title'],
-                outline_width=4,  # Thick outline for title
-                shadow=True
+                outline_width=4  # Thick outline for title
             )
-            y_pos += text_height + 20
+            y_pos += title_line_height + 20
 
         # Add accent line
         accent_spacing = 25 if aspect_ratio == 'square' else 40
@@ -570,7 +680,8 @@ class ReelGenerator:
 
         # Draw key points
         bullet_radius = 10 if aspect_ratio == 'square' else 12
-        for i, point in enumerate(key_points[:max_key_points], 1):
+        points_line_height = _line_height(points_font)
+        for i, point_wrapped in enumerate(points_wrapped, 1):
             # Draw bullet point
             bullet_x = margin + 30
             bullet_y = y_pos + 30
@@ -584,24 +695,15 @@ class ReelGenerator:
             )
 
             # Draw point text with outline for readability
-            point_wrapped = self._wrap_text(
-                point,
-                width - 2 * margin - 80,
-                points_font,
-                draw
-            )
-
             point_x = bullet_x + bullet_radius + 25
-            for line in point_wrapped:
+            for line, _ in point_wrapped:
                 # Use professional text rendering with outline
                 self._draw_text_with_outline(
                     draw, (point_x, y_pos), line, points_font,
                     fill_color=colors['text'],
-                    outline_width=2,  # Thinner outline for body text
-                    shadow=True
+                    outline_width=2  # Thinner outline for body text
                 )
-                bbox = draw.textbbox((0, 0), line, font=points_font)
-                y_pos += bbox[3] - bbox[1] + 8
+                y_pos += points_line_height + 8
 
             # Space between points - less for square
             y_pos += 20 if aspect_ratio == 'square' else 30
@@ -609,30 +711,90 @@ class ReelGenerator:
         # Draw footer if provided
         if footer_text:
             y_footer = height - margin - 60
-            footer_wrapped = self._wrap_text(footer_text, width - 2 * margin, footer_font, draw)
-            for line in footer_wrapped:
-                bbox = draw.textbbox((0, 0), line, font=footer_font)
-                text_width = bbox[2] - bbox[0]
-                x = (width - text_width) // 2
+            footer_line_height = _line_height(footer_font)
+            for line, text_width in footer_wrapped:
+                x = int(width - text_width) // 2
                 # Use professional text rendering with outline
                 self._draw_text_with_outline(
                     draw, (x, y_footer), line, footer_font,
                     fill_color=colors['accent'],
-                    outline_width=2,
-                    shadow=True
+                    outline_width=2
                 )
-                y_footer += bbox[3] - bbox[1] + 10
+                y_footer += footer_line_height + 10
 
         # Save image
-        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S_%f')  # Unique within a batch
         filename = f"reel_{aspect_ratio}_{style}_{timestamp}.jpg"
         filepath = os.path.join(self.output_dir, filename)
 
-        img.save(filepath, 'JPEG', quality=95)
+        # 4:2:0 chroma, no extra Huffman pass: smaller file, cheaper encode
+        img.save(filepath, 'JPEG', quality=self.jpeg_quality, subsampling=2, optimize=False, progressive=False)
         print(f"[REEL GENERATOR] Saved reel to: {filepath}", flush=True)
 
         return filepath
 
+    def _load_background(self, title: str, search_keywords: List[str], width: int, height: int) -> 'Image.Image':
+        """
+        Pick the reel background: custom image, AI image, stock photo, then gradient
+
+        Args:
+            title: Reel title (AI prompt and seed)
+            search_keywords: Keywords for the AI prompt / Pexels query
+            width: Target width
+            height: Target height
+
+        Returns:
+            Darkened RGB background at (width, height)
+        """
+        print(f"[REEL] 🔍 Image mode: {self.image_mode}", flush=True)
+
+        img = None
+
+        # PRIORITY 1: Try custom background FIRST (if exists)
+        if os.path.exists(self.custom_background_path):
+            print(f"[REEL] 🎨 Using custom background (user's image)", flush=True)
+            img = self._load_custom_background(width, height)
+            if img:
+                print(f"[REEL] ✅ Custom background loaded successfully!", flush=True)
+
+        # PRIORITY 2: AI Image Generation (if custom background failed or not available)
+        if img is None and self.image_mode == 'ai_generate':
+            # AI Image Generation (Pollinations.ai - FREE!)
+            print(f"[REEL] 🎨 Starting AI Image Generation (Pollinations.ai - FREE)", flush=True)
+            # Requested at reel size so no resample is needed
+            img = self._generate_ai_image(title, search_keywords, width, height)
+
+            if img:
+                print(f"[REEL] ✅ AI generation SUCCESS!", flush=True)
+            else:
+                print(f"[REEL] ❌ AI generation FAILED - falling back to stock photos", flush=True)
+
+            if img:
+                # Resize only if the service did not honour the requested size
+                if img.size != (width, height):
+                    img = img.resize((width, height), self.resample)
+                # Add stronger overlay for text readability (darker background = better contrast)
+                img = _darken(img, 150)  # Increased from 120 to 150
+                print(f"[REEL] ✅ Using AI-generated image with enhanced text overlay", flush=True)
+
+        if img is None and self.image_mode in ['ai_generate', 'stock_photos']:
+            # Stock Photos (Pexels) - fallback or primary
+            print(f"[REEL] 📷 Stock photos mode (or AI fallback)", flush=True)
+            photo = self._fetch_pexels_photo(search_keywords, width, height)
+
+            if photo:
+                img = photo.resize((width, height), self.resample)
+                img = _darken(img, 130)  # Increased from 100 to 130
+                print(f"[REEL] ✅ Using Pexels stock photo with enhanced text overlay", flush=True)
+
+        if img is None:
+            # Gradient fallback (final fallback or primary if no AI/photos)
+            print(f"[REEL] 🎨 Using gradient background (fallback)", flush=True)
+            img = self._generate_gradient_background(search_keywords, width, height)
+            img = _darken(img, 80)
+
+        return img
+
     def _get_font(self, size: int):
         """
         Get font with proper fallback chain for Linux/Windows compatibility
@@ -643,50 +805,19 @@ class ReelGenerator:
         3. Windows fonts
         4. Default font
 
+        Fonts are loaded once per size and process (see _load_font).
+
         Args:
             size: Font size in points
 
         Returns:
             ImageFont object
         """
-        # PRIORITY 1: Try custom font first
-        if os.path.exists(self.custom_font_path):
-            try:
-                font = ImageFont.truetype(self.custom_font_path, size)
-                return font
-            except Exception as e:
-                print(f"[REEL] Failed to load custom font: {e}", flush=True)
-
-        # PRIORITY 2: Try Linux system fonts (common on Render, Heroku, etc.)
-        linux_fonts = [
-            "/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf",
-            "/usr/share/fonts/truetype/liberation/LiberationSans-Bold.ttf",
-            "/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf",
-            "/usr/share/fonts/truetype/liberation/LiberationSans-Regular.ttf",
-        ]
-
-        for font_path in linux_fonts:
-            if os.path.exists(font_path):
-                try:
-                    return ImageFont.truetype(font_path, size)
-                except Exception as e:
-                    print(f"[REEL] Failed to load {font_path}: {e}", flush=True)
-                    continue
-
-        # PRIORITY 3: Try Windows fonts
-        try:
-            return ImageFont.truetype("arial.ttf", size)
-        except:
-            pass
-
-        # Last resort: default font (will look bad but at least won't crash)
-        print(f"[WARNING] No system fonts found! Using default font (will look bad)", flush=True)
-        print(f"[WARNING] Install fonts: apt-get install fonts-dejavu-core", flush=True)
-        return ImageFont.load_default()
+        return _load_font(self.custom_font_path, size)
 
     def _draw_text_with_outline(self, draw, position: Tuple[int, int], text: str, font,
                                 fill_color: Tuple[int, int, int], outline_width: int = 3,
-                                shadow: bool = True) -> None:
+                                shadow: bool = False) -> None:
         """
         Draw text with outline and shadow for maximum readability on any background
 
@@ -697,61 +828,45 @@ class ReelGenerator:
             font: Font to use
             fill_color: RGB color for text
             outline_width: Width of outline in pixels (default: 3)
-            shadow: Whether to add drop shadow (default: True)
+            shadow: Whether to add a soft drop shadow (default: False)
         """
         x, y = position
 
-        # Draw shadow first (if enabled)
+        # Draw shadow first (if enabled): the stroked text is drawn once into
+        # an 'L' mask cropped to its bbox, blurred, and blended in as black
         if shadow:
             shadow_offset = outline_width + 2
-            draw.text((x + shadow_offset, y + shadow_offset), text, fill=(0, 0, 0, 180), font=font)
-
-        # Draw outline by drawing text multiple times in a circle around the position
-        # This creates a thick, smooth outline
-        for offset_x in range(-outline_width, outline_width + 1):
-            for offset_y in range(-outline_width, outline_width + 1):
-                if offset_x != 0 or offset_y != 0:  # Skip center (that's the main text)
-                    draw.text((x + offset_x, y + offset_y), text, fill=(0, 0, 0, 200), font=font)
-
-        # Draw main text on top
-        draw.text((x, y), text, fill=fill_color, font=font)
-
-    def _wrap_text(self, text: str, max_width: int, font, draw) -> List[str]:
+            pad = SHADOW_BLUR_RADIUS * 3
+            left, top, right, bottom = draw.textbbox((x, y), text, font=font, stroke_width=outline_width)
+            mask = Image.new('L', (right - left + 2 * pad, bottom - top + 2 * pad), 0)
+            ImageDraw.Draw(mask).text((x - left + pad, y - top + pad), text, fill=180, font=font,
+                                      stroke_width=outline_width, stroke_fill=180)
+            mask = mask.filter(ImageFilter.GaussianBlur(SHADOW_BLUR_RADIUS))
+            draw.bitmap((left - pad + shadow_offset, top - pad + shadow_offset), mask, fill=(0, 0, 0))
+
+        # Outline and main text in one call: FreeType strokes the glyphs once
+        # instead of re-rendering the text at every offset around the position
+        draw.text((x, y), text, fill=fill_color, font=font,
+                  stroke_width=outline_width, stroke_fill=(0, 0, 0))
+
+    def _wrap_text(self, text: str, max_width: int, font) -> List[Tuple[str, float]]:
         """
         Wrap text to fit within max_width
 
+        Each word is measured once (font.getlength) and line widths are
+        summed, instead of re-measuring the whole candidate line per word.
+        The summed width is returned with each line so callers can centre
+        it without measuring again. Results are cached (see _wrap_lines).
+
         Args:
             text: Text to wrap
             max_width: Maximum width in pixels
             font: Font to use
-            draw: ImageDraw object
 
         Returns:
-            List of wrapped lines
+            List of (line, line width in pixels)
         """
-        words = text.split()
-        lines = []
-        current_line = []
-
-        for word in words:
-            test_line = ' '.join(current_line + [word])
-            bbox = draw.textbbox((0, 0), test_line, font=font)
-            width = bbox[2] - bbox[0]
-
-            if width <= max_width:
-                current_line.append(word)
-            else:
-                if current_line:
-                    lines.append(' '.join(current_line))
-                    current_line = [word]
-                else:
-                    # Single word too long - force it
-                    lines.append(word)
-
-        if current_line:
-            lines.append(' '.join(current_line))
-
-        return lines if lines else [text]
+        return list(_wrap_lines(text, max_width, font))
 
     def generate_from_content(
         self,
@@ -770,6 +885,38 @@ class ReelGenerator:
         Returns:
             Path to generated image
         """
+        title, key_points, keywords = self._prepare_content(content)
+
+        # Generate
+        return self.generate_reel(
+            title=title,
+            key_points=key_points,
+            keywords=keywords,  # Pass hashtags as keywords for AI prompt
+            aspect_ratio=aspect_ratio,
+            style=style,
+            footer_text=None  # No watermark
+        )
+
+    def _prepare_content(self, content: Dict) -> Tuple[str, List[str], List[str]]:
+        """
+        Title, key points and AI keywords for a content dictionary
+
+        Cached by the content's REEL_CONTENT_FIELDS values (content itself is
+        left untouched), so rendering the same content in several styles /
+        aspect ratios does not repeat the parsing and key point extraction.
+
+        Args:
+            content: Content dictionary from ContentGenerator
+
+        Returns:
+            (title, key_points, keywords)
+        """
+        key = json.dumps([content.get(field) for field in REEL_CONTENT_FIELDS],
+                         ensure_ascii=False, sort_keys=True, default=str)
+        return _prepared_content_cache.get_or_set(key, lambda: self._extract_content_fields(content))
+
+    def _extract_content_fields(self, content: Dict) -> Tuple[str, List[str], List[str]]:
+        """Uncached _prepare_content"""
         # Extract title
         title = content.get('title', 'Untitled')
         if not title or title == 'Untitled':
@@ -780,13 +927,7 @@ class ReelGenerator:
             title = content_text[:50] + '...' if len(content_text) > 50 else content_text
 
         # Extract key points
-        key_points = content.get('key_points', [])
-        if isinstance(key_points, str):
-            import json
-            try:
-                key_points = json.loads(key_points)
-            except:
-                key_points = [key_points]
+        key_points = list_field(content, 'key_points', fallback=lambda text: [text])
 
         # If no key points, extract from content
         if not key_points:
@@ -799,29 +940,73 @@ class ReelGenerator:
             key_points = [l for l in lines if len(l) > 10 and len(l) < 200][:5]
 
         if not key_points:
-            key_points = ['Полезная информация из анализа новостей', 'Подписывайтесь на канал']
+            key_points = list(DEFAULT_KEY_POINTS)
 
         # Extract hashtags for AI prompt (short keywords work better than long key_points)
-        hashtags = content.get('hashtags', [])
-        if isinstance(hashtags, str):
-            import json
-            try:
-                hashtags = json.loads(hashtags)
-            except:
-                hashtags = hashtags.split()
+        hashtags = list_field(content, 'hashtags')
 
         # Clean hashtags - remove # symbol for AI prompt
         keywords = [tag.lstrip('#') for tag in hashtags] if hashtags else []
 
-        # Generate
-        return self.generate_reel(
-            title=title,
-            key_points=key_points,
-            keywords=keywords,  # Pass hashtags as keywords for AI prompt
-            aspect_ratio=aspect_ratio,
-            style=style,
-            footer_text=None  # No watermark
-        )
+        return title, key_points, keywords
+
+    def generate_reels_batch(self, items: List[Dict]) -> List[Optional[str]]:
+        """
+        Generate several reels, downloading each distinct AI image only once
+
+        Pollinations has no batch endpoint, so the distinct image URLs are
+        fetched up front and concurrently (reels with the same prompt share
+        one download) and the reels are then composed one by one.
+
+        Args:
+            items: generate_reel keyword arguments, one dict per reel
+
+        Returns:
+            Path to each generated image, None where generation failed
+        """
+        if items and self.image_mode == 'ai_generate' and not os.path.exists(self.custom_background_path):
+            image_urls = {
+                self._ai_image_url(
+                    item['title'], item.get('keywords') or [],
+                    *self.ASPECT_RATIOS.get(item.get('aspect_ratio', 'reel'), self.ASPECT_RATIOS['reel'])
+                )
+                for item in items
+            }
+            # Network-bound: overlap the downloads on the pooled session
+            with ThreadPoolExecutor(max_workers=min(AI_FETCH_CONCURRENCY, len(image_urls))) as pool:
+                list(pool.map(self._fetch_ai_image_bytes, image_urls))
+
+        paths = []
+        for item in items:
+            try:
+                paths.append(self.generate_reel(**item))
+            except Exception as e:
+                print(f"[REEL GENERATOR] ❌ Failed to generate reel: {e}", flush=True)
+                paths.append(None)
+        return paths
+
+    def submit_reel(self, **kwargs) -> Future:
+        """
+        Generate a reel in the background (see generate_reel)
+
+        Returns:
+            Future resolving to the path of the generated image
+        """
+        return self._executor.submit(self.generate_reel, **kwargs)
+
+    def submit_from_content(self, content: Dict, **kwargs) -> Future:
+        """
+        Generate a reel from content in the background (see generate_from_content)
+
+        Returns:
+            Future resolving to the path of the generated image
+        """
+        return self._executor.submit(self.generate_from_content, content, **kwargs)
+
+    def close(self):
+        """Wait for submitted reels and stop the worker threads"""
+        self._executor.shutdown(wait=True)
+        self._background_executor.shutdown(wait=True)
 
     def get_available_styles(self) -> List[str]:
         """Get list of available color schemes"""
@@ -832,6 +1017,137 @@ class ReelGenerator:
         return list(self.ASPECT_RATIOS.keys())
 
 
+@functools.lru_cache(maxsize=32)
+def _load_font(custom_font_path: str, size: int):
+    """
+    Load the first usable font for size (see ReelGenerator._get_font)
+
+    Cached so the font paths are probed and the font file is parsed once
+    per size instead of on every reel.
+    """
+    # PRIORITY 1: Try custom font first
+    if os.path.exists(custom_font_path):
+        try:
+            font = ImageFont.truetype(custom_font_path, size)
+            return font
+        except Exception as e:
+            print(f"[REEL] Failed to load custom font: {e}", flush=True)
+
+    # PRIORITY 2: Try Linux system fonts (common on Render, Heroku, etc.)
+    linux_fonts = [
+        "/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf",
+        "/usr/share/fonts/truetype/liberation/LiberationSans-Bold.ttf",
+        "/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf",
+        "/usr/share/fonts/truetype/liberation/LiberationSans-Regular.ttf",
+    ]
+
+    for font_path in linux_fonts:
+        if os.path.exists(font_path):
+            try:
+                return ImageFont.truetype(font_path, size)
+            except Exception as e:
+                print(f"[REEL] Failed to load {font_path}: {e}", flush=True)
+                continue
+
+    # PRIORITY 3: Try Windows fonts
+    try:
+        return ImageFont.truetype("arial.ttf", size)
+    except:
+        pass
+
+    # Last resort: default font (will look bad but at least won't crash)
+    print(f"[WARNING] No system fonts found! Using default font (will look bad)", flush=True)
+    print(f"[WARNING] Install fonts: apt-get install fonts-dejavu-core", flush=True)
+    return ImageFont.load_default()
+
+
+@functools.lru_cache(maxsize=256)
+def _wrap_lines(text: str, max_width: int, font) -> Tuple[Tuple[str, float], ...]:
+    """
+    Wrapped (line, width) pairs for ReelGenerator._wrap_text
+
+    Cached per (text, max_width, font): fonts come from _load_font, so the
+    same size is the same object for the life of the process, and repeated
+    titles, fallback key points and footers skip measuring entirely.
+    """
+    words = text.split()
+    space_width = _word_width(font, ' ')
+    lines = []
+    current_line = []
+    current_width = 0
+
+    for word in words:
+        word_width = _word_width(font, word)
+        width = current_width + space_width + word_width if current_line else word_width
+
+        if width <= max_width:
+            current_line.append(word)
+            current_width = width
+        else:
+            if current_line:
+                lines.append((' '.join(current_line), current_width))
+                current_line = [word]
+                current_width = word_width
+            else:
+                # Single word too long - force it
+                lines.append((word, word_width))
+
+    if current_line:
+        lines.append((' '.join(current_line), current_width))
+
+    return tuple(lines) if lines else ((text, font.getlength(text)),)
+
+
+@functools.lru_cache(maxsize=8192)
+def _word_width(font, word: str) -> float:
+    """
+    Advance width of word in font, for _wrap_lines
+
+    Headlines and key points reuse the same vocabulary, so words are
+    measured once per font even when the text around them is new.
+    """
+    return font.getlength(word)
+
+
+def _darken(img: 'Image.Image', alpha: int) -> 'Image.Image':
+    """
+    Darken img as if a black overlay with the given alpha were composited on it
+
+    One lookup-table pass over the RGB data instead of converting to RGBA,
+    compositing a full-size overlay image and converting back.
+
+    Args:
+        img: Background image
+        alpha: Overlay opacity, 0-255
+
+    Returns:
+        Darkened RGB image
+    """
+    if img.mode != 'RGB':
+        img = img.convert('RGB')
+    return img.point(_darken_table(alpha))
+
+
+@functools.lru_cache(maxsize=8)
+def _darken_table(alpha: int) -> List[int]:
+    """Lookup table for _darken (one 256-entry ramp per band)"""
+    keep = 255 - alpha
+    return [(value * keep + 127) // 255 for value in range(256)] * 3
+
+
+@functools.lru_cache(maxsize=32)
+def _line_height(font) -> int:
+    """
+    Height of one line of text in font, measured once per font
+
+    Uses the ink box of capitals plus a descender rather than
+    font.getmetrics(): ascent + descent is about 1.5x taller and would
+    spread the reel layout.
+    """
+    bbox = font.getbbox('Hg')
+    return bbox[3] - bbox[1]
+
+
 # Mock version for when Pillow is not available
 class MockReelGenerator:
     """
@@ -853,6 +1169,23 @@ class MockReelGenerator:
         print(f"[MOCK] Would generate reel from content", flush=True)
         return "mock_reel.jpg"
 
+    def generate_reels_batch(self, items: List[Dict]) -> List[Optional[str]]:
+        print(f"[MOCK] Would generate {len(items)} reels", flush=True)
+        return ["mock_reel.jpg" for _ in items]
+
+    def submit_reel(self, **kwargs) -> Future:
+        future = Future()
+        future.set_result(self.generate_reel(**kwargs))
+        return future
+
+    def submit_from_content(self, content: Dict, **kwargs) -> Future:
+        future = Future()
+        future.set_result(self.generate_from_content(content, **kwargs))
+        return future
+
+    def close(self):
+        pass
+
     def get_available_styles(self) -> List[str]:
         return ['modern', 'professional', 'vibrant', 'minimal', 'dark']
 
@@ -861,7 +1194,8 @@ class MockReelGenerator:
 
 
 # Factory function to get appropriate generator
-def create_reel_generator(output_dir: str = 'generated_reels', use_ai: bool = True, pexels_key: Optional[str] = None):
+def create_reel_generator(output_dir: str = 'generated_reels', use_ai: bool = True, pexels_key: Optional[str] = None,
+                          http_session: Optional[requests.Session] = None):
     """
     Create ReelGenerator or MockReelGenerator depending on Pillow availability
 
@@ -869,11 +1203,12 @@ def create_reel_generator(output_dir: str = 'generated_reels', use_ai: bool = Tr
         output_dir: Directory for generated images
         use_ai: Use AI-generated images (FREE via Pollinations.ai) or stock photos
         pexels_key: Pexels API key for stock photo fallback (get free at https://www.pexels.com/api/)
+        http_session: Pooled requests.Session (defaults to shared session)
 
     Returns:
         ReelGenerator or MockReelGenerator instance
     """
     if PIL_AVAILABLE:
-        return ReelGenerator(output_dir, use_ai=use_ai, pexels_key=pexels_key)
+        return ReelGenerator(output_dir, use_ai=use_ai, pexels_key=pexels_key, http_session=http_session)
     else:
         return MockReelGenerator(output_dir)
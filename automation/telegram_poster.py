@@ -5,9 +5,11 @@ Posts generated content to Telegram channels with proper formatting,
 error handling, and retry logic.
 """
 import asyncio
+import functools
+import html
+import re
 from typing import Optional, Dict, List
-from datetime import datetime
-import json
+from datetime import datetime, timezone
 from telegram import Bot
 from telegram.error import TelegramError, NetworkError, RetryAfter
 from telegram.constants import ParseMode
@@ -15,6 +17,21 @@ from telegram.request import HTTPXRequest
 import time
 import httpx
 
+from utils.async_loop import get_loop, run_coroutine
+from utils.helpers import list_field
+
+
+# Markdown **bold** spans in generated text
+_BOLD_RE = re.compile(r'\*\*(.+?)\*\*', re.DOTALL)
+
+# Line breaks and sentence ends, for splitting paragraphs longer than one
+# message; the capture group keeps the separator so it can be put back
+_LINE_OR_SENTENCE_RE = re.compile(r'(\n+|(?<=[.!?])[ \t]+)')
+
+# Telegram length limits (characters)
+CAPTION_LIMIT = 1024
+MESSAGE_LIMIT = 4096
+
 
 class TelegramPoster:
     """
@@ -57,6 +74,11 @@ class TelegramPoster:
         self.channel_id = channel_id
         self.max_retries = max_retries
 
+        # Sends from concurrent posts go out one at a time; after a 429 the
+        # next send (from any caller) waits until Telegram's retry_after ends
+        self._send_lock = asyncio.Lock()
+        self._next_send_at = 0.0
+
         print(f"[TELEGRAM POSTER] Initialized with channel: {channel_id}", flush=True)
 
     async def post_content(self, content: Dict, media_path: Optional[str] = None) -> Dict:
@@ -79,7 +101,7 @@ class TelegramPoster:
                     'success': bool,
                     'message_id': int or None,
                     'error': str or None,
-                    'posted_at': datetime
+                    'posted_at_ns': int (epoch nanoseconds, see posted_at())
                 }
         """
         print(f"[TELEGRAM POSTER] Starting post: format={content.get('format_type', 'unknown')}", flush=True)
@@ -99,9 +121,34 @@ class TelegramPoster:
                 'success': False,
                 'message_id': None,
                 'error': str(e),
-                'posted_at': datetime.utcnow()
+                'posted_at_ns': time.time_ns()
             }
 
+    async def _send(self, method, **kwargs):
+        """
+        Call a Bot send method through the shared rate-limit gate
+
+        Args:
+            method: Bound Bot method (send_message, send_photo)
+            **kwargs: Arguments for the method
+
+        Returns:
+            Sent Message
+
+        Raises:
+            RetryAfter: Telegram rate limit hit (later sends are held back)
+        """
+        async with self._send_lock:
+            delay = self._next_send_at - time.monotonic()
+            if delay > 0:
+                await asyncio.sleep(delay)
+
+            try:
+                return await method(**kwargs)
+            except RetryAfter as e:
+                self._next_send_at = time.monotonic() + e.retry_after + 1
+                raise
+
     async def _post_single_message(self, content: Dict, media_path: Optional[str] = None) -> Dict:
         """
         Post a single message to Telegram
@@ -113,88 +160,88 @@ class TelegramPoster:
         Returns:
             Result dictionary
         """
-        # Build message text WITHOUT hashtags first
-        message_text = self._format_message(content, include_hashtags=False)
-
-        # Format hashtags separately
-        hashtags_text = self._format_hashtags(content)
-
-        # Telegram limits:
-        # - Photo caption: 1024 characters MAX
-        # - Text message: 4096 characters MAX
-
-        # Reserve space for hashtags
-        max_content_length = 1024 if media_path else 4096
-        hashtags_length = len(hashtags_text) + 2  # +2 for \n\n separator
-
-        if media_path and len(message_text) + hashtags_length > 1024:
-            # Truncate content to fit with hashtags
-            available_space = 1024 - hashtags_length - 10  # Reserve 10 chars for safety
-            print(f"[TELEGRAM POSTER] Caption too long ({len(message_text)} chars), truncating to fit hashtags...", flush=True)
-
-            truncated = message_text[:available_space]
-            # Find last sentence ending
-            last_period = max(truncated.rfind('.'), truncated.rfind('!'), truncated.rfind('?'))
-            if last_period > available_space - 100:
-                message_text = truncated[:last_period+1]
-            else:
-                message_text = truncated[:available_space-3] + "..."
-
-        elif len(message_text) + hashtags_length > 4096:
-            # Truncate content to fit with hashtags
-            available_space = 4096 - hashtags_length - 10
-            print(f"[TELEGRAM POSTER] Message too long ({len(message_text)} chars), truncating to fit hashtags...", flush=True)
-
-            truncated = message_text[:available_space]
-            last_newline = truncated.rfind('\n\n')
-            last_period = max(truncated.rfind('.'), truncated.rfind('!'), truncated.rfind('?'))
+        # Hashtags close the post, so a split post carries them in its last part.
+        # The text is split before HTML conversion so no part ends inside a tag
+        # or an entity
+        message_text = self._format_markdown(content)
+
+        # Telegram limits: photo caption 1024 characters, text message 4096.
+        # Longer posts go out as several messages instead of being cut short
+        first_limit = CAPTION_LIMIT if media_path else MESSAGE_LIMIT
+        parts = _split_message(message_text, MESSAGE_LIMIT, first_limit) or [message_text]
+        parts = [_to_html(part) for part in parts]
+        if len(parts) > 1:
+            print(f"[TELEGRAM POSTER] Message too long ({len(message_text)} chars), posting in {len(parts)} parts", flush=True)
+
+        # Read the photo once; retries resend the same bytes
+        photo = _read_media(media_path) if media_path else None
 
-            if last_newline > available_space - 200:
-                message_text = truncated[:last_newline]
-            elif last_period > available_space - 200:
-                message_text = truncated[:last_period+1]
-            else:
-                message_text = truncated[:available_space-3] + "..."
-
-        # Add hashtags at the end (AFTER truncation)
-        if hashtags_text:
-            message_text = message_text + "\n\n" + hashtags_text
-            print(f"[TELEGRAM POSTER] ✅ Final message length: {len(message_text)} chars (with hashtags)", flush=True)
+        message_ids = []
+        errors = []
 
-        # Post with retries
-        for attempt in range(self.max_retries):
+        for i, part in enumerate(parts):
             try:
-                if media_path:
+                if i == 0 and photo is not None:
                     # Post with photo
-                    with open(media_path, 'rb') as photo:
-                        message = await self.bot.send_photo(
-                            chat_id=self.channel_id,
-                            photo=photo,
-                            caption=message_text,
-                            parse_mode=ParseMode.HTML
-                        )
+                    message = await self._send_with_retries(
+                        self.bot.send_photo,
+                        chat_id=self.channel_id,
+                        photo=photo,
+                        caption=part,
+                        parse_mode=ParseMode.HTML
+                    )
                 else:
                     # Post text only
-                    message = await self.bot.send_message(
+                    message = await self._send_with_retries(
+                        self.bot.send_message,
                         chat_id=self.channel_id,
-                        text=message_text,
+                        text=part,
                         parse_mode=ParseMode.HTML,
                         disable_web_page_preview=False
                     )
+            except Exception as e:
+                if not message_ids:
+                    raise
+                # The post is already partly published; report the rest
+                error_msg = f"Error posting part {i + 1}/{len(parts)}: {str(e)}"
+                print(f"[TELEGRAM POSTER] {error_msg}", flush=True)
+                errors.append(error_msg)
+                break
+
+            message_ids.append(message.message_id)
+
+        print(f"[TELEGRAM POSTER] Successfully posted! Message ID: {message_ids[0]}", flush=True)
+        result = {
+            'success': True,
+            'message_id': message_ids[0],
+            'error': '; '.join(errors) if errors else None,
+            'posted_at_ns': time.time_ns()
+        }
+        if len(parts) > 1:
+            result['message_ids'] = message_ids
+        return result
 
-                print(f"[TELEGRAM POSTER] Successfully posted! Message ID: {message.message_id}", flush=True)
-                return {
-                    'success': True,
-                    'message_id': message.message_id,
-                    'error': None,
-                    'posted_at': datetime.utcnow()
-                }
+    async def _send_with_retries(self, method, **kwargs):
+        """
+        _send with retries for rate limits and network errors
+
+        RetryAfter is retried once the gate allows, NetworkError with
+        exponential backoff; other Telegram errors are raised at once.
+
+        Args:
+            method: Bound Bot method (send_message, send_photo)
+            **kwargs: Arguments for the method
+
+        Returns:
+            Sent Message
+        """
+        for attempt in range(self.max_retries):
+            try:
+                return await self._send(method, **kwargs)
 
             except RetryAfter as e:
-                # Rate limited - wait and retry
-                wait_time = e.retry_after + 1
-                print(f"[TELEGRAM POSTER] Rate limited. Waiting {wait_time}s...", flush=True)
-                await asyncio.sleep(wait_time)
+                # Rate limited - the next _send waits out retry_after
+                print(f"[TELEGRAM POSTER] Rate limited. Waiting {e.retry_after + 1}s...", flush=True)
 
             except NetworkError as e:
                 # Network error - retry with exponential backoff
@@ -241,37 +288,34 @@ class TelegramPoster:
         for i, tweet_text in enumerate(thread_content, 1):
             try:
                 # Add thread numbering
-                formatted_text = f"<b>{i}/{len(thread_content)}</b>\n\n{tweet_text}"
+                formatted_text = f"<b>{i}/{len(thread_content)}</b>\n\n{_to_html(tweet_text)}"
 
                 # Add hashtags to last message
-                if i == len(thread_content) and content.get('hashtags'):
-                    hashtags = content['hashtags']
-                    if isinstance(hashtags, str):
-                        hashtags = json.loads(hashtags)
+                hashtags = list_field(content, 'hashtags')
+                if i == len(thread_content) and hashtags:
                     formatted_text += f"\n\n{' '.join(hashtags)}"
 
                 # Post with photo only on first message
                 if i == 1 and media_path:
-                    with open(media_path, 'rb') as photo:
-                        message = await self.bot.send_photo(
-                            chat_id=self.channel_id,
-                            photo=photo,
-                            caption=formatted_text,
-                            parse_mode=ParseMode.HTML
-                        )
+                    message = await self._send_with_retries(
+                        self.bot.send_photo,
+                        chat_id=self.channel_id,
+                        photo=_read_media(media_path),
+                        caption=formatted_text,
+                        parse_mode=ParseMode.HTML
+                    )
                 else:
-                    message = await self.bot.send_message(
+                    message = await self._send_with_retries(
+                        self.bot.send_message,
                         chat_id=self.channel_id,
                         text=formatted_text,
                         parse_mode=ParseMode.HTML
                     )
 
+                # No fixed pause between messages: a 429 makes the _send
+                # gate hold the next send for retry_after instead
                 message_ids.append(message.message_id)
 
-                # Small delay between messages to avoid rate limits
-                if i < len(thread_content):
-                    await asyncio.sleep(1)
-
             except Exception as e:
                 error_msg = f"Error posting message {i}: {str(e)}"
                 print(f"[TELEGRAM POSTER] {error_msg}", flush=True)
@@ -284,7 +328,7 @@ class TelegramPoster:
                 'message_id': message_ids[0],  # First message ID
                 'message_ids': message_ids,
                 'error': None if not errors else '; '.join(errors),
-                'posted_at': datetime.utcnow()
+                'posted_at_ns': time.time_ns()
             }
         else:
             raise Exception(f"Failed to post thread: {'; '.join(errors)}")
@@ -299,21 +343,11 @@ class TelegramPoster:
         Returns:
             Formatted hashtags string
         """
-        hashtags = content.get('hashtags', [])
-
-        if not hashtags:
-            return ""
-
-        if isinstance(hashtags, str):
-            try:
-                hashtags = json.loads(hashtags)
-            except:
-                hashtags = hashtags.split()
+        hashtags = list_field(content, 'hashtags')
 
-        if hashtags and len(hashtags) > 0:
+        if hashtags:
             # Format hashtags with # symbol
-            formatted_hashtags = [f'#{tag.lstrip("#")}' for tag in hashtags]
-            return ' '.join(formatted_hashtags)
+            return ' '.join('#' + tag.lstrip('#') for tag in hashtags)
 
         return ""
 
@@ -330,13 +364,26 @@ class TelegramPoster:
         Returns:
             Formatted message text
         """
-        parts = []
+        return _to_html(self._format_markdown(content, include_hashtags))
+
+    def _format_markdown(self, content: Dict, include_hashtags: bool = True) -> str:
+        """
+        Message text before HTML conversion, with the title as **bold**
+
+        Args:
+            content: Content dictionary
+            include_hashtags: Whether to include hashtags in message
+
+        Returns:
+            Message text with markdown **bold**
+        """
+        # Sections separated by an empty line, joined once at the end
+        sections = []
 
         # Title
         title = content.get('title', '')
         if title:
-            parts.append(f"<b>{title}</b>")
-            parts.append("")  # Empty line
+            sections.append(f"**{title}**")
 
         # Main content
         main_content = content.get('content', '')
@@ -345,18 +392,15 @@ class TelegramPoster:
             main_content = '\n\n'.join(main_content)
 
         if main_content:
-            # Replace markdown bold with HTML
-            main_content = main_content.replace('**', '<b>').replace('**', '</b>')
-            parts.append(main_content)
+            sections.append(main_content)
 
         # Hashtags (only if requested)
         if include_hashtags:
             hashtags_text = self._format_hashtags(content)
             if hashtags_text:
-                parts.append("")  # Empty line
-                parts.append(hashtags_text)
+                sections.append(hashtags_text)
 
-        return '\n'.join(parts)
+        return '\n\n'.join(sections)
 
     async def test_connection(self) -> bool:
         """
@@ -410,11 +454,111 @@ class TelegramPoster:
         return self._format_message(content)
 
 
+def posted_at(result: Dict) -> datetime:
+    """When a post_content result was produced, as an aware UTC datetime"""
+    return datetime.fromtimestamp(result['posted_at_ns'] / 1e9, tz=timezone.utc)
+
+
+def _to_html(text: str) -> str:
+    """
+    Generated text as Telegram HTML
+
+    Escapes &, < and > so stray characters cannot break ParseMode.HTML
+    (a rejected send is retried for nothing), then turns markdown
+    **bold** into <b>bold</b>.
+    """
+    return _BOLD_RE.sub(r'<b>\1</b>', html.escape(text, quote=False))
+
+
+def _split_message(text: str, limit: int, first_limit: Optional[int] = None) -> List[str]:
+    """
+    Split text into Telegram-sized parts, at paragraph boundaries if possible
+
+    Paragraphs are packed greedily; a paragraph longer than a part is split
+    at line breaks and sentence ends, and a sentence longer than a part at
+    the character limit. A **bold** span cut by a part boundary is closed
+    and reopened so each part converts to balanced HTML.
+
+    Args:
+        text: Message text
+        limit: Maximum part length
+        first_limit: Maximum length of the first part (e.g. a photo caption)
+
+    Returns:
+        Parts in order (one part if the text already fits)
+    """
+    first_limit = first_limit or limit
+    piece_limit = min(limit, first_limit)
+    parts = []
+    current = ''
+
+    for piece, separator in _message_pieces(text, piece_limit):
+        part_limit = limit if parts else first_limit
+        if not current:
+            current = piece
+        elif len(current) + len(separator) + len(piece) <= part_limit:
+            current += separator + piece
+        else:
+            parts.append(current)
+            current = piece
+
+    if current:
+        parts.append(current)
+
+    for i in range(len(parts) - 1):
+        if parts[i].count('**') % 2:
+            parts[i] += '**'
+            parts[i + 1] = '**' + parts[i + 1]
+    return parts
+
+
+def _message_pieces(text: str, size: int):
+    """Yield (piece, separator before it) for _split_message, pieces at most size long"""
+    for paragraph in text.split('\n\n'):
+        if len(paragraph) <= size:
+            yield paragraph, '\n\n'
+            continue
+
+        # split() with a capture group alternates text and separator
+        tokens = _LINE_OR_SENTENCE_RE.split(paragraph)
+        separator = '\n\n'
+        for i in range(0, len(tokens), 2):
+            sentence = tokens[i]
+            for start in range(0, len(sentence), size):
+                yield sentence[start:start + size], separator
+                separator = ''
+            if i + 1 < len(tokens):
+                separator += tokens[i + 1]
+
+
+def _read_media(media_path: str) -> bytes:
+    """Contents of a media file, sent to Telegram as bytes"""
+    with open(media_path, 'rb') as f:
+        return f.read()
+
+
+# How long sync_post waits for a post, retries and rate-limit waits included
+SYNC_POST_TIMEOUT = 300
+
+
+@functools.lru_cache(maxsize=8)
+def _get_poster(bot_token: str, channel_id: str, loop: asyncio.AbstractEventLoop) -> TelegramPoster:
+    """
+    TelegramPoster shared by sync_post calls for one bot and channel
+
+    Keyed by the loop too: a poster's bot client and send lock are bound to
+    the loop they were first used on, and the loop is recreated after fork.
+    """
+    return TelegramPoster(bot_token, channel_id)
+
+
 def sync_post(bot_token: str, channel_id: str, content: Dict, media_path: Optional[str] = None) -> Dict:
     """
     Synchronous wrapper for posting to Telegram
 
-    Use this when you can't use async/await (e.g., in Flask routes)
+    Use this when you can't use async/await (e.g., in Flask routes). Posts run
+    on the shared background loop (utils.async_loop) with one poster per bot
+    and channel, so the bot's HTTP connection pool stays warm between calls.
 
     Args:
         bot_token: Telegram bot token
@@ -424,14 +568,9 @@ def sync_post(bot_token: str, channel_id: str, content: Dict, media_path: Option
 
     Returns:
         Result dictionary
-    """
-    poster = TelegramPoster(bot_token, channel_id)
 
-    # Run async function in sync context
-    loop = asyncio.new_event_loop()
-    asyncio.set_event_loop(loop)
-    try:
-        result = loop.run_until_complete(poster.post_content(content, media_path))
-        return result
-    finally:
-        loop.close()
+    Raises:
+        TimeoutError: The post did not finish within SYNC_POST_TIMEOUT
+    """
+    poster = _get_poster(bot_token, channel_id, get_loop())
+    return run_coroutine(poster.post_content(content, media_path), SYNC_POST_TIMEOUT)
@@ -102,6 +102,48 @@ class TopicSelector:
         print(f"[TOPIC SELECTOR] Selected topic with {selected['post_count']} posts: {selected['keywords'][:3]}", flush=True)
         return selected
 
+    def select_topics(self, n: int, exclude_days: int = 30,
+                      prefer_trending: bool = True,
+                      min_posts: int = 3) -> List[Dict]:
+        """
+        Select up to n distinct unique topics in one pass
+
+        Used for batch runs, where calling select_next_topic() n times would
+        detect topics n times and could return the same topic twice before
+        it is marked as used.
+
+        Args:
+            n: Maximum number of topics to return
+            exclude_days: Don't select topics used within this many days (default: 30)
+            prefer_trending: Put trending topics first (default: True)
+            min_posts: Minimum number of posts a topic should have (default: 3)
+
+        Returns:
+            List of topic dicts (see select_next_topic), best first
+        """
+        available_topics = self._get_available_topics(min_posts=min_posts)
+
+        unused_topics = [
+            topic for topic in available_topics
+            if not self.db.is_topic_used_recently(topic['keywords'], exclude_days)
+        ]
+
+        if not unused_topics:
+            # Same relaxation rules as select_next_topic, for a single topic
+            topic = self.select_next_topic(exclude_days=exclude_days,
+                                           prefer_trending=prefer_trending,
+                                           min_posts=min_posts)
+            return [topic] if topic else []
+
+        # Trending first (if preferred), then by post count
+        unused_topics.sort(
+            key=lambda t: (prefer_trending and t.get('is_trending', False), t['post_count']),
+            reverse=True
+        )
+        selected = unused_topics[:n]
+        print(f"[TOPIC SELECTOR] Selected {len(selected)} of {len(unused_topics)} unused topics", flush=True)
+        return selected
+
     def _get_available_topics(self, min_posts: int = 3) -> List[Dict]:
         """
         Get available topics using InsightsAnalyzer
@@ -0,0 +1,147 @@
+"""
+Database migration: bring universal_posts up to date with the model
+
+Adds columns and indexes that exist on UniversalPost but are missing from
+an existing database (create_all() only creates tables that don't exist yet).
+Safe to run repeatedly - every step checks the live schema first.
+On PostgreSQL indexes are built CONCURRENTLY so the app keeps writing
+to universal_posts while a deploy runs the migration.
+
+Usage:
+    python migrate_universal_posts.py             # migrate
+    python migrate_universal_posts.py --explain   # show AI queue query plan
+"""
+import os
+import sys
+from sqlalchemy import create_engine, inspect, select, text
+from sqlalchemy.schema import CreateIndex
+from storage.universal_models import UniversalPost
+
+
+def get_database_url() -> str:
+    """Get database URL from environment (same default as app_v2)"""
+    database_url = os.getenv('DATABASE_URL', 'sqlite:///data/insights.db')
+
+    # Fix postgres URL if needed
+    if database_url.startswith('postgres://'):
+        database_url = database_url.replace('postgres://', 'postgresql://', 1)
+
+    return database_url
+
+
+def add_missing_columns(engine) -> int:
+    """Add model columns missing from universal_posts table"""
+    table = UniversalPost.__table__
+    existing = {col['name'] for col in inspect(engine).get_columns(table.name)}
+    added = 0
+
+    for column in table.columns:
+        if column.name in existing:
+            continue
+
+        column_type = column.type.compile(dialect=engine.dialect)
+        with engine.begin() as conn:
+            conn.execute(text(f'ALTER TABLE {table.name} ADD COLUMN {column.name} {column_type}'))
+        print(f"[OK] Added column: {column.name} {column_type}")
+        added += 1
+
+    return added
+
+
+def get_invalid_indexes(engine, table_name: str) -> set:
+    """
+    Names of INVALID indexes on table_name (PostgreSQL only)
+
+    A CREATE INDEX CONCURRENTLY that fails or is interrupted leaves the
+    index behind, marked invalid: it exists by name but is never used.
+    """
+    if engine.dialect.name != 'postgresql':
+        return set()
+
+    with engine.connect() as conn:
+        rows = conn.execute(text(
+            "SELECT c.relname FROM pg_index i JOIN pg_class c ON c.oid = i.indexrelid "
+            "WHERE i.indrelid = CAST(:table AS regclass) AND NOT i.indisvalid"
+        ), {'table': table_name})
+        return {row[0] for row in rows}
+
+
+def add_missing_indexes(engine) -> int:
+    """Create model indexes missing from universal_posts table (rebuilding invalid ones)"""
+    table = UniversalPost.__table__
+    existing = {idx['name'] for idx in inspect(engine).get_indexes(table.name)}
+    invalid = get_invalid_indexes(engine, table.name)
+    added = 0
+
+    for index in table.indexes:
+        if index.name in existing and index.name not in invalid:
+            continue
+
+        if engine.dialect.name == 'postgresql':
+            # CONCURRENTLY can't run inside a transaction block
+            ddl = str(CreateIndex(index).compile(dialect=engine.dialect))
+            ddl = ddl.replace('CREATE INDEX', 'CREATE INDEX CONCURRENTLY', 1)
+            with engine.connect().execution_options(isolation_level='AUTOCOMMIT') as conn:
+                if index.name in invalid:
+                    print(f"[INFO] Rebuilding invalid index: {index.name}")
+                    conn.execute(text(f'DROP INDEX CONCURRENTLY IF EXISTS {index.name}'))
+                conn.execute(text(ddl))
+        else:
+            index.create(engine)
+        print(f"[OK] Created index: {index.name}")
+        added += 1
+
+    return added
+
+
+def explain_pending_analysis(engine):
+    """Print query plan of the AI queue query (should use ix_up_pending_analysis)"""
+    stmt = select(
+        UniversalPost.id, UniversalPost.importance_score,
+        UniversalPost.title, UniversalPost.content
+    ).where(
+        UniversalPost.ai_summary.is_(None)
+    ).order_by(
+        UniversalPost.importance_score.desc(),
+        UniversalPost.id.desc()
+    ).limit(50)
+
+    sql = str(stmt.compile(dialect=engine.dialect, compile_kwargs={'literal_binds': True}))
+
+    if engine.dialect.name == 'postgresql':
+        explain = f'EXPLAIN (ANALYZE, BUFFERS) {sql}'
+    else:
+        explain = f'EXPLAIN QUERY PLAN {sql}'
+
+    with engine.connect() as conn:
+        for row in conn.execute(text(explain)):
+            print(' | '.join(str(value) for value in row))
+
+
+def migrate():
+    """Run migration"""
+    database_url = get_database_url()
+    print(f"Connecting to database: {database_url.split('@')[-1]}")
+
+    engine = create_engine(database_url, echo=False)
+
+    if not inspect(engine).has_table(UniversalPost.__tablename__):
+        print("[SKIP] universal_posts table does not exist yet - app will create it")
+        return
+
+    if '--explain' in sys.argv:
+        explain_pending_analysis(engine)
+        return
+
+    try:
+        columns = add_missing_columns(engine)
+        indexes = add_missing_indexes(engine)
+    except Exception as e:
+        print(f"[ERROR] Migration failed: {e}")
+        sys.exit(1)
+
+    print(f"\n[DONE] Migration complete: {columns} column(s), {indexes} index(es) added")
+
+
+if __name__ == '__main__':
+    migrate()
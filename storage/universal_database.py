@@ -1,10 +1,12 @@
 """
 Enhanced database manager with deduplication and universal models
 """
-from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy import select, insert, update, delete, func, text, literal, or_
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session, sessionmaker, scoped_session
 from storage.universal_models import (
     UniversalPost, UniversalComment, DuplicateGroup,
-    EnhancedSignal, ParserRun, UsedTopic, init_universal_db
+    EnhancedSignal, ParserRun, UsedTopic, WorkflowRun, BackgroundJob, init_universal_db
 )
 from datetime import datetime, timedelta, timezone
 from typing import List, Optional, Dict
@@ -23,16 +25,99 @@ class UniversalDatabaseManager:
 
     def __init__(self, database_url='sqlite:///data/insights.db'):
         self.engine = init_universal_db(database_url)
-        self.Session = sessionmaker(bind=self.engine)
-        self.session = self.Session()
+        # One session per thread (per greenlet under gevent) so concurrent
+        # requests and scheduler jobs never share a Session
+        self.Session = scoped_session(sessionmaker(bind=self.engine))
+        # Connections kept open to hold session-level advisory locks, by lock key
+        self._lock_connections = {}
+
+    @property
+    def session(self) -> Session:
+        """Session bound to the current thread"""
+        return self.Session()
 
     def reset_session(self):
         """Reset the database session - useful after errors"""
         try:
-            self.session.close()
+            self.Session.remove()
         except:
             pass
-        self.session = self.Session()
+
+    def remove_session(self):
+        """
+        Release current thread's session and its connection
+
+        Call at the end of a request or background job.
+        """
+        self.Session.remove()
+
+    def try_advisory_lock(self, key: int) -> bool:
+        """
+        Try to take a PostgreSQL session-level advisory lock without waiting
+
+        The lock is held for the life of the process (its connection stays
+        checked out) and released by the server when the process exits.
+        Other databases are only used for single-process local runs, so
+        the lock is always granted there.
+
+        Args:
+            key: Lock id shared by all processes competing for the lock
+
+        Returns:
+            True if this process holds the lock
+        """
+        if self.engine.dialect.name != 'postgresql':
+            return True
+
+        conn = self.engine.connect()
+        acquired = conn.execute(text('SELECT pg_try_advisory_lock(:key)'), {'key': key}).scalar()
+        conn.commit()  # Session-level lock survives; don't sit idle in transaction
+
+        if acquired:
+            self._lock_connections[key] = conn
+        else:
+            conn.close()
+        return bool(acquired)
+
+    def holds_advisory_lock(self, key: int) -> bool:
+        """
+        Check that a lock taken with try_advisory_lock() is still held
+
+        The server releases the lock when its connection drops (restart,
+        network blip); a lost connection is discarded so the lock can be
+        taken again.
+
+        Args:
+            key: Lock id passed to try_advisory_lock()
+
+        Returns:
+            True if this process still holds the lock
+        """
+        if self.engine.dialect.name != 'postgresql':
+            return True
+
+        conn = self._lock_connections.get(key)
+        if conn is None:
+            return False
+
+        try:
+            held = conn.execute(text(
+                "SELECT count(*) FROM pg_locks "
+                "WHERE locktype = 'advisory' AND pid = pg_backend_pid() AND granted "
+                "AND ((classid::bigint << 32) | objid::bigint) = :key AND objsubid = 1"
+            ), {'key': key}).scalar()
+            conn.commit()
+        except Exception as e:
+            print(f"Advisory lock connection lost: {e}")
+            held = 0
+
+        if not held:
+            del self._lock_connections[key]
+            try:
+                conn.close()
+            except Exception:
+                pass
+        return bool(held)
 
     def add_universal_post(self, post_data: dict) -> UniversalPost:
         """
@@ -237,15 +322,56 @@ class UniversalDatabaseManager:
             return time_since_last < 48  # Seen in last 48 hours
         return False
 
-    def find_duplicate_posts(self, post: UniversalPost) -> List[UniversalPost]:
-        """Find all duplicate posts across sources"""
-        if not post.duplicate_group_id:
-            return []
+    def find_duplicate_posts(self, post: UniversalPost, limit: int = 10) -> List[UniversalPost]:
+        """
+        Find related posts: duplicates across sources first, then posts
+        from the same precomputed topic cluster
 
-        return self.session.query(UniversalPost).filter(
-            UniversalPost.duplicate_group_id == post.duplicate_group_id,
-            UniversalPost.id != post.id
-        ).all()
+        Both lookups are indexed equality queries - no similarity search
+        happens per request.
+        """
+        related = []
+
+        if post.duplicate_group_id:
+            related = self.session.query(UniversalPost).filter(
+                UniversalPost.duplicate_group_id == post.duplicate_group_id,
+                UniversalPost.id != post.id
+            ).limit(limit).all()
+
+        if post.cluster_id and len(related) < limit:
+            exclude_ids = [post.id] + [p.id for p in related]
+            related += self.session.query(UniversalPost).filter(
+                UniversalPost.cluster_id == post.cluster_id,
+                UniversalPost.id.notin_(exclude_ids)
+            ).order_by(
+                UniversalPost.importance_score.desc()
+            ).limit(limit - len(related)).all()
+
+        return related
+
+    def assign_post_clusters(self, cluster_map: Dict[int, int]):
+        """
+        Store cluster assignments for posts
+
+        Clears previous assignments first: cluster numbers are only
+        meaningful within a single clustering run.
+
+        Args:
+            cluster_map: {post_id: cluster_id}
+        """
+        try:
+            self.session.query(UniversalPost).filter(
+                UniversalPost.cluster_id.isnot(None)
+            ).update({UniversalPost.cluster_id: None}, synchronize_session=False)
+
+            self.session.bulk_update_mappings(UniversalPost, [
+                {'id': post_id, 'cluster_id': cluster_id}
+                for post_id, cluster_id in cluster_map.items()
+            ])
+            self.session.commit()
+        except Exception as e:
+            self.session.rollback()
+            print(f"Error assigning post clusters: {e}")
 
     def get_post_by_id(self, post_id: int) -> Optional[UniversalPost]:
         """Get a single post by ID"""
@@ -267,6 +393,20 @@ class UniversalDatabaseManager:
                 post_id=post_id
             ).order_by(UniversalComment.created_at.desc()).all()
 
+    @staticmethod
+    def _ai_analysis_columns(analysis: dict) -> dict:
+        """Map AIAnalyzer result to UniversalPost column values"""
+        return {
+            'ai_summary': analysis.get('summary', ''),
+            'ai_category': analysis.get('category', ''),
+            'ai_sentiment': analysis.get('sentiment', ''),
+            'ai_insights': json.dumps(analysis.get('key_insights', [])),
+            'ai_technologies': json.dumps(analysis.get('technologies', [])),
+            'ai_companies': json.dumps(analysis.get('companies', [])),
+            'ai_topics': json.dumps(analysis.get('topics', [])),
+            'ai_analyzed_at': datetime.now(timezone.utc),
+        }
+
     def save_ai_analysis(self, post_id: int, analysis: dict):
         """
         Save AI analysis results to post
@@ -278,63 +418,132 @@ class UniversalDatabaseManager:
         try:
             post = self.session.query(UniversalPost).filter_by(id=post_id).first()
             if post:
-                import json
-                post.ai_summary = analysis.get('summary', '')
-                post.ai_category = analysis.get('category', '')
-                post.ai_sentiment = analysis.get('sentiment', '')
-                post.ai_insights = json.dumps(analysis.get('key_insights', []))
-                post.ai_technologies = json.dumps(analysis.get('technologies', []))
-                post.ai_companies = json.dumps(analysis.get('companies', []))
-                post.ai_topics = json.dumps(analysis.get('topics', []))
-                post.ai_analyzed_at = datetime.now(timezone.utc)
+                for column, value in self._ai_analysis_columns(analysis).items():
+                    setattr(post, column, value)
                 self.session.commit()
         except Exception as e:
             self.session.rollback()
             print(f"Error saving AI analysis: {e}")
 
+    def save_ai_analyses(self, results: List[tuple]) -> int:
+        """
+        Save a batch of AI analysis results in one UPDATE round trip + commit
+
+        Args:
+            results: List of (post_id, analysis) tuples
+
+        Returns:
+            Number of posts updated
+        """
+        if not results:
+            return 0
+
+        try:
+            self.session.bulk_update_mappings(UniversalPost, [
+                {'id': post_id, **self._ai_analysis_columns(analysis)}
+                for post_id, analysis in results
+            ])
+            self.session.commit()
+            return len(results)
+        except Exception as e:
+            self.session.rollback()
+            print(f"Error saving AI analysis batch: {e}")
+            return 0
+
+    # Claims older than this are treated as abandoned (worker died / failed)
+    AI_CLAIM_TIMEOUT = timedelta(minutes=30)
+
+    def iter_posts_pending_analysis(self, batch_size: int = 50):
+        """
+        Claim and iterate posts without AI analysis, most important first
+
+        Each page is selected with FOR UPDATE SKIP LOCKED and stamped with
+        ai_claimed_at in the same transaction, so concurrent workers (two
+        gunicorn workers, manual + scheduled run) get disjoint batches and
+        never pay for the same Groq call twice. Posts that fail analysis
+        stay claimed until AI_CLAIM_TIMEOUT, then become pending again.
+        SQLite (local single-process runs) ignores the lock hint.
+
+        Only the columns the analyzer needs are loaded (no ORM entities
+        in the identity map).
+
+        Yields:
+            Lists of rows with (id, title, content)
+        """
+        while True:
+            now = datetime.now(timezone.utc)
+
+            stmt = select(
+                UniversalPost.id, UniversalPost.title, UniversalPost.content
+            ).where(
+                UniversalPost.ai_summary.is_(None),
+                (UniversalPost.ai_claimed_at.is_(None)) |
+                (UniversalPost.ai_claimed_at < now - self.AI_CLAIM_TIMEOUT)
+            ).order_by(
+                UniversalPost.importance_score.desc(),
+                UniversalPost.id.desc()
+            ).limit(batch_size).with_for_update(skip_locked=True)
+
+            try:
+                rows = self.session.execute(stmt).all()
+                if rows:
+                    self.session.execute(
+                        update(UniversalPost)
+                        .where(UniversalPost.id.in_([row.id for row in rows]))
+                        .values(ai_claimed_at=now)
+                    )
+                # Commit releases the row locks; the claim keeps others away
+                self.session.commit()
+            except Exception:
+                self.session.rollback()
+                raise
+
+            if not rows:
+                return
+
+            yield [(row.id, row.title, row.content) for row in rows]
+
+    def _recent_posts_statement(self, limit: int, post_type: Optional[str],
+                                source: Optional[str], min_importance: float,
+                                search_query: Optional[str]):
+        """
+        Build SELECT for get_recent_posts
+
+        Filter values (and LIMIT) are sent as bound parameters, so the
+        statement's cache key depends only on which filters are present.
+        SQLAlchemy's compiled cache then serves at most 8 statement shapes
+        and skips SQL compilation on every request after the first.
+        """
+        stmt = select(UniversalPost).where(
+            UniversalPost.importance_score >= min_importance
+        )
+
+        if post_type:
+            stmt = stmt.where(UniversalPost.post_type == post_type)
+        if source:
+            stmt = stmt.where(UniversalPost.source == source)
+
+        # Full-text search
+        if search_query:
+            search_pattern = f"%{search_query}%"
+            stmt = stmt.where(
+                (UniversalPost.title.ilike(search_pattern)) |
+                (UniversalPost.content.ilike(search_pattern))
+            )
+
+        return stmt.order_by(UniversalPost.fetched_at.desc()).limit(limit)
+
     def get_recent_posts(self, limit: int = 50, post_type: Optional[str] = None,
                         source: Optional[str] = None, min_importance: float = 0.0,
                         search_query: Optional[str] = None) -> List[UniversalPost]:
         """Get recent posts with filtering and search"""
+        stmt = self._recent_posts_statement(limit, post_type, source, min_importance, search_query)
         try:
-            query = self.session.query(UniversalPost).filter(
-                UniversalPost.importance_score >= min_importance
-            )
-
-            if post_type:
-                query = query.filter_by(post_type=post_type)
-            if source:
-                query = query.filter_by(source=source)
-
-            # Full-text search
-            if search_query:
-                search_pattern = f"%{search_query}%"
-                query = query.filter(
-                    (UniversalPost.title.ilike(search_pattern)) |
-                    (UniversalPost.content.ilike(search_pattern))
-                )
-
-            return query.order_by(UniversalPost.fetched_at.desc()).limit(limit).all()
+            return self.session.scalars(stmt).all()
         except Exception as e:
             # Reset session and try again
             self.reset_session()
-            query = self.session.query(UniversalPost).filter(
-                UniversalPost.importance_score >= min_importance
-            )
-
-            if post_type:
-                query = query.filter_by(post_type=post_type)
-            if source:
-                query = query.filter_by(source=source)
-
-            if search_query:
-                search_pattern = f"%{search_query}%"
-                query = query.filter(
-                    (UniversalPost.title.ilike(search_pattern)) |
-                    (UniversalPost.content.ilike(search_pattern))
-                )
-
-            return query.order_by(UniversalPost.fetched_at.desc()).limit(limit).all()
+            return self.session.scalars(stmt).all()
 
     def get_prioritized_signals(self, limit: int = 20, priority: Optional[str] = None,
                                only_trending: bool = False) -> List[EnhancedSignal]:
@@ -381,6 +590,33 @@ class UniversalDatabaseManager:
                 is_active=True
             ).order_by(EnhancedSignal.importance_score.desc()).all()
 
+    # Below this many rows an exact count is cheap and always fresh
+    ESTIMATE_COUNT_MIN_ROWS = 100000
+
+    def count_posts(self, estimate: bool = False) -> int:
+        """
+        Count posts
+
+        Args:
+            estimate: On PostgreSQL, use planner statistics (pg_class.reltuples)
+                      for large tables - O(1) instead of a full scan
+
+        Returns:
+            Number of posts (approximate if estimate is used)
+        """
+        if estimate and self.engine.dialect.name == 'postgresql':
+            estimated = self.session.execute(
+                text("SELECT reltuples::bigint FROM pg_class WHERE relname = :table"),
+                {'table': UniversalPost.__tablename__}
+            ).scalar()
+            # reltuples is -1 before the first ANALYZE
+            if estimated is not None and estimated >= self.ESTIMATE_COUNT_MIN_ROWS:
+                return int(estimated)
+
+        return self.session.execute(
+            select(func.count(UniversalPost.id))
+        ).scalar()
+
     def get_stats(self) -> dict:
         """Get overall statistics"""
         try:
@@ -506,6 +742,25 @@ class UniversalDatabaseManager:
             print(f"Error cleaning up old posts: {e}")
             return 0
 
+    @staticmethod
+    def _build_generated_content(content_data: dict):
+        """GeneratedContent row for content_data (see save_generated_content)"""
+        from storage.universal_models import GeneratedContent
+
+        return GeneratedContent(
+            format_type=content_data['format'],
+            language=content_data.get('language', 'en'),
+            tone=content_data.get('tone', 'professional'),
+            title=content_data.get('title', ''),
+            content=json.dumps(content_data['content']) if isinstance(content_data['content'], list) else content_data['content'],
+            hashtags=json.dumps(content_data.get('hashtags', [])),
+            key_points=json.dumps(content_data.get('key_points', [])),
+            word_count=content_data.get('word_count', 0),
+            source_type=content_data.get('source_type', 'unknown'),
+            source_description=content_data.get('source_description', ''),
+            source_posts=json.dumps(content_data.get('source_posts', []))
+        )
+
     def save_generated_content(self, content_data: dict) -> int:
         """
         Save AI-generated content to database
@@ -517,21 +772,7 @@ class UniversalDatabaseManager:
             ID of saved content
         """
         try:
-            from storage.universal_models import GeneratedContent
-
-            content = GeneratedContent(
-                format_type=content_data['format'],
-                language=content_data.get('language', 'en'),
-                tone=content_data.get('tone', 'professional'),
-                title=content_data.get('title', ''),
-                content=json.dumps(content_data['content']) if isinstance(content_data['content'], list) else content_data['content'],
-                hashtags=json.dumps(content_data.get('hashtags', [])),
-                key_points=json.dumps(content_data.get('key_points', [])),
-                word_count=content_data.get('word_count', 0),
-                source_type=content_data.get('source_type', 'unknown'),
-                source_description=content_data.get('source_description', ''),
-                source_posts=json.dumps(content_data.get('source_posts', []))
-            )
+            content = self._build_generated_content(content_data)
 
             self.session.add(content)
             self.session.commit()
@@ -541,6 +782,94 @@ class UniversalDatabaseManager:
             print(f"Error saving generated content: {e}")
             return 0
 
+    def save_and_publish(self, content_data: dict, topic: Optional[Dict] = None,
+                         message_id: Optional[int] = None, platform: str = 'telegram') -> int:
+        """
+        Save generated content, mark its topic as used and mark it published
+        in one transaction (one commit instead of three)
+
+        Args:
+            content_data: Dict with content data (see save_generated_content)
+            topic: Topic dict from TopicSelector to record as used, or None
+            message_id: ID of the published message; content is only marked
+                published when set
+            platform: Platform the content was published to
+
+        Returns:
+            ID of saved content, 0 if nothing was saved
+        """
+        try:
+            content = self._build_generated_content(content_data)
+            if message_id:
+                content.is_published = True
+                content.published_at = datetime.now(timezone.utc)
+                content.platform = platform
+
+            if self.engine.dialect.name == 'postgresql':
+                # Both INSERTs as one statement: a single round trip to the server
+                content_id = self.session.execute(
+                    self._save_and_publish_statement(content, topic)
+                ).scalar()
+                self.session.commit()
+                return content_id
+
+            self.session.add(content)
+            self.session.flush()  # Get content ID for the UsedTopic row
+
+            if topic:
+                self.session.add(self._build_used_topic(
+                    keywords=topic['keywords'],
+                    content_id=content.id,
+                    topic_id=topic.get('topic_id'),
+                    post_count=topic.get('post_count', 0),
+                    source_type='topic'
+                ))
+
+            self.session.commit()
+            return content.id
+        except Exception as e:
+            self.session.rollback()
+            print(f"Error saving and publishing content: {e}")
+            return 0
+
+    def _save_and_publish_statement(self, content, topic: Optional[Dict] = None):
+        """
+        INSERT of content plus (if topic) its UsedTopic row as one statement
+
+        Uses a data-modifying CTE (PostgreSQL only) so the UsedTopic row can
+        reference the new content id without a flush in between.
+        """
+        from storage.universal_models import GeneratedContent
+
+        def row_values(obj):
+            return {
+                column.key: getattr(obj, column.key)
+                for column in obj.__table__.columns
+                if getattr(obj, column.key) is not None
+            }
+
+        ins = (
+            insert(GeneratedContent)
+            .values(row_values(content))
+            .returning(GeneratedContent.id)
+            .cte('ins')
+        )
+        if not topic:
+            return select(ins.c.id)
+
+        used_topic = row_values(self._build_used_topic(
+            keywords=topic['keywords'],
+            topic_id=topic.get('topic_id'),
+            post_count=topic.get('post_count', 0),
+            source_type='topic'
+        ))
+        columns = list(used_topic) + ['content_id']
+        used = insert(UsedTopic).from_select(
+            columns,
+            select(*[literal(value) for value in used_topic.values()], ins.c.id)
+        ).cte('used')
+        return select(ins.c.id).add_cte(used)
+
     def get_generated_content(self, limit: int = 50, format_type: Optional[str] = None,
                               only_published: bool = False) -> List:
         """Get generated content with filtering"""
@@ -627,20 +956,7 @@ class UniversalDatabaseManager:
             ID of UsedTopic record
         """
         try:
-            # Create hash of keywords for duplicate detection
-            keywords_sorted = sorted([k.lower().strip() for k in keywords])
-            keywords_str = '|||'.join(keywords_sorted)
-            keywords_hash = hashlib.sha256(keywords_str.encode()).hexdigest()
-
-            used_topic = UsedTopic(
-                topic_id=topic_id,
-                keywords=json.dumps(keywords),
-                keywords_hash=keywords_hash,
-                content_id=content_id,
-                post_count=post_count,
-                source_type=source_type,
-                used_at=datetime.now(timezone.utc)
-            )
+            used_topic = self._build_used_topic(keywords, content_id, topic_id, post_count, source_type)
 
             self.session.add(used_topic)
             self.session.commit()
@@ -650,6 +966,26 @@ class UniversalDatabaseManager:
             print(f"Error marking topic as used: {e}")
             return 0
 
+    @staticmethod
+    def _build_used_topic(keywords: List[str], content_id: int = None,
+                          topic_id: int = None, post_count: int = 0,
+                          source_type: str = 'topic') -> UsedTopic:
+        """UsedTopic row for keywords (see mark_topic_as_used)"""
+        # Create hash of keywords for duplicate detection
+        keywords_sorted = sorted([k.lower().strip() for k in keywords])
+        keywords_str = '|||'.join(keywords_sorted)
+        keywords_hash = hashlib.sha256(keywords_str.encode()).hexdigest()
+
+        return UsedTopic(
+            topic_id=topic_id,
+            keywords=json.dumps(keywords),
+            keywords_hash=keywords_hash,
+            content_id=content_id,
+            post_count=post_count,
+            source_type=source_type,
+            used_at=datetime.now(timezone.utc)
+        )
+
     def _are_topics_similar(self, keywords1: List[str], keywords2: List[str], threshold: float = 0.5) -> bool:
         """
         Check if two topics are similar based on keyword overlap
@@ -770,6 +1106,215 @@ class UniversalDatabaseManager:
             print(f"Error cleaning up old used topics: {e}")
             return 0
 
+    # WorkflowRun management methods
+    WORKFLOW_FINAL_STAGES = ('done', 'failed')
+
+    def create_workflow_run(self, stage: str = 'started', payload: Optional[dict] = None) -> int:
+        """
+        Record a new generate_and_post run
+
+        Returns:
+            ID of WorkflowRun record (0 on error)
+        """
+        try:
+            run = WorkflowRun(stage=stage, payload=json.dumps(payload or {}, default=str))
+            self.session.add(run)
+            self.session.commit()
+            return run.id
+        except Exception as e:
+            self.session.rollback()
+            print(f"Error creating workflow run: {e}")
+            return 0
+
+    def update_workflow_run(self, run_id: int, stage: str, payload: Optional[dict] = None):
+        """Move run to stage (and replace its payload if given)"""
+        values = {'stage': stage, 'updated_at': datetime.now(timezone.utc)}
+        if payload is not None:
+            values['payload'] = json.dumps(payload, default=str)
+
+        try:
+            self.session.execute(
+                update(WorkflowRun).where(WorkflowRun.id == run_id).values(**values)
+            )
+            self.session.commit()
+        except Exception as e:
+            self.session.rollback()
+            print(f"Error updating workflow run {run_id}: {e}")
+
+    def touch_workflow_run(self, run_id: int):
+        """Refresh updated_at of a run in progress so it doesn't look stalled"""
+        try:
+            self.session.execute(
+                update(WorkflowRun)
+                .where(WorkflowRun.id == run_id, WorkflowRun.stage.notin_(self.WORKFLOW_FINAL_STAGES))
+                .values(updated_at=datetime.now(timezone.utc))
+            )
+            self.session.commit()
+        except Exception as e:
+            self.session.rollback()
+            print(f"Error touching workflow run {run_id}: {e}")
+
+    def claim_stalled_workflow_runs(self, stalled_minutes: int = 5, max_attempts: int = 3) -> List[dict]:
+        """
+        Take over runs that stopped before a final stage
+
+        A run counts as stalled when it has not moved for stalled_minutes;
+        runs in progress stay fresh through touch_workflow_run heartbeats.
+        Claimed runs get a fresh updated_at and attempts + 1, so another
+        worker doesn't resume them too; runs out of attempts are marked
+        'failed' instead.
+
+        Returns:
+            List of {'id', 'stage', 'payload'} dicts for runs to resume
+        """
+        cutoff = datetime.now(timezone.utc) - timedelta(minutes=stalled_minutes)
+        try:
+            stmt = select(WorkflowRun).where(
+                WorkflowRun.stage.notin_(self.WORKFLOW_FINAL_STAGES),
+                WorkflowRun.updated_at < cutoff
+            ).with_for_update(skip_locked=True)
+
+            claimed = []
+            for run in self.session.scalars(stmt).all():
+                if run.attempts >= max_attempts:
+                    run.stage = 'failed'
+                    continue
+                run.attempts += 1
+                run.updated_at = datetime.now(timezone.utc)
+                claimed.append({
+                    'id': run.id,
+                    'stage': run.stage,
+                    'payload': json.loads(run.payload or '{}')
+                })
+
+            self.session.commit()
+            return claimed
+        except Exception as e:
+            self.session.rollback()
+            print(f"Error claiming stalled workflow runs: {e}")
+            return []
+
+    # BackgroundJob management methods
+    def create_background_job(self, job_id: str, kind: str) -> bool:
+        """
+        Record a new pending background job
+
+        Returns:
+            True if the job row was written
+        """
+        try:
+            self.session.add(BackgroundJob(id=job_id, kind=kind, status='pending'))
+            self.session.commit()
+            return True
+        except Exception as e:
+            self.session.rollback()
+            print(f"Error creating background job: {e}")
+            return False
+
+    def claim_background_job(self, job_id: str, kind: str, stale_seconds: int) -> bool:
+        """
+        Record job_id as pending unless it already is
+
+        With a fixed job_id this is a run flag shared by all workers: the
+        claim fails while the row is pending and was updated within
+        stale_seconds (see touch_background_job); a finished or abandoned
+        row is taken over.
+
+        Returns:
+            True if this caller now holds the claim
+        """
+        now = datetime.now(timezone.utc)
+        cutoff = now - timedelta(seconds=stale_seconds)
+        try:
+            claimed = self.session.execute(
+                update(BackgroundJob)
+                .where(BackgroundJob.id == job_id)
+                .where(or_(BackgroundJob.status != 'pending', BackgroundJob.updated_at < cutoff))
+                .values(kind=kind, status='pending', result=None, error=None, error_code=None,
+                        created_at=now, updated_at=now)
+            ).rowcount
+            if not claimed:
+                # No row yet - or a live claim, which the insert collides with
+                self.session.add(BackgroundJob(id=job_id, kind=kind, status='pending'))
+            self.session.commit()
+            return True
+        except IntegrityError:
+            self.session.rollback()
+            return False
+        except Exception as e:
+            self.session.rollback()
+            print(f"Error claiming background job {job_id}: {e}")
+            return False
+
+    def touch_background_job(self, job_id: str):
+        """Refresh a pending job's updated_at so its claim does not go stale"""
+        try:
+            self.session.execute(
+                update(BackgroundJob)
+                .where(BackgroundJob.id == job_id, BackgroundJob.status == 'pending')
+                .values(updated_at=datetime.now(timezone.utc))
+            )
+            self.session.commit()
+        except Exception as e:
+            self.session.rollback()
+            print(f"Error touching background job {job_id}: {e}")
+
+    def finish_background_job(self, job_id: str, result: Optional[dict] = None,
+                              error: Optional[str] = None, error_code: int = 500):
+        """Store a job's result, or its error if error is given"""
+        if error is None:
+            values = {'status': 'success', 'result': json.dumps(result, default=_json_default)}
+        else:
+            values = {'status': 'error', 'error': error, 'error_code': error_code}
+        values['updated_at'] = datetime.now(timezone.utc)
+
+        try:
+            self.session.execute(
+                update(BackgroundJob).where(BackgroundJob.id == job_id).values(**values)
+            )
+            self.session.commit()
+        except Exception as e:
+            self.session.rollback()
+            print(f"Error finishing background job {job_id}: {e}")
+
+    def get_background_job(self, job_id: str) -> Optional[dict]:
+        """
+        Get a job's state
+
+        Returns:
+            {'status', 'result', 'error', 'error_code'} or None if unknown
+        """
+        job = self.session.get(BackgroundJob, job_id)
+        if job is None:
+            return None
+        return {
+            'status': job.status,
+            'result': json.loads(job.result) if job.result else None,
+            'error': job.error,
+            'error_code': job.error_code or 500,
+        }
+
+    def cleanup_background_jobs(self, max_age_seconds: int = 3600) -> int:
+        """Delete jobs not updated for max_age_seconds (finished, or abandoned)"""
+        cutoff = datetime.now(timezone.utc) - timedelta(seconds=max_age_seconds)
+        try:
+            deleted = self.session.execute(
+                delete(BackgroundJob).where(BackgroundJob.updated_at < cutoff)
+            ).rowcount
+            self.session.commit()
+            return deleted
+        except Exception as e:
+            self.session.rollback()
+            print(f"Error cleaning up background jobs: {e}")
+            return 0
+
     def close(self):
         """Close database session"""
-        self.session.close()
+        self.Session.remove()
+
+
+def _json_default(value):
+    """json.dumps fallback: ISO 8601 for datetimes, str() for anything else"""
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return str(value)
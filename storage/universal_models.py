@@ -5,7 +5,7 @@ These models replace source-specific models (HNPost, RedditPost, etc.)
 All data from any source is normalized into these models.
 """
 from datetime import datetime, timezone
-from sqlalchemy import create_engine, Column, Integer, String, Text, DateTime, ForeignKey, Boolean, Float, Index
+from sqlalchemy import create_engine, Column, Integer, String, Text, DateTime, ForeignKey, Boolean, Float, Index, text
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
@@ -56,6 +56,9 @@ class UniversalPost(Base):
     # Importance scoring
     importance_score = Column(Float, default=0.0, index=True)  # 0-100
 
+    # Topic cluster (precomputed by InsightsAnalyzer.cluster_similar_posts)
+    cluster_id = Column(Integer, nullable=True, index=True)
+
     # AI Analysis results
     ai_summary = Column(Text, nullable=True)  # AI-generated summary
     ai_category = Column(String(50), nullable=True)  # problem/solution/product/question/discussion
@@ -65,6 +68,7 @@ class UniversalPost(Base):
     ai_companies = Column(Text, nullable=True)  # JSON array of companies
     ai_topics = Column(Text, nullable=True)  # JSON array of topics
     ai_analyzed_at = Column(DateTime, nullable=True)  # When AI analysis was done
+    ai_claimed_at = Column(DateTime, nullable=True)  # When a worker reserved the post for AI analysis
 
     # Relationships
     comments = relationship("UniversalComment", back_populates="post", cascade="all, delete-orphan")
@@ -76,6 +80,14 @@ class UniversalPost(Base):
         Index('idx_source_source_id', 'source', 'source_id'),
         Index('idx_post_type_score', 'post_type', 'score'),
         Index('idx_created_fetched', 'created_at', 'fetched_at'),
+        # Partial indexes for the AI queue / analyzed-posts hot paths:
+        # WHERE ai_summary IS [NOT] NULL ORDER BY importance_score DESC LIMIT n
+        Index('ix_up_pending_analysis', 'importance_score',
+              postgresql_where=text('ai_summary IS NULL'),
+              sqlite_where=text('ai_summary IS NULL')),
+        Index('ix_up_analyzed_importance', 'importance_score',
+              postgresql_where=text('ai_summary IS NOT NULL'),
+              sqlite_where=text('ai_summary IS NOT NULL')),
     )
 
     def __repr__(self):
@@ -304,9 +316,76 @@ class UsedTopic(Base):
         return f"<UsedTopic {self.keywords_hash[:8]} used at {self.used_at}>"
 
 
+class WorkflowRun(Base):
+    """
+    Progress of one AutoContentSystem.generate_and_post run
+
+    Updated at every stage transition so a run interrupted by a crash or
+    restart can be resumed from its last completed stage instead of
+    repeating LLM/reel work or posting twice.
+    """
+    __tablename__ = 'workflow_runs'
+
+    id = Column(Integer, primary_key=True)
+
+    # 'started', 'content_generated', 'reel_generated', 'posted', 'done', 'failed'
+    stage = Column(String(30), index=True)
+    payload = Column(Text)  # JSON: topic, content, image_path, message_id
+    attempts = Column(Integer, default=1)  # Times the run was started/resumed
+
+    created_at = Column(DateTime, default=func.now())
+    updated_at = Column(DateTime, default=func.now(), onupdate=func.now(), index=True)
+
+    def __repr__(self):
+        return f"<WorkflowRun {self.id} stage={self.stage}>"
+
+
+class BackgroundJob(Base):
+    """
+    State of one background request job (content generation, auto-generate)
+
+    Kept in the database rather than in process memory so a poll is
+    answered by whichever gunicorn worker it reaches, not only by the
+    worker running the job.
+    """
+    __tablename__ = 'background_jobs'
+
+    id = Column(String(32), primary_key=True)  # uuid4 hex, returned to the client
+    kind = Column(String(30))  # 'generate_content', 'auto_generate'
+
+    # 'pending', 'success', 'error'
+    status = Column(String(20), default='pending')
+    result = Column(Text)  # JSON result when status == 'success'
+    error = Column(Text)
+    error_code = Column(Integer)  # HTTP status for errors: 400 bad input, 500 failure
+
+    created_at = Column(DateTime, default=func.now(), index=True)
+    updated_at = Column(DateTime, default=func.now(), onupdate=func.now())
+
+    def __repr__(self):
+        return f"<BackgroundJob {self.id} {self.kind} status={self.status}>"
+
+
+# Connection pool for server databases (Postgres): sized for gunicorn request
+# handlers + APScheduler jobs + AI/background threads sharing one engine
+ENGINE_POOL_OPTIONS = {
+    'pool_size': 10,
+    'max_overflow': 20,
+    'pool_recycle': 1800,  # Recycle before server/proxy idle timeouts drop connections
+    'pool_timeout': 30,
+}
+
+
 # Database initialization
 def init_universal_db(database_url='sqlite:///data/insights.db'):
     """Initialize database with universal models"""
-    engine = create_engine(database_url, echo=False)
+    options = {'echo': False, 'pool_pre_ping': True}
+
+    # SQLite keeps SQLAlchemy's default pool (file DBs get a QueuePool of
+    # per-thread connections; a single StaticPool connection isn't thread-safe)
+    if not database_url.startswith('sqlite'):
+        options.update(ENGINE_POOL_OPTIONS)
+
+    engine = create_engine(database_url, **options)
     Base.metadata.create_all(engine)
     return engine
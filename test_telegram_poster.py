@@ -14,7 +14,7 @@ IMPORTANT: Before running this test:
 """
 import os
 import asyncio
-from automation.telegram_poster import TelegramPoster
+from automation.telegram_poster import TelegramPoster, posted_at
 
 # Configuration
 BOT_TOKEN = os.getenv('TELEGRAM_BOT_TOKEN')
@@ -105,7 +105,7 @@ async def run_tests():
         result = await poster.post_content(simple_content)
         if result['success']:
             print(f"[OK] Message posted! Message ID: {result['message_id']}")
-            print(f"[OK] Posted at: {result['posted_at']}")
+            print(f"[OK] Posted at: {posted_at(result)}")
         else:
             print(f"[ERROR] Failed to post: {result['error']}")
     except Exception as e:
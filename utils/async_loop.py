@@ -0,0 +1,60 @@
+"""
+Background asyncio event loop shared by synchronous callers
+
+Flask routes and scheduler jobs hand coroutines (Telegram posts, the
+automation workflow) to one long-lived loop per process instead of
+creating a loop per call, so async clients keep their connection pools.
+There must be exactly one such loop: under gevent workers every "thread"
+is a greenlet on the same OS thread, and asyncio refuses to run a second
+loop while another one is running there.
+"""
+import asyncio
+import concurrent.futures
+import os
+import threading
+from typing import Any, Coroutine
+
+_loop = None
+_loop_pid = None
+_loop_lock = threading.Lock()
+
+
+def get_loop() -> asyncio.AbstractEventLoop:
+    """
+    Return this process's background event loop, starting it if needed
+
+    The loop is created on first use and again after fork (its thread does
+    not survive into the child).
+    """
+    global _loop, _loop_pid
+
+    with _loop_lock:
+        if _loop is None or _loop_pid != os.getpid() or _loop.is_closed():
+            loop = asyncio.new_event_loop()
+            threading.Thread(
+                target=loop.run_forever, name='async-loop', daemon=True
+            ).start()
+            _loop, _loop_pid = loop, os.getpid()
+        return _loop
+
+
+def run_coroutine(coro: Coroutine, timeout: float) -> Any:
+    """
+    Run coro on the background loop and wait for its result
+
+    Args:
+        coro: Coroutine to run
+        timeout: Seconds to wait; on timeout the coroutine is cancelled
+
+    Returns:
+        The coroutine's result
+
+    Raises:
+        TimeoutError: The coroutine did not finish within timeout
+    """
+    future = asyncio.run_coroutine_threadsafe(coro, get_loop())
+    try:
+        return future.result(timeout)
+    except concurrent.futures.TimeoutError:
+        future.cancel()
+        raise TimeoutError(f"Coroutine did not finish within {timeout}s")
@@ -0,0 +1,73 @@
+"""
+Small in-memory TTL cache
+
+Used for dashboard numbers that are expensive to compute but fine to be
+a few seconds stale (counts, stats).
+"""
+import threading
+import time
+from typing import Any, Callable, Hashable
+
+
+class TTLCache:
+    """
+    Thread-safe dict-like cache where every entry expires after `ttl` seconds
+
+    Example:
+        cache = TTLCache(ttl=30)
+        count = cache.get_or_set('posts_count', db.count_posts)
+    """
+
+    _MISSING = object()
+
+    def __init__(self, ttl: float, maxsize: int = 128):
+        """
+        Args:
+            ttl: Entry lifetime in seconds
+            maxsize: Max number of entries (oldest evicted first)
+        """
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self._data = {}  # key -> (expires_at, value)
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Get value if present and not expired"""
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return default
+            if entry[0] < time.monotonic():
+                del self._data[key]
+                return default
+            return entry[1]
+
+    def set(self, key: Hashable, value: Any):
+        """Store value for `ttl` seconds"""
+        with self._lock:
+            if key not in self._data and len(self._data) >= self.maxsize:
+                # Dicts keep insertion order - drop the oldest entry
+                self._data.pop(next(iter(self._data)))
+            self._data[key] = (time.monotonic() + self.ttl, value)
+
+    def get_or_set(self, key: Hashable, factory: Callable[[], Any]) -> Any:
+        """
+        Get cached value or compute it with factory() and cache it
+
+        factory() runs outside the lock, so concurrent misses may compute twice.
+        """
+        value = self.get(key, self._MISSING)
+        if value is self._MISSING:
+            value = factory()
+            self.set(key, value)
+        return value
+
+    def delete(self, key: Hashable):
+        """Remove single entry"""
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self):
+        """Remove all entries"""
+        with self._lock:
+            self._data.clear()
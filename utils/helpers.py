@@ -1,9 +1,11 @@
 """
 Common utility functions
 """
+import json
 import re
 from datetime import datetime, timezone
-from typing import List
+from functools import lru_cache
+from typing import Callable, Dict, List, Optional
 
 
 def clean_html(text: str) -> str:
@@ -34,13 +36,14 @@ def extract_keywords(text: str, min_length: int = 3) -> List[str]:
     return keywords
 
 
-def time_ago(dt: datetime) -> str:
-    """Convert datetime to 'time ago' format"""
+def time_ago(dt: datetime, now: Optional[datetime] = None) -> str:
+    """Convert datetime to 'time ago' format (relative to `now`, default: current UTC time)"""
     if not dt:
         return "unknown"
 
     # Make sure both datetimes are timezone-aware
-    now = datetime.now(timezone.utc)
+    if now is None:
+        now = datetime.now(timezone.utc)
 
     # If dt is naive (no timezone), assume it's UTC
     if dt.tzinfo is None:
@@ -62,6 +65,27 @@ def time_ago(dt: datetime) -> str:
         return f"{days}d ago"
 
 
+@lru_cache(maxsize=4096)
+def _time_ago_minutes(dt_minute: datetime, now_minute: datetime) -> str:
+    return time_ago(dt_minute, now=now_minute)
+
+
+def time_ago_cached(dt: datetime) -> str:
+    """
+    time_ago() at minute resolution, memoized for list templates
+
+    Both timestamps are truncated to the minute, so posts from the same
+    minute share one cache entry; entries for past minutes simply stop
+    being hit once the clock moves on.
+    """
+    if not dt:
+        return "unknown"
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    now_minute = datetime.now(timezone.utc).replace(second=0, microsecond=0)
+    return _time_ago_minutes(dt.replace(second=0, microsecond=0), now_minute)
+
+
 def truncate_text(text: str, max_length: int = 200) -> str:
     """Truncate text to max length"""
     if not text:
@@ -70,3 +94,22 @@ def truncate_text(text: str, max_length: int = 200) -> str:
     if len(text) <= max_length:
         return text
     return text[:max_length].rsplit(' ', 1)[0] + '...'
+
+
+def list_field(content: Dict, key: str, fallback: Callable[[str], List] = str.split) -> List:
+    """
+    content[key] as a list, parsing a JSON string only once
+
+    Content loaded from the database keeps hashtags / key_points as JSON
+    text. The parsed list is stored back in content, so later readers of
+    the same dict (reel, post, preview) get the list directly. Text that
+    is not JSON goes through fallback (default: split on whitespace).
+    """
+    value = content.get(key)
+    if isinstance(value, str):
+        try:
+            value = json.loads(value)
+        except ValueError:
+            value = fallback(value)
+        content[key] = value
+    return value or []
@@ -0,0 +1,95 @@
+"""
+Shared HTTP clients with connection pooling
+
+All outbound requests-based calls (Pollinations, Pexels) go through one
+requests.Session, and all Groq SDK clients share one httpx.Client, so TCP/TLS
+connections are kept alive and reused instead of being re-established on
+every call.
+"""
+import threading
+from typing import Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# Transient statuses worth retrying with backoff
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+# Groq connection pool: enough for the AI analysis workers plus content
+# generation; idle connections survive the gaps between rate-limited calls
+GROQ_MAX_CONNECTIONS = 32
+GROQ_KEEPALIVE_EXPIRY = 60.0  # seconds
+
+_session: Optional[requests.Session] = None
+_session_lock = threading.Lock()
+
+_groq_http_client = None
+_groq_http_client_lock = threading.Lock()
+
+
+def create_http_session(pool_connections: int = 20, pool_maxsize: int = 50,
+                        retries: int = 3, backoff_factor: float = 0.3) -> requests.Session:
+    """
+    Create requests.Session with pooled adapter and retry policy
+
+    Args:
+        pool_connections: Number of per-host pools to cache
+        pool_maxsize: Max connections kept alive per host
+        retries: Total retry attempts for transient failures
+        backoff_factor: Exponential backoff factor between retries
+
+    Returns:
+        Configured requests.Session
+    """
+    retry = Retry(
+        total=retries,
+        backoff_factor=backoff_factor,
+        status_forcelist=RETRY_STATUSES,
+        raise_on_status=False  # Let callers inspect status_code as before
+    )
+    adapter = HTTPAdapter(
+        pool_connections=pool_connections,
+        pool_maxsize=pool_maxsize,
+        max_retries=retry
+    )
+
+    session = requests.Session()
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    return session
+
+
+def get_http_session() -> requests.Session:
+    """Get or create global HTTP session"""
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                _session = create_http_session()
+    return _session
+
+
+def get_groq_http_client():
+    """
+    Get or create global httpx.Client for Groq SDK clients
+
+    Pass as Groq(http_client=...) so AIAnalyzer and ContentGenerator reuse
+    the same keep-alive pool. The SDK keeps its own retry policy (429/5xx).
+    """
+    global _groq_http_client
+    if _groq_http_client is None:
+        with _groq_http_client_lock:
+            if _groq_http_client is None:
+                # Imported here: only workers that talk to Groq need it
+                import httpx
+                from groq import DefaultHttpxClient
+
+                _groq_http_client = DefaultHttpxClient(
+                    limits=httpx.Limits(
+                        max_connections=GROQ_MAX_CONNECTIONS,
+                        max_keepalive_connections=GROQ_MAX_CONNECTIONS,
+                        keepalive_expiry=GROQ_KEEPALIVE_EXPIRY
+                    )
+                )
+    return _groq_http_client
@@ -80,19 +80,29 @@ class AutoScheduler:
         """
         self.analyze_callback = callback
 
-    def start(self):
-        """Start the scheduler"""
+    def start(self, paused: bool = False):
+        """
+        Start the scheduler
+
+        Args:
+            paused: Keep jobs scheduled but don't run them (standby worker)
+        """
         if not self.scheduler.running:
-            self.scheduler.start()
-            logger.info("Scheduler started")
+            self.scheduler.start(paused=paused)
+            logger.info("Scheduler started" + (" (paused)" if paused else ""))
 
             # Apply current configuration
             self._apply_config()
 
-    def stop(self):
-        """Stop the scheduler"""
+    def stop(self, wait: bool = True):
+        """
+        Stop the scheduler
+
+        Args:
+            wait: Block until running jobs finish
+        """
         if self.scheduler.running:
-            self.scheduler.shutdown()
+            self.scheduler.shutdown(wait=wait)
             logger.info("Scheduler stopped")
 
     def _apply_config(self):
@@ -217,6 +227,8 @@ class AutoScheduler:
 
         except Exception as e:
             logger.error(f"Auto-parse: {source_name}/{section} failed - {e}")
+        finally:
+            self._release_db_session()
 
     def _parse_source_all_sections(self, source_name: str, limit: int):
         """Parse all sections of a source (for cron-based sources)"""
@@ -247,6 +259,14 @@ class AutoScheduler:
 
         except Exception as e:
             logger.error(f"Auto-parse: {source_name} failed - {e}")
+        finally:
+            self._release_db_session()
+
+    def _release_db_session(self):
+        """Return the job thread's DB session to the pool"""
+        db = getattr(self.orchestrator, 'db', None)
+        if db is not None and hasattr(db, 'remove_session'):
+            db.remove_session()
 
     def _analyze_job(self):
         """Execute analysis job"""